@@ -0,0 +1,397 @@
+import os
+import math
+
+from profiling import timed_stage
+
+METRICS = ("fps", "bandwidth", "rtt", "playtime")
+
+# exclude_mode 딕셔너리의 키 (playtime은 항상 minmax로 고정)
+MODE_KEYS = {"fps": "fps", "bandwidth": "bw", "rtt": "rtt"}
+
+DEFAULT_EXCLUDE_MODE = {"fps": "minmax", "bw": "minmax", "rtt": "minmax"}
+
+# 평균 계산 시 제외 방식 (none: 모두 포함)
+TRIM_MODES = ("none", "min", "max", "minmax")
+
+PATH_COMPONENTS = (
+    "date",
+    "network",
+    "carrier",
+    "city",
+    "area",
+    "region",
+    "device",
+    "game",
+)
+
+
+def metric_modes(exclude_mode=None):
+    """Return {metric: mode} for the report exclude_mode ({"fps", "bw", "rtt"})."""
+    if exclude_mode is None or not isinstance(exclude_mode, dict):
+        exclude_mode = DEFAULT_EXCLUDE_MODE
+    modes = {"playtime": "minmax"}
+    for metric, key in MODE_KEYS.items():
+        modes[metric] = exclude_mode.get(key) or "minmax"
+    return modes
+
+
+def select_mean(count, sums, mode="minmax"):
+    """값 개수와 제외 방식별 합계로 리포트 방식의 평균을 계산합니다.
+
+    sums는 {"none": 전체 합, "min": 최솟값 제외 합, "max": 최댓값 제외 합,
+    "minmax": 최솟값/최댓값 제외 합}입니다. 값이 3개 미만이거나 mode가 "none"이면
+    단순 평균을 사용합니다. 스칼라와 NumPy 배열 모두 지원하며 값이 없으면 NaN입니다.
+    """
+    import numpy as np
+
+    count = np.asarray(count, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plain = np.asarray(sums["none"], dtype=float) / count
+        if mode == "minmax":
+            trimmed = np.asarray(sums["minmax"], dtype=float) / (count - 2)
+        elif mode in ("min", "max"):
+            trimmed = np.asarray(sums[mode], dtype=float) / (count - 1)
+        else:
+            trimmed = plain
+        result = np.where(count >= 3, trimmed, plain)
+    result = np.where(count > 0, result, np.nan)
+    return result if result.ndim else float(result)
+
+
+def trimmed_mean(count, total, low, high, mode="minmax"):
+    """누적 count/합계/최솟값/최댓값으로 select_mean과 같은 규칙의 평균을 계산합니다.
+
+    스칼라 전용이며 NumPy를 사용하지 않으므로 PDF 처리 단계에서 가볍게 쓸 수 있습니다.
+    """
+    if not count:
+        return float("nan")
+    if count < 3 or mode not in ("minmax", "min", "max"):
+        return total / count
+    if mode == "minmax":
+        return (total - low - high) / (count - 2)
+    if mode == "min":
+        return (total - low) / (count - 1)
+    return (total - high) / (count - 1)
+
+
+class FolderAggregates:
+    """폴더별 메트릭 집계를 레코드가 들어올 때마다 갱신하는 누적 집계기.
+
+    유효한 값(0보다 큰 숫자)의 개수/합계/최솟값/최댓값만 보관하므로
+    전체 레코드를 메모리에 유지하지 않고도 리포트와 같은 방식의 평균을 계산할 수 있습니다.
+    """
+
+    METRICS = METRICS
+
+    def __init__(self):
+        self.folders = {}
+        # 변경될 때마다 증가 (get_metrics_table 캐시 확인용)
+        self.revision = 0
+
+    def add(self, folder, record):
+        """Fold one parsed record into the running aggregates of its folder."""
+        self.revision += 1
+        stats = self.folders.setdefault(
+            folder,
+            {"files": 0, **{metric: [0, 0.0, None, None] for metric in self.METRICS}},
+        )
+        stats["files"] += 1
+        for metric in self.METRICS:
+            value = record.get(metric)
+            if not isinstance(value, (int, float)) or value <= 0:
+                continue
+            entry = stats[metric]
+            entry[0] += 1
+            entry[1] += value
+            entry[2] = value if entry[2] is None else min(entry[2], value)
+            entry[3] = value if entry[3] is None else max(entry[3], value)
+
+    def replace(self, folder, records):
+        """Recompute one folder from its current records (e.g. after a file changed).
+
+        최솟값/최댓값은 값을 빼는 방식으로 갱신할 수 없으므로 해당 폴더만 다시 누적합니다.
+        """
+        self.revision += 1
+        self.folders.pop(folder, None)
+        for record in records:
+            self.add(folder, record)
+
+    def merge(self, folders):
+        """Fold another aggregator's state ({folder: stats}, e.g. from a shard) into this one.
+
+        같은 폴더가 이미 있으면 파일 수/개수/합계를 더하고 최솟값/최댓값을 비교합니다.
+        """
+        self.revision += 1
+        for folder, stats in folders.items():
+            target = self.folders.setdefault(
+                folder,
+                {
+                    "files": 0,
+                    **{metric: [0, 0.0, None, None] for metric in self.METRICS},
+                },
+            )
+            target["files"] += stats["files"]
+            for metric in self.METRICS:
+                n, total, low, high = stats[metric]
+                entry = target[metric]
+                entry[0] += n
+                entry[1] += total
+                if low is not None:
+                    entry[2] = low if entry[2] is None else min(entry[2], low)
+                if high is not None:
+                    entry[3] = high if entry[3] is None else max(entry[3], high)
+
+    def count(self, folder, metric):
+        return self.folders[folder][metric][0] if folder in self.folders else 0
+
+    def mean(self, folder, metric, mode="minmax"):
+        """Return the trimmed mean (same rules as the reports) or None if no values."""
+        if folder not in self.folders:
+            return None
+        n, total, low, high = self.folders[folder][metric]
+        if not n:
+            return None
+        return trimmed_mean(n, total, low, high, mode)
+
+    def summary(self, exclude_mode=None):
+        """Return {folder: {metric: {count, min, max, avg}}} for all folders."""
+        modes = metric_modes(exclude_mode)
+        result = {}
+        for folder, stats in self.folders.items():
+            result[folder] = {"files": stats["files"]}
+            for metric in self.METRICS:
+                n, _, low, high = stats[metric]
+                result[folder][metric] = {
+                    "count": n,
+                    "min": low,
+                    "max": high,
+                    "avg": self.mean(folder, metric, modes[metric]),
+                }
+        return result
+
+
+class MetricsTable:
+    """모든 리포트 출력(마크다운/HTML, Excel, CSV, 차트)이 공유하는 집계 테이블.
+
+    records: 파일당 한 행 (folder, rel_folder, filename, 원본 메트릭 값)
+    folders: 폴더당 한 행 (경로 구성요소, 파일 수, 메트릭별 count/min/max/mean과
+             제외 방식별 합계 sum_none/sum_min/sum_max/sum_minmax)
+    평균 계산 방식(exclude_mode)에 따른 평균은 averages()로 폴더 단위 연산만 수행합니다.
+    """
+
+    def __init__(self, records, folders):
+        self.records = records
+        self.folders = folders
+        self._groups = None
+
+    @property
+    def empty(self):
+        return self.folders.empty
+
+    def averages(self, exclude_mode=None):
+        """Return a DataFrame ({metric}_avg columns, NaN = no values) indexed like folders."""
+        import pandas as pd
+
+        modes = metric_modes(exclude_mode)
+        f = self.folders
+        return pd.DataFrame(
+            {
+                f"{metric}_avg": select_mean(
+                    f[f"{metric}_count"].to_numpy(),
+                    {trim: f[f"{metric}_sum_{trim}"].to_numpy() for trim in TRIM_MODES},
+                    modes[metric],
+                )
+                for metric in METRICS
+            },
+            index=f.index,
+        )
+
+    def folder_records(self, folder):
+        """Return the records of one folder (empty DataFrame if none), in record order."""
+        if self._groups is None:
+            self._groups = {
+                name: group
+                for name, group in self.records.groupby("folder", sort=False)
+            }
+        group = self._groups.get(folder)
+        return group if group is not None else self.records.iloc[0:0]
+
+    def values(self, folder, metric):
+        """Return the valid (> 0) values of a metric for one folder, in record order."""
+        return _valid_values(self.folder_records(folder)[metric]).dropna().tolist()
+
+
+def _valid_values(column):
+    """숫자이고 0보다 큰 값만 남기고 나머지는 NaN으로 바꿉니다."""
+    import pandas as pd
+
+    numeric = pd.to_numeric(column.where(column.map(_is_number)), errors="coerce")
+    return numeric.where(numeric > 0)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _record_columns(folder_data, folders):
+    """Return (folder, filename, {metric: raw values}) lists from record dicts."""
+    folder_col, filename_col = [], []
+    metric_cols = {metric: [] for metric in METRICS}
+    for folder in folders:
+        folder_info = folder_data[folder]
+        if not isinstance(folder_info, dict):
+            folder_info = dict(folder_info)
+        for file_data in folder_info.get("files", []):
+            folder_col.append(folder)
+            filename_col.append(file_data.get("filename", "Unknown"))
+            for metric in METRICS:
+                metric_cols[metric].append(file_data.get(metric, -1))
+    return folder_col, filename_col, metric_cols
+
+
+def build_metrics_table(folder_data, path_parser=None):
+    """Build the shared MetricsTable from process_pdf_files output in one pass.
+
+    path_parser는 폴더 경로를 구성요소 딕셔너리로 바꾸는 함수(parse_folder_path)입니다.
+    folder_data["_config"]["records"]에 RecordStore가 있으면 레코드 딕셔너리를 만들지
+    않고 배열 열과 폴더 구성요소 코드를 직접 읽습니다.
+    """
+    import pandas as pd
+
+    config = folder_data.get("_config", {})
+    root_abs = config.get("root_abs", "")
+    store = config.get("records")
+    sorted_folders = sorted(k for k in folder_data.keys() if k != "_config")
+
+    folder_rows = []
+    for folder in sorted_folders:
+        rel_folder = os.path.relpath(folder, root_abs)
+        if rel_folder == ".":
+            rel_folder = "(root)"
+        row = {"folder": folder, "rel_folder": rel_folder}
+        if store is not None:
+            row["files"] = len(store.rows(folder))
+            components = store.components(folder)
+        else:
+            row["files"] = len(dict(folder_data[folder]).get("files", []))
+            components = path_parser(folder) if path_parser else {}
+        for key in PATH_COMPONENTS:
+            row[key] = components.get(key, "Unknown")
+        folder_rows.append(row)
+    folders = pd.DataFrame(
+        folder_rows, columns=["folder", "rel_folder", "files", *PATH_COMPONENTS]
+    ).set_index("folder", drop=False)
+
+    if store is not None:
+        # 폴더를 정수 위치로 다뤄 문자열 경로의 factorize 비용을 피함
+        positions, filename_col, raw_cols, value_cols = store.columns(sorted_folders)
+        folder_col = folders["folder"].to_numpy()[positions]
+        group_col = positions
+        valid_cols = {
+            metric: pd.Series(values).where(values > 0)
+            for metric, values in value_cols.items()
+        }
+    else:
+        folder_col, filename_col, raw_cols = _record_columns(
+            folder_data, sorted_folders
+        )
+        group_col = folder_col
+        valid_cols = None
+
+    # 상세 표에는 원본 값(-1 포함)을 그대로 쓰므로 object 타입으로 보관
+    records = pd.DataFrame(
+        {
+            "folder": folder_col,
+            "filename": filename_col,
+            **{m: pd.Series(v, dtype=object) for m, v in raw_cols.items()},
+        },
+        columns=["folder", "filename", *METRICS],
+    )
+    if store is not None:
+        records["rel_folder"] = folders["rel_folder"].to_numpy()[positions]
+    else:
+        records["rel_folder"] = records["folder"].map(folders["rel_folder"])
+
+    # 유효한 값(0보다 큰 숫자)만 (folder, metric, value) 형태로 정렬한 뒤
+    # 한 번의 groupby로 폴더별 count/min/max와 제외 방식별 합계를 계산
+    valid = pd.DataFrame({"folder": group_col})
+    for metric in METRICS:
+        if valid_cols is not None:
+            valid[metric] = valid_cols[metric]
+        else:
+            valid[metric] = _valid_values(records[metric])
+    long = valid.melt(id_vars="folder", var_name="metric", value_name="value")
+    long = long.dropna(subset=["value"]).sort_values(
+        ["folder", "metric", "value"], kind="stable"
+    )
+    rank = long.groupby(["folder", "metric"], sort=False).cumcount()
+    size = long.groupby(["folder", "metric"], sort=False)["value"].transform("size")
+    is_min = rank == 0
+    is_max = rank == size - 1
+    long["sum_none"] = long["value"]
+    long["sum_min"] = long["value"].where(~is_min, 0.0)
+    long["sum_max"] = long["value"].where(~is_max, 0.0)
+    long["sum_minmax"] = long["value"].where(~(is_min | is_max), 0.0)
+    # 합계는 math.fsum으로 계산해 .xx5 경계의 반올림이 합산 순서에 흔들리지 않게 함
+    stats = long.groupby(["folder", "metric"]).agg(
+        count=("value", "size"),
+        min=("value", "min"),
+        max=("value", "max"),
+        **{f"sum_{trim}": (f"sum_{trim}", math.fsum) for trim in TRIM_MODES},
+    )
+    group_index = range(len(folders)) if store is not None else folders.index
+    for metric in METRICS:
+        per_metric = (
+            stats[stats.index.get_level_values("metric") == metric]
+            .droplevel("metric")
+            .reindex(group_index)
+        )
+        folders[f"{metric}_count"] = per_metric["count"].fillna(0).astype(int).values
+        for name in ("min", "max", *(f"sum_{trim}" for trim in TRIM_MODES)):
+            folders[f"{metric}_{name}"] = per_metric[name].astype(float).values
+        folders[f"{metric}_mean"] = (
+            folders[f"{metric}_sum_none"] / folders[f"{metric}_count"]
+        )
+
+    return MetricsTable(records, folders)
+
+
+def get_metrics_table(folder_data, path_parser=None, log_callback=None):
+    """folder_data에 대해 집계 테이블을 한 번만 만들고 이후 호출에서는 재사용합니다.
+
+    테이블은 folder_data["_config"]["metrics_table"]에 저장되며, 레코드 수나
+    레코드 저장소(RecordStore)/누적 집계(FolderAggregates)의 revision이 바뀌면 다시
+    생성합니다. folder_data["_config"]["table_source"](예: 메트릭 저장소의
+    WarehouseSelection)가 있으면 레코드 대신 그 원본의 metrics_table()을 사용합니다.
+    """
+    config = folder_data.get("_config")
+    source = config.get("table_source") if config is not None else None
+    if source is not None:
+        record_count = source.count()
+    else:
+        record_count = sum(
+            len(info.get("files", []))
+            for key, info in folder_data.items()
+            if key != "_config" and isinstance(info, dict)
+        )
+    cache_key = (record_count,)
+    if config is not None:
+        cache_key += tuple(
+            getattr(config.get(name), "revision", None)
+            for name in ("records", "aggregates")
+        )
+        cached = config.get("metrics_table")
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
+
+    if log_callback:
+        log_callback(f"집계 테이블 생성 중... ({record_count}개 레코드)\n")
+    profiler = config.get("profiler") if config is not None else None
+    with timed_stage(profiler, "aggregation"):
+        if source is not None:
+            table = source.metrics_table()
+        else:
+            table = build_metrics_table(folder_data, path_parser)
+    if config is not None:
+        config["metrics_table"] = (cache_key, table)
+    return table
@@ -0,0 +1,510 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from datetime import datetime
+
+from main import (
+    PARSER_VERSION,
+    export_to_excel,
+    find_pdf_files,
+    generate_folder_report,
+    generate_performance_plots,
+    parse_folder_path,
+    preload_stage_modules,
+    process_pdf_files,
+)
+from aggregation import get_metrics_table
+from discovery import find_duplicate_files
+from extraction_cache import hash_file
+from profiling import cpu_time
+from record_store import SNAPSHOT_FILE_NAME, save_snapshot
+from warehouse import WAREHOUSE_FILE_NAME, MetricsWarehouse
+
+DEFAULT_SIZES = (100, 1000, 10000)
+
+# 결과 JSON 구조가 바뀌면 올립니다 (--compare는 같은 버전끼리만 비교).
+BENCHMARK_FORMAT_VERSION = 1
+
+# 생성 규칙이 바뀌면 올려서 기존 코퍼스를 다시 만들게 합니다.
+CORPUS_VERSION = 1
+CORPUS_MANIFEST = "corpus.json"
+
+# README 폴더 규칙: date/city/area/region/carrier/network/game/device
+# (wifi는 network 없이 date/city/area/region/wifi/game/device)
+CORPUS_DATES = ["20250503", "20250504", "20250510"]
+CORPUS_LOCATIONS = [
+    ("London", "BigBen", "UK"),
+    ("Dublin", "Centre", "Ireland"),
+    ("Seoul", "Gangnam", "Korea"),
+]
+CORPUS_CARRIERS = [("ee", "4G"), ("voda", "5G"), ("wifi", None)]
+CORPUS_GAMES = ["sloto", "game2"]
+CORPUS_DEVICES = ["s24", "s25u", "fold6"]
+
+FILLER_LINES = 40
+
+
+def _standard_lines(m):
+    """리포트 기본 형식 (각 메트릭의 첫 번째 패턴에 매칭)."""
+    return [
+        "Game Performance Report",
+        "Play Time",
+        f"{m['playtime']:.1f} s",
+        f"FPS Min: {m['fps'] * 0.5:.2f} Avg: {m['fps']:.2f}",
+        f"Bandwidth Min: {m['bandwidth'] * 0.2:.2f} Avg: {m['bandwidth']:.2f} Mbps",
+        f"Round Trip Time Min: {m['rtt'] * 0.5:.1f} Avg: {m['rtt']:.1f} ms",
+    ]
+
+
+def _alternate_lines(m):
+    """다른 표현을 쓰는 형식 (보조 패턴까지 내려가야 매칭)."""
+    return [
+        "Session Summary",
+        f"Duration {m['playtime']:.1f} s",
+        f"Frames Per Second {m['fps']:.2f}",
+        f"Network Speed {m['bandwidth']:.2f} Mbps",
+        f"Latency {m['rtt']:.1f} ms",
+    ]
+
+
+def _partial_lines(m):
+    """일부 메트릭만 있는 형식 (bandwidth/RTT는 -1로 기록됨)."""
+    return [
+        "Game Performance Report",
+        "Play Time",
+        f"{m['playtime']:.1f} s",
+        f"FPS Min: {m['fps'] * 0.5:.2f} Avg: {m['fps']:.2f}",
+    ]
+
+
+# 레이아웃: (메트릭 줄 생성 함수, 메트릭 페이지를 마지막에 둘지 여부)
+CORPUS_LAYOUTS = {
+    "standard": (_standard_lines, False),
+    "alternate": (_alternate_lines, False),
+    "trailing": (_standard_lines, True),  # 증분 추출의 최악의 경우
+    "partial": (_partial_lines, False),
+}
+
+
+def _pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_synthetic_pdf(path, pages):
+    """Write a minimal text-only PDF (Helvetica, one text row per line) to path.
+
+    pages는 페이지별 줄 목록입니다. 외부 패키지 없이 PyPDF2로 텍스트를 추출할 수 있는
+    최소한의 PDF 구조만 작성합니다.
+    """
+    chunks = [b"%PDF-1.4\n"]
+    offsets = {}
+
+    def add(number, body):
+        offsets[number] = sum(len(chunk) for chunk in chunks)
+        chunks.append(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    page_numbers = [4 + 2 * i for i in range(len(pages))]
+    kids = " ".join(f"{number} 0 R" for number in page_numbers)
+    add(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+    add(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    add(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for number, lines in zip(page_numbers, pages):
+        rows = " ".join(f"({_pdf_escape(line)}) '" for line in lines)
+        stream = f"BT /F1 12 Tf 50 780 Td 14 TL {rows} ET".encode("latin-1")
+        add(
+            number,
+            (
+                "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                f"/Resources << /Font << /F1 3 0 R >> >> /Contents {number + 1} 0 R >>"
+            ).encode(),
+        )
+        add(
+            number + 1,
+            f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream",
+        )
+
+    xref_offset = sum(len(chunk) for chunk in chunks)
+    size = max(offsets) + 1
+    xref = [f"xref\n0 {size}\n0000000000 65535 f \n"]
+    xref += [f"{offsets[number]:010d} 00000 n \n" for number in range(1, size)]
+    chunks.append("".join(xref).encode())
+    chunks.append(
+        f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    )
+    with open(path, "wb") as f:
+        f.write(b"".join(chunks))
+
+
+def corpus_folders():
+    """Return all synthetic folder paths (relative) following the README convention."""
+    folders = []
+    for date in CORPUS_DATES:
+        for city, area, region in CORPUS_LOCATIONS:
+            for carrier, network in CORPUS_CARRIERS:
+                for game in CORPUS_GAMES:
+                    for device in CORPUS_DEVICES:
+                        parts = [date, city, area, region, carrier]
+                        if network:
+                            parts.append(network)
+                        folders.append(os.path.join(*parts, game, device))
+    return folders
+
+
+def generate_corpus(corpus_dir, count, pages=4, layouts=None, seed=0):
+    """corpus_dir/data 아래에 합성 PDF count개를 만들고 data 경로를 반환합니다.
+
+    같은 설정으로 이미 만든 코퍼스가 있으면 그대로 재사용합니다.
+    pages는 파일당 페이지 수(메트릭 페이지 1개 + 나머지는 채움 페이지)입니다.
+    """
+    layouts = list(layouts or CORPUS_LAYOUTS)
+    data_dir = os.path.join(corpus_dir, "data")
+    manifest_path = os.path.join(corpus_dir, CORPUS_MANIFEST)
+    manifest = {
+        "version": CORPUS_VERSION,
+        "count": count,
+        "pages": pages,
+        "layouts": layouts,
+        "seed": seed,
+    }
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            if json.load(f) == manifest and os.path.isdir(data_dir):
+                return data_dir
+    except (OSError, ValueError):
+        pass
+
+    if os.path.isdir(data_dir):
+        shutil.rmtree(data_dir)
+    rng = random.Random(seed)
+    folders = corpus_folders()
+    for i in range(count):
+        folder = os.path.join(data_dir, rng.choice(folders))
+        os.makedirs(folder, exist_ok=True)
+        metrics = {
+            "playtime": rng.uniform(60, 600),
+            "fps": rng.uniform(20, 120),
+            "bandwidth": rng.uniform(5, 80),
+            "rtt": rng.uniform(5, 120),
+        }
+        make_lines, trailing = CORPUS_LAYOUTS[layouts[i % len(layouts)]]
+        filler = [
+            [
+                f"Sample row {rng.randint(0, 99999)}: lorem ipsum dolor sit amet"
+                for _ in range(FILLER_LINES)
+            ]
+            for _ in range(max(pages - 1, 0))
+        ]
+        doc = (
+            filler + [make_lines(metrics)]
+            if trailing
+            else [make_lines(metrics)] + filler
+        )
+        date, _, _, region = os.path.relpath(folder, data_dir).split(os.sep)[:4]
+        seconds = i % 86400
+        filename = (
+            f"{i:05d}_run({region})_{date[:4]}_{date[4:6]}_{date[6:]}_"
+            f"{seconds // 3600:02d}_{seconds // 60 % 60:02d}_{seconds % 60:02d}.pdf"
+        )
+        write_synthetic_pdf(os.path.join(folder, filename), doc)
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    return data_dir
+
+
+def _measure(name, func, files, track_memory):
+    """Run func() once and return (result, stage dict with wall/CPU/throughput/peak)."""
+    if track_memory:
+        tracemalloc.reset_peak()
+    wall_start, cpu_start = time.perf_counter(), cpu_time()
+    result = func()
+    wall = time.perf_counter() - wall_start
+    stage = {
+        "stage": name,
+        "wall": wall,
+        "cpu": cpu_time() - cpu_start,
+        "files_per_sec": files / wall if wall else None,
+        "peak_mb": (tracemalloc.get_traced_memory()[1] / 1e6 if track_memory else None),
+    }
+    return result, stage
+
+
+def _store_warehouse(folder_data, path):
+    """Upsert every record of folder_data into the metrics warehouse at path."""
+    warehouse = MetricsWarehouse(path, parse_folder_path, parser_version=PARSER_VERSION)
+    for folder, info in folder_data.items():
+        if folder == "_config":
+            continue
+        for record in info["files"]:
+            warehouse.add(os.path.join(folder, record["filename"]), folder, record)
+    warehouse.flush()
+    return warehouse.saved
+
+
+def run_size(data_dir, jobs=1, plots=False, track_memory=True):
+    """Run every pipeline stage on one corpus and return the measured stages.
+
+    추출 캐시와 차트 캐시는 사용하지 않으며(매번 전체 처리), 로그는 출력하지 않습니다.
+    jobs > 1이면 워커 프로세스의 메모리는 peak_mb에 포함되지 않습니다.
+    extraction 단계는 중복 검사/메트릭 저장소/스냅샷 없이 측정하고, 세 기능은
+    duplicates/warehouse/snapshot 단계로 따로 측정합니다. 저장소와 스냅샷은 실행마다
+    누적되지 않도록 임시 폴더에 기록한 뒤 지웁니다.
+    """
+    scratch_dir = tempfile.mkdtemp(prefix="benchmark_")
+    if track_memory:
+        tracemalloc.start()
+    try:
+        pdf_files, discovery = _measure(
+            "discovery", lambda: find_pdf_files(data_dir), 0, track_memory
+        )
+        files = len(pdf_files)
+        discovery["files_per_sec"] = (
+            files / discovery["wall"] if discovery["wall"] else None
+        )
+        stages = [discovery]
+
+        folder_data, stage = _measure(
+            "extraction",
+            lambda: process_pdf_files(
+                data_dir,
+                jobs=jobs,
+                use_cache=False,
+                use_warehouse=False,
+                snapshot=False,
+                duplicate_mode=None,
+            ),
+            files,
+            track_memory,
+        )
+        stages.append(stage)
+        records = sum(
+            len(info["files"]) for key, info in folder_data.items() if key != "_config"
+        )
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        report_stages = [
+            ("duplicates", lambda: find_duplicate_files(pdf_files, hash_file)),
+            (
+                "warehouse",
+                lambda: _store_warehouse(
+                    folder_data, os.path.join(scratch_dir, WAREHOUSE_FILE_NAME)
+                ),
+            ),
+            (
+                "snapshot",
+                lambda: save_snapshot(
+                    folder_data,
+                    os.path.join(scratch_dir, SNAPSHOT_FILE_NAME),
+                    parser_version=PARSER_VERSION,
+                ),
+            ),
+            (
+                "aggregation",
+                lambda: get_metrics_table(folder_data, parse_folder_path),
+            ),
+            ("markdown_html", lambda: generate_folder_report(folder_data)),
+            ("excel", lambda: export_to_excel(folder_data, timestamp=timestamp)),
+        ]
+        if plots:
+            report_stages.append(
+                (
+                    "plots",
+                    lambda: generate_performance_plots(
+                        folder_data, timestamp, jobs=jobs, use_cache=False
+                    ),
+                )
+            )
+        for name, func in report_stages:
+            _, stage = _measure(name, func, files, track_memory)
+            stages.append(stage)
+        return {"files": files, "records": records, "stages": stages}
+    finally:
+        if track_memory:
+            tracemalloc.stop()
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+
+def compare_results(current, baseline, threshold=0.1, log_callback=sys.stdout.write):
+    """Compare two benchmark results; return the list of regressed (files, stage, ratio).
+
+    같은 파일 수/단계의 경과 시간 또는 최대 메모리가 threshold 비율 이상 늘면 회귀로 봅니다.
+    """
+    if baseline.get("format_version") != current.get("format_version"):
+        log_callback("경고: 결과 형식 버전이 달라 비교할 수 없습니다.\n")
+        return []
+    if baseline.get("settings") != current.get("settings"):
+        log_callback(
+            f"경고: 벤치마크 설정이 다릅니다: {baseline.get('settings')} -> "
+            f"{current.get('settings')}\n"
+        )
+
+    old_runs = {run["files"]: run for run in baseline.get("runs", [])}
+    regressions = []
+    log_callback(
+        f"\n비교 기준: {baseline.get('label') or baseline.get('created')} "
+        f"(허용 {threshold:.0%})\n"
+    )
+    for run in current["runs"]:
+        old_run = old_runs.get(run["files"])
+        if not old_run:
+            continue
+        old_stages = {stage["stage"]: stage for stage in old_run["stages"]}
+        for stage in run["stages"]:
+            old = old_stages.get(stage["stage"])
+            if not old:
+                continue
+            for key, unit in (("wall", "초"), ("peak_mb", "MB")):
+                if not old.get(key) or stage.get(key) is None:
+                    continue
+                ratio = stage[key] / old[key]
+                regressed = ratio > 1 + threshold
+                if regressed:
+                    regressions.append((run["files"], stage["stage"], key, ratio))
+                log_callback(
+                    f"  {run['files']:>6}개 {stage['stage']:<14} {key:<8} "
+                    f"{old[key]:.3f}{unit} -> {stage[key]:.3f}{unit} "
+                    f"({ratio:.2f}x){' 회귀' if regressed else ''}\n"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Generate synthetic report PDFs and measure pipeline throughput "
+            "and peak memory"
+        )
+    )
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="Comma separated corpus sizes (default: 100,1000,10000)",
+    )
+    parser.add_argument(
+        "--pages", type=int, default=4, help="Pages per PDF (default: 4)"
+    )
+    parser.add_argument(
+        "--layouts",
+        default=",".join(CORPUS_LAYOUTS),
+        help=f"Comma separated metric layouts ({', '.join(CORPUS_LAYOUTS)})",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Corpus random seed")
+    parser.add_argument(
+        "--jobs", type=int, default=1, help="Worker processes (0 = all CPU cores)"
+    )
+    parser.add_argument(
+        "--plots", action="store_true", help="Also benchmark chart rendering"
+    )
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Do not track peak memory (tracemalloc slows extraction down)",
+    )
+    parser.add_argument(
+        "--workdir",
+        default="benchmark_data",
+        help="Directory for generated corpora and results (default: benchmark_data)",
+    )
+    parser.add_argument("--label", help="Name of this run, e.g. a version number")
+    parser.add_argument("--output", help="Result JSON path")
+    parser.add_argument("--compare", help="Baseline result JSON to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Allowed slowdown/memory growth ratio before --compare fails (default: 0.1)",
+    )
+    args = parser.parse_args()
+
+    def console_log(message):
+        print(message, end="")
+        sys.stdout.flush()
+
+    try:
+        sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    except ValueError:
+        console_log(f"잘못된 --sizes 값: {args.sizes}\n")
+        sys.exit(2)
+    layouts = [layout.strip() for layout in args.layouts.split(",") if layout.strip()]
+    unknown = [layout for layout in layouts if layout not in CORPUS_LAYOUTS]
+    if unknown or not layouts:
+        console_log(f"알 수 없는 레이아웃: {', '.join(unknown) or '(없음)'}\n")
+        sys.exit(2)
+
+    settings = {
+        "pages": args.pages,
+        "layouts": layouts,
+        "seed": args.seed,
+        "jobs": args.jobs,
+        "plots": args.plots,
+        "memory": not args.no_memory,
+    }
+    result = {
+        "format_version": BENCHMARK_FORMAT_VERSION,
+        "label": args.label,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "parser_version": PARSER_VERSION,
+        "settings": settings,
+        "runs": [],
+    }
+
+    # 지연 import 비용은 첫 번째 크기에만 잡히므로 미리 불러옴 (콜드 스타트는 --profile-startup)
+    preload_stage_modules()
+
+    os.makedirs(args.workdir, exist_ok=True)
+    for size in sizes:
+        corpus_dir = os.path.join(args.workdir, f"corpus_{size}")
+        console_log(f"\n[{size}개] 코퍼스 준비 중: {corpus_dir}\n")
+        started = time.perf_counter()
+        data_dir = generate_corpus(corpus_dir, size, args.pages, layouts, args.seed)
+        console_log(f"코퍼스 준비 완료 ({time.perf_counter() - started:.1f}초)\n")
+
+        run = run_size(data_dir, args.jobs, args.plots, not args.no_memory)
+        result["runs"].append(run)
+        console_log(f"파일 {run['files']}개, 레코드 {run['records']}개\n")
+        for stage in run["stages"]:
+            throughput = (
+                f"{stage['files_per_sec']:.1f}개/초" if stage["files_per_sec"] else "-"
+            )
+            peak = f"{stage['peak_mb']:.1f}MB" if stage["peak_mb"] is not None else "-"
+            console_log(
+                f"  - {stage['stage']:<14} 경과 {stage['wall']:.3f}초, "
+                f"CPU {stage['cpu']:.3f}초, {throughput}, 최대 메모리 {peak}\n"
+            )
+
+    output = args.output or os.path.join(
+        args.workdir,
+        f"benchmark_{args.label or datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+    )
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    console_log(f"\n결과 저장됨: {os.path.abspath(output)}\n")
+
+    if args.compare:
+        try:
+            with open(args.compare, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            console_log(f"비교 기준 파일을 읽을 수 없습니다: {e}\n")
+            sys.exit(2)
+        regressions = compare_results(result, baseline, args.threshold, console_log)
+        if regressions:
+            console_log(f"\n성능 회귀 {len(regressions)}건이 발견되었습니다.\n")
+            sys.exit(1)
+        console_log("\n성능 회귀가 없습니다.\n")
+
+
+if __name__ == "__main__":
+    import multiprocessing
+
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,175 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import platform
+
+# 차트 렌더링 시 적용할 설정 (pyplot 전역 상태를 건드리지 않도록 rc_context로만 사용)
+if platform.system() == "Darwin":  # macOS
+    _KOREAN_FONT = "AppleGothic"
+elif platform.system() == "Windows":
+    _KOREAN_FONT = "Malgun Gothic"
+else:  # Linux
+    _KOREAN_FONT = "NanumGothic"
+
+CHART_RC = {
+    "font.family": _KOREAN_FONT,
+    "axes.unicode_minus": False,  # 마이너스 기호 깨짐 방지
+    "font.size": 10,
+}
+
+CHART_FIGSIZE = (20, 10)
+
+CHART_FORMATS = ("png", "svg", "pdf", "jpg")
+
+# 그리기 코드가 바뀌어 결과 이미지가 달라지면 올려서 차트 캐시를 무효화합니다.
+CHART_CACHE_VERSION = 1
+
+
+def _draw_bar_chart(ax, spec):
+    labels = spec["labels"]
+    x = list(range(len(labels)))
+    width = 0.25
+    for offset, (label, values, color) in zip((-width, 0, width), spec["series"]):
+        ax.bar([i + offset for i in x], values, width, label=label, color=color)
+
+    ax.set_title(spec["title"])
+    ax.set_xlabel(spec.get("xlabel", ""))
+    ax.set_ylabel(spec.get("ylabel", ""))
+    ax.set_xticks(x)
+    ax.set_xticklabels(labels, rotation=45, ha="right")
+    ax.legend()
+    ax.grid(True, linestyle="--", alpha=0.3)
+
+
+def _draw_box_plot(ax, spec):
+    bp = ax.boxplot(spec["data"], patch_artist=True)
+    for element in ["boxes", "whiskers", "fliers", "means", "medians", "caps"]:
+        for artist in bp[element]:
+            artist.set_color("black")
+    for box in bp["boxes"]:
+        box.set_facecolor(spec["color"])
+
+    ax.set_title(spec["title"])
+    ax.set_xticks(range(1, len(spec["data"]) + 1))
+    ax.set_xticklabels(spec["labels"], rotation=45, ha="right")
+    ax.grid(True, linestyle="--", alpha=0.3)
+
+
+_DRAWERS = {"bar": _draw_bar_chart, "box": _draw_box_plot}
+
+
+def render_chart(spec, dpi=300, image_format="png"):
+    """Render one chart spec to spec["path"] and return (path, seconds, error).
+
+    spec는 kind("bar"/"box"), title, labels와 차트 종류별 데이터만 담은 딕셔너리이므로
+    프로세스 풀 워커로 그대로 전달할 수 있습니다. 오류는 예외 대신 문자열로 반환합니다.
+    """
+    import matplotlib
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    start = time.perf_counter()
+    try:
+        with matplotlib.rc_context(CHART_RC):
+            fig = Figure(figsize=CHART_FIGSIZE)
+            FigureCanvasAgg(fig)
+            ax = fig.add_subplot()
+            _DRAWERS[spec["kind"]](ax, spec)
+            fig.tight_layout()
+            fig.savefig(spec["path"], dpi=dpi, format=image_format, bbox_inches="tight")
+        return spec["path"], time.perf_counter() - start, None
+    except Exception as e:
+        return spec["path"], time.perf_counter() - start, str(e)
+
+
+def render_charts(specs, dpi=300, image_format="png", jobs=1):
+    """Render chart specs, in a process pool if jobs > 1; yield results in spec order."""
+    if jobs <= 1 or len(specs) <= 1:
+        for spec in specs:
+            yield render_chart(spec, dpi, image_format)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(specs))) as executor:
+        futures = [
+            executor.submit(render_chart, spec, dpi, image_format) for spec in specs
+        ]
+        for spec, future in zip(specs, futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                # 워커 프로세스 자체가 실패한 경우
+                yield spec["path"], 0.0, str(e)
+
+
+def chart_filename(plots_dir, name, timestamp, image_format="png"):
+    """Return the output path of a chart inside plots_dir."""
+    return os.path.join(plots_dir, f"{name}_{timestamp}.{image_format}")
+
+
+def chart_key(spec, dpi=300, image_format="png"):
+    """Return a hash of everything that affects a chart's pixels (not its file name)."""
+    import matplotlib
+
+    payload = {
+        "spec": {k: v for k, v in spec.items() if k != "path"},
+        "dpi": dpi,
+        "format": image_format,
+        "rc": CHART_RC,
+        "figsize": CHART_FIGSIZE,
+        "version": CHART_CACHE_VERSION,
+        "matplotlib": matplotlib.__version__,
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+def _link_or_copy(source, target):
+    """Hard-link source to target, falling back to a copy (e.g. across file systems)."""
+    if os.path.exists(target):
+        os.remove(target)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+class ChartCache:
+    """렌더링된 차트를 입력 해시별로 보관하는 디렉토리 캐시.
+
+    같은 해시의 차트가 이미 있으면 다시 그리지 않고 새 타임스탬프 파일명으로
+    링크(불가능하면 복사)합니다.
+    """
+
+    def __init__(self, cache_dir, rebuild=False):
+        self.cache_dir = cache_dir
+        self.rebuild = rebuild
+        self.reused = 0
+        self.rendered = 0
+
+    def _path(self, key, image_format):
+        return os.path.join(self.cache_dir, f"{key}.{image_format}")
+
+    def restore(self, key, image_format, target):
+        """Place the cached chart at target; return False if it is not cached."""
+        cached = self._path(key, image_format)
+        if self.rebuild or not os.path.exists(cached):
+            return False
+        try:
+            _link_or_copy(cached, target)
+        except OSError:
+            return False
+        self.reused += 1
+        return True
+
+    def store(self, key, image_format, source):
+        """Keep a freshly rendered chart for later runs (errors are ignored)."""
+        self.rendered += 1
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            _link_or_copy(source, self._path(key, image_format))
+        except OSError:
+            pass
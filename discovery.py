@@ -0,0 +1,262 @@
+import os
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+# parse_folder_path가 아직 결정하지 못한(더 깊은 폴더에서 정해지는) 구성요소 값
+UNDECIDED = "Unknown"
+
+
+class PdfEntry(str):
+    """탐색 중 얻은 크기/수정시간을 함께 보관하는 PDF 파일의 절대 경로.
+
+    str을 상속하므로 기존 경로 문자열처럼 그대로 쓸 수 있고, 이후 단계(추출 캐시,
+    타임스탬프, 프로파일러)는 파일을 다시 stat하지 않고 size/mtime을 재사용합니다.
+    stat에 실패한 파일은 size/mtime이 None입니다.
+    """
+
+    def __new__(cls, path, size=None, mtime=None):
+        entry = super().__new__(cls, path)
+        entry.size = size
+        entry.mtime = mtime
+        return entry
+
+    def __reduce__(self):
+        # 프로세스 풀 워커로 전달할 때 메타데이터도 함께 전달
+        return (PdfEntry, (str(self), self.size, self.mtime))
+
+
+def file_stat(path):
+    """Return (size, mtime) of a file, reusing PdfEntry metadata when available.
+
+    메타데이터가 없으면 os.stat을 호출하며, 실패하면 OSError가 발생합니다.
+    """
+    if isinstance(path, PdfEntry) and path.size is not None:
+        return path.size, path.mtime
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime
+
+
+class DuplicateFinder:
+    """PDF 스트림에서 내용이 같은 파일을 나오는 즉시 찾습니다 (먼저 나온 파일이 원본).
+
+    크기별로 처음 나온 파일은 바로 고유 파일로 판단하고, 같은 크기의 파일이 다시 나올
+    때만 두 파일의 내용 해시(hash_func)를 계산해 비교합니다. 따라서 대부분의 파일은
+    읽지 않으며 탐색이 끝나기를 기다리지 않습니다. 읽을 수 없는 파일은 원본이 되지 않습니다.
+    """
+
+    def __init__(self, hash_func):
+        self.hash_func = hash_func
+        # 크기 -> 아직 해시하지 않은 첫 파일, 또는 {해시: 원본}
+        self._by_size = {}
+
+    def check(self, pdf_file):
+        """Return the earlier file that pdf_file duplicates, or None if it is unique."""
+        try:
+            size = file_stat(pdf_file)[0]
+        except OSError:
+            return None
+        originals = self._by_size.get(size)
+        if originals is None:
+            self._by_size[size] = pdf_file
+            return None
+        if not isinstance(originals, dict):
+            first, originals = originals, {}
+            self._by_size[size] = originals
+            try:
+                originals[self.hash_func(first)] = first
+            except OSError:
+                pass
+        try:
+            digest = self.hash_func(pdf_file)
+        except OSError:
+            return None
+        original = originals.setdefault(digest, pdf_file)
+        return None if original is pdf_file else original
+
+
+def find_duplicate_files(pdf_files, hash_func):
+    """Return {duplicate: original} for files whose contents are identical.
+
+    DuplicateFinder로 pdf_files 순서대로 검사하므로 같은 내용의 파일 중 먼저 나온
+    파일이 원본입니다.
+    """
+    finder = DuplicateFinder(hash_func)
+    duplicates = {}
+    for pdf_file in pdf_files:
+        original = finder.check(pdf_file)
+        if original is not None:
+            duplicates[pdf_file] = original
+    return duplicates
+
+
+def shard_of(key, count):
+    """Return the 1-based shard (of count) that a date folder name belongs to.
+
+    zlib.crc32를 사용하므로 프로세스/머신이 달라도 같은 결과를 얻습니다.
+    """
+    return zlib.crc32(key.encode("utf-8")) % count + 1
+
+
+class FolderFilter:
+    """폴더 규칙(date/city/area/region/carrier/network/game/device)에 따른 탐색 필터.
+
+    path_parser(parse_folder_path)로 디렉토리 경로를 해석해, 이미 결정된 구성요소가
+    조건과 다르면 그 아래는 탐색하지 않습니다. 아직 결정되지 않은(더 깊은 폴더에서
+    정해지는) 구성요소는 계속 내려가며, PDF 파일의 폴더에서는 조건을 모두 만족해야
+    합니다. 값 비교는 대소문자를 구분하지 않으며 날짜 범위는 YYYYMMDD 문자열입니다.
+    shard=(i, N)이면 날짜 폴더 이름의 해시(shard_of)가 i번째인 폴더만 남깁니다.
+    """
+
+    def __init__(self, path_parser, since=None, until=None, shard=None, **components):
+        self.path_parser = path_parser
+        self.since = since
+        self.until = until
+        self.shard = shard
+        self.components = {
+            key: {str(value).lower() for value in values}
+            for key, values in components.items()
+            if values
+        }
+        self.pruned = 0
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        return bool(self.since or self.until or self.shard or self.components)
+
+    def describe(self):
+        """Return the filter conditions as a short log string."""
+        parts = []
+        if self.since or self.until:
+            parts.append(f"date={self.since or ''}~{self.until or ''}")
+        for key, values in self.components.items():
+            parts.append(f"{key}={','.join(sorted(values))}")
+        if self.shard:
+            parts.append(f"shard={self.shard[0]}/{self.shard[1]}")
+        return ", ".join(parts)
+
+    def _check(self, dir_path, final):
+        components = self.path_parser(dir_path)
+        date = components.get("date", UNDECIDED)
+        if self.since or self.until:
+            if date == UNDECIDED:
+                if final:
+                    return False
+            elif (self.since and date < self.since) or (
+                self.until and date > self.until
+            ):
+                return False
+        if self.shard and (final or date != UNDECIDED):
+            # 날짜 폴더가 없는 PDF는 모두 "Unknown" 키의 샤드에 속함
+            if shard_of(date, self.shard[1]) != self.shard[0]:
+                return False
+        for key, values in self.components.items():
+            value = components.get(key, UNDECIDED)
+            if value == UNDECIDED and not final:
+                continue
+            if value.lower() not in values:
+                return False
+        return True
+
+    def prune(self, dir_path):
+        """Return True if nothing below dir_path can match (counted in self.pruned)."""
+        if self._check(dir_path, final=False):
+            return False
+        with self._lock:
+            self.pruned += 1
+        return True
+
+    def matches(self, dir_path):
+        """Return True if PDF files directly in dir_path match every condition."""
+        return self._check(dir_path, final=True)
+
+
+def _scan_dir(dir_path, root_abs, log_callback=None, folder_filter=None):
+    """Return (PDF entries, subdirectories to descend into) of one directory.
+
+    scandir 순서를 유지하며, 언더스코어로 시작하는 디렉토리와 심볼릭 링크된
+    디렉토리(os.walk 기본값과 동일), folder_filter 조건에 맞지 않는 디렉토리는
+    내려가지 않습니다.
+    """
+    files, subdirs = [], []
+    try:
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if entry.name.startswith("_"):
+                        if log_callback:
+                            rel_path = os.path.relpath(entry.path, root_abs)
+                            log_callback(f"건너뛰는 디렉토리: {rel_path}\n")
+                    elif not entry.is_symlink() and not (
+                        folder_filter and folder_filter.prune(entry.path)
+                    ):
+                        subdirs.append(entry.path)
+                elif entry.name.lower().endswith(".pdf"):
+                    try:
+                        stat = entry.stat()
+                        files.append(PdfEntry(entry.path, stat.st_size, stat.st_mtime))
+                    except OSError:
+                        files.append(PdfEntry(entry.path))
+    except OSError as e:
+        if log_callback:
+            log_callback(f"디렉토리를 읽을 수 없음: {dir_path} ({e})\n")
+    if files and folder_filter and not folder_filter.matches(dir_path):
+        files = []
+    if files and log_callback:
+        rel_dir = os.path.relpath(dir_path, root_abs)
+        log_callback(f"PDF 파일 발견: {rel_dir} ({len(files)}개)\n")
+    return files, subdirs
+
+
+def _walk(top, root_abs, log_callback=None, folder_filter=None):
+    """Yield PdfEntry objects below top in os.walk (top-down) order."""
+    stack = [top]
+    while stack:
+        files, subdirs = _scan_dir(stack.pop(), root_abs, log_callback, folder_filter)
+        yield from files
+        stack.extend(reversed(subdirs))
+
+
+def _collect_subtree(top, root_abs, folder_filter=None):
+    """Walk one subtree in a worker thread; return (entries, log messages)."""
+    messages = []
+    return list(_walk(top, root_abs, messages.append, folder_filter)), messages
+
+
+def iter_pdf_entries(root_dir=".", log_callback=None, walk_jobs=1, folder_filter=None):
+    """Lazily yield a PdfEntry for every PDF below root_dir (os.walk order).
+
+    walk_jobs가 1보다 크면 최상위 하위 폴더(날짜 폴더)들을 스레드로 동시에 탐색합니다.
+    느린 네트워크 공유 폴더에서 유용하며, 결과와 로그 순서는 순차 탐색과 같습니다.
+    folder_filter(FolderFilter)가 주어지면 조건에 맞지 않는 하위 트리는 PDF를 열기
+    전에 탐색 단계에서 제외합니다.
+    """
+    root_abs = os.path.abspath(root_dir)
+    if folder_filter is not None and not folder_filter.active:
+        folder_filter = None
+    if folder_filter and folder_filter.prune(root_abs):
+        return
+    files, subdirs = _scan_dir(root_abs, root_abs, log_callback, folder_filter)
+    yield from files
+
+    if walk_jobs <= 1 or len(subdirs) <= 1:
+        for subdir in subdirs:
+            yield from _walk(subdir, root_abs, log_callback, folder_filter)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(walk_jobs, len(subdirs))) as executor:
+        futures = [
+            executor.submit(_collect_subtree, subdir, root_abs, folder_filter)
+            for subdir in subdirs
+        ]
+        for future in futures:
+            entries, messages = future.result()
+            if log_callback:
+                for message in messages:
+                    log_callback(message)
+            yield from entries
@@ -0,0 +1,146 @@
+import os
+import json
+import hashlib
+
+from discovery import file_stat
+
+CACHE_DIR_NAME = "_cache"
+CACHE_FILE_NAME = "extraction_cache.json"
+
+
+def get_cache_dir(reports_dir):
+    """reports 디렉토리 옆(같은 상위 폴더)의 캐시 디렉토리 경로를 반환합니다.
+
+    언더스코어로 시작하므로 PDF 검색 시 자동으로 제외됩니다.
+    """
+    return os.path.join(os.path.dirname(os.path.abspath(reports_dir)), CACHE_DIR_NAME)
+
+
+def hash_file(path, chunk_size=1024 * 1024):
+    """Return the SHA-1 hex digest of a file's contents."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """파싱된 PDF 메트릭을 파일 경로/크기/수정시간/내용 해시 기준으로 저장하는 디스크 캐시.
+
+    크기와 수정시간이 같으면 바로 재사용하고, 다르면 내용 해시를 비교합니다.
+    파서 버전이 바뀌면 기존 캐시 전체가 무효화됩니다.
+    """
+
+    def __init__(self, cache_path, parser_version, log_callback=None, rebuild=False):
+        self.cache_path = cache_path
+        self.parser_version = str(parser_version)
+        self.log_callback = log_callback
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        if not rebuild:
+            self._load()
+        else:
+            self._log("캐시를 새로 생성합니다 (--rebuild-cache).\n")
+            self._dirty = True
+
+    def _log(self, message):
+        if self.log_callback:
+            self.log_callback(message)
+
+    def _load(self):
+        try:
+            if not os.path.exists(self.cache_path):
+                return
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                content = json.load(f)
+            if content.get("parser_version") != self.parser_version:
+                self._log(
+                    f"파서 버전이 변경되어 캐시를 무효화합니다: "
+                    f"{content.get('parser_version')} -> {self.parser_version}\n"
+                )
+                self._dirty = True
+                return
+            self.entries = content.get("entries", {})
+            self._log(f"추출 캐시 로드됨: {len(self.entries)}개 항목\n")
+        except Exception as e:
+            self._log(f"캐시 파일 로드 중 오류 발생: {e}\n")
+            self.entries = {}
+
+    def lookup(self, pdf_path):
+        """Return (hit, record) for a PDF file. record may be None for cached failures.
+
+        pdf_path가 PdfEntry이면 탐색 시 얻은 크기/수정시간을 그대로 사용합니다.
+        """
+        key = os.path.abspath(pdf_path)
+        entry = self.entries.get(key)
+        try:
+            size, mtime = file_stat(pdf_path)
+        except OSError:
+            self.misses += 1
+            return False, None
+
+        if entry:
+            if entry["size"] == size and entry["mtime"] == mtime:
+                self.hits += 1
+                return True, entry["record"]
+            if entry["size"] == size:
+                try:
+                    if hash_file(key) == entry["hash"]:
+                        # 내용은 같고 수정시간만 바뀐 경우
+                        entry["mtime"] = mtime
+                        self._dirty = True
+                        self.hits += 1
+                        return True, entry["record"]
+                except OSError:
+                    pass
+
+        self.misses += 1
+        return False, None
+
+    def file_hash(self, pdf_path):
+        """Return the content hash of a PDF, reusing the cached hash if it is unchanged.
+
+        파일을 읽을 수 없으면 OSError가 발생합니다.
+        """
+        key = os.path.abspath(pdf_path)
+        entry = self.entries.get(key)
+        size, mtime = file_stat(pdf_path)
+        if entry and entry["size"] == size and entry["mtime"] == mtime:
+            return entry["hash"]
+        return hash_file(key)
+
+    def store(self, pdf_path, record):
+        """Store the parsed record (or None for a failed file) for a PDF file."""
+        key = os.path.abspath(pdf_path)
+        try:
+            size, mtime = file_stat(pdf_path)
+            self.entries[key] = {
+                "size": size,
+                "mtime": mtime,
+                "hash": hash_file(key),
+                "record": record,
+            }
+            self._dirty = True
+        except OSError as e:
+            self._log(f"캐시 저장 실패 {key}: {e}\n")
+
+    def save(self):
+        """Write the cache to disk if it changed."""
+        if not self._dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"parser_version": self.parser_version, "entries": self.entries},
+                    f,
+                    ensure_ascii=False,
+                )
+            os.replace(tmp_path, self.cache_path)
+            self._dirty = False
+        except Exception as e:
+            self._log(f"캐시 파일 저장 중 오류 발생: {e}\n")
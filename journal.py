@@ -0,0 +1,181 @@
+import os
+import json
+import time
+
+from discovery import file_stat
+
+JOURNAL_FILE_NAME = "run_journal.jsonl"
+
+# 이 개수만큼 모이거나 마지막 저장 후 이 시간(초)이 지나면 디스크에 기록합니다.
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL = 5.0
+
+
+def journal_path(reports_dir, shard=None):
+    """Return the run journal path in reports_dir (one per --shard (i, N))."""
+    if shard:
+        name = f"run_journal_shard_{shard[0]}_of_{shard[1]}.jsonl"
+        return os.path.join(reports_dir, name)
+    return os.path.join(reports_dir, JOURNAL_FILE_NAME)
+
+
+def read_journal_header(path):
+    """Return the header dict of a run journal, or None if missing/unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+    return header if isinstance(header, dict) and header.get("type") == "run" else None
+
+
+class RunJournal:
+    """처리가 끝난 PDF 레코드를 한 줄씩 추가하는 실행 저널 (JSON Lines).
+
+    첫 줄은 실행 정보(루트 폴더, 파서/캐시 버전)이고 이후 줄은 파일 경로/크기/
+    수정시간과 레코드(실패한 파일은 null)입니다. 레코드는 batch_size개 또는
+    flush_interval초마다 fsync까지 기록하므로 프로그램이 비정상 종료되어도 그 전까지
+    처리한 파일은 남습니다. resume이 켜져 있고 같은 루트/버전의 저널이 있으면 이어서
+    기록하며, lookup()으로 크기/수정시간이 같은 파일의 레코드를 돌려줍니다.
+    정상적으로 끝난 실행의 저널은 close(completed=True)에서 삭제됩니다.
+    """
+
+    def __init__(
+        self,
+        path,
+        root_abs,
+        version,
+        log_callback=None,
+        resume=False,
+        batch_size=DEFAULT_BATCH_SIZE,
+        flush_interval=DEFAULT_FLUSH_INTERVAL,
+    ):
+        self.path = path
+        self.root_abs = root_abs
+        self.version = str(version)
+        self.log_callback = log_callback
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.entries = {}
+        self.restored = 0
+        self._restored_paths = set()
+        self._pending = []
+        self._last_flush = time.monotonic()
+
+        resumed = resume and self._load()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a" if resumed else "w", encoding="utf-8")
+        if not resumed:
+            self._pending.append(
+                {
+                    "type": "run",
+                    "root_abs": root_abs,
+                    "version": self.version,
+                    "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                }
+            )
+            self.flush()
+
+    def _log(self, message):
+        if self.log_callback:
+            self.log_callback(message)
+
+    def _load(self):
+        """Read an existing journal for resuming; return True if it can be continued."""
+        header = read_journal_header(self.path)
+        if header is None:
+            self._log("재개할 이전 실행 기록이 없어 처음부터 처리합니다.\n")
+            return False
+        if header.get("root_abs") != self.root_abs or header.get("version") != (
+            self.version
+        ):
+            self._log(
+                "이전 실행 기록의 폴더 또는 파서 설정이 달라 처음부터 처리합니다.\n"
+            )
+            return False
+        torn = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            f.readline()
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    self.entries[entry["path"]] = (
+                        entry["size"],
+                        entry["mtime"],
+                        entry["record"],
+                    )
+                except (ValueError, KeyError, TypeError):
+                    # 기록 도중 종료되어 잘린 마지막 줄
+                    torn += 1
+        self._log(
+            f"이전 실행 기록 로드됨: {len(self.entries)}개 파일 "
+            f"({header.get('started')} 시작)\n"
+        )
+        if torn:
+            # 잘린 줄 뒤에 이어 쓰지 않도록 줄바꿈을 맞춤
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n")
+        return True
+
+    def lookup(self, pdf_path):
+        """Return (hit, record) for a file completed in the resumed run.
+
+        크기/수정시간이 기록과 다르면 (False, None)을 반환해 다시 처리하게 합니다.
+        """
+        key = os.path.abspath(pdf_path)
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return False, None
+        try:
+            if file_stat(pdf_path) != (entry[0], entry[1]):
+                return False, None
+        except OSError:
+            return False, None
+        self.restored += 1
+        self._restored_paths.add(key)
+        return True, entry[2]
+
+    def add(self, pdf_path, record):
+        """Append the record (None for a failed file) of a completed file."""
+        key = os.path.abspath(pdf_path)
+        if key in self._restored_paths:
+            # 이미 저널에 있는 파일
+            self._restored_paths.discard(key)
+            return
+        try:
+            size, mtime = file_stat(pdf_path)
+        except OSError:
+            return
+        self._pending.append(
+            {"path": key, "size": size, "mtime": mtime, "record": record}
+        )
+        if (
+            len(self._pending) >= self.batch_size
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        """Write pending lines and fsync them to disk."""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        lines, self._pending = self._pending, []
+        try:
+            self._file.write(
+                "".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines)
+            )
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except (OSError, ValueError) as e:
+            self._log(f"실행 기록 저장 중 오류 발생: {e}\n")
+
+    def close(self, completed=False):
+        """Flush and close; remove the journal if the run completed."""
+        self.flush()
+        self._file.close()
+        if completed:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
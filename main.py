@@ -1,36 +1,81 @@
 import os
 import re
 import glob
-from collections import defaultdict
+from collections import deque
 import traceback
-import PyPDF2
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
 import sys
 import argparse
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.utils import get_column_letter
-import markdown
-import numpy as np
 import base64
 import io
-import platform
 import json
+import time
+import csv
+import importlib.util
+import math
+import unicodedata
+from contextlib import contextmanager
+from extraction_cache import (
+    ExtractionCache,
+    get_cache_dir,
+    hash_file,
+    CACHE_FILE_NAME,
+)
+from discovery import (
+    DuplicateFinder,
+    FolderFilter,
+    PdfEntry,
+    file_stat,
+    find_duplicate_files,
+    iter_pdf_entries,
+)
+from watch import DEFAULT_DEBOUNCE, DEFAULT_POLL_INTERVAL, PdfTreeWatcher
+from aggregation import (
+    METRICS,
+    TRIM_MODES,
+    FolderAggregates,
+    get_metrics_table,
+    metric_modes,
+    select_mean,
+)
+from record_store import RecordStore, load_snapshot, save_snapshot, snapshot_path
+from warehouse import GROUP_KEYS, MetricsWarehouse, warehouse_path
+from journal import RunJournal, journal_path, read_journal_header
+from sharding import (
+    find_shard_files,
+    merge_shards,
+    parse_shard,
+    save_shard,
+    shard_file_path,
+)
+from profiling import StageProfiler, profile_filename, profiled_stage, timed_stage
+from charts import (
+    CHART_FORMATS,
+    ChartCache,
+    chart_filename,
+    chart_key,
+    render_charts,
+)
 
-# Set up Korean font for matplotlib
-if platform.system() == "Darwin":  # macOS
-    plt.rcParams["font.family"] = "AppleGothic"
-elif platform.system() == "Windows":
-    plt.rcParams["font.family"] = "Malgun Gothic"
-else:  # Linux
-    plt.rcParams["font.family"] = "NanumGothic"
+CONFIG_FILE = "config.json"
 
-plt.rcParams["axes.unicode_minus"] = False  # 마이너스 기호 깨짐 방지
+# 파싱 로직이 바뀌어 결과가 달라질 수 있으면 올려서 추출 캐시를 무효화합니다.
+PARSER_VERSION = 1
 
-CONFIG_FILE = "config.json"
+# 내용이 같은 PDF 복사본을 폴더 평균에 포함("count")하거나 제외("ignore")
+DUPLICATE_MODES = ("count", "ignore")
+
+# main 모듈 import(CLI/GUI 콜드 스타트)에 허용하는 시간 (--profile-startup으로 확인)
+STARTUP_IMPORT_BUDGET_MS = 150
+
+# 단계별로 필요할 때만 import하는 무거운 모듈
+LAZY_STAGE_MODULES = [
+    ("PDF 추출", "PyPDF2"),
+    ("집계", "pandas"),
+    ("HTML 리포트", "markdown"),
+    ("Excel 리포트", "openpyxl"),
+    ("성능 차트", "matplotlib.figure"),
+]
 
 
 def get_last_folder():
@@ -60,10 +105,142 @@ def save_last_folder(folder_path, avg_mode=None):
         print(f"설정 파일 저장 중 오류 발생: {e}")
 
 
-def find_pdf_files(root_dir=".", log_callback=None):
-    """Find all PDF files in all subdirectories without specific naming restrictions."""
-    pdf_files = []
+# 메트릭별 패턴 목록 (앞에 있을수록 우선순위가 높음)
+PLAYTIME_PATTERNS = [
+    r"Play\s*Time\s*\n\s*(\d+\.?\d*)\s*s",  # Standard pattern: "Play Time" followed by newline and digits with 's'
+    r"Play\s+Time\s*[\r\n\s]*(\d+\.?\d*)\s*s",  # More flexible with various whitespace
+    r"Play Time.*?(\d+\.\d+)\s*s",  # Any content between "Play Time" and the number
+    r"Play\s*Time[^0-9]*(\d+\.?\d+)",  # Anything except digits between "Play Time" and number
+    r"Play\s*Time.*?(\d+\.?\d+)",  # Most general pattern
+    r"play\s*time.*?(\d+\.?\d+)\s*s",  # Case insensitive variation
+    r"duration.*?(\d+\.?\d+)\s*s",  # Alternative term "duration"
+    r"length.*?(\d+\.?\d+)\s*s",  # Alternative term "length"
+    r"time.*?(\d+\.?\d+)\s*s",  # Last resort - any "time" followed by a number and "s"
+]
+
+FPS_PATTERNS = [
+    r"FPS\s*.*?\s*Avg\s*:\s*(\d+\.?\d*)",  # Standard pattern
+    r"FPS.*?average.*?(\d+\.?\d*)",  # Alternative "average" wording
+    r"Frames\s*Per\s*Second.*?(\d+\.?\d*)",  # Full "frames per second" term
+    r"Frame\s*Rate.*?(\d+\.?\d*)",  # Alternative "frame rate" term
+    r"Average\s*FPS.*?(\d+\.?\d*)",  # "Average FPS" pattern
+    r"fps.*?(\d+\.?\d*)",  # Simple "fps" mention
+]
+
+BANDWIDTH_PATTERNS = [
+    r"Bandwidth\s*.*?\s*Avg\s*:\s*(\d+\.?\d*)\s*Mbps",  # Standard pattern
+    r"Bandwidth.*?(\d+\.?\d*)\s*Mbps",  # Simpler pattern
+    r"Average\s*Bandwidth.*?(\d+\.?\d*)\s*Mbps",  # "Average Bandwidth" term
+    r"Network\s*Speed.*?(\d+\.?\d*)\s*Mbps",  # Alternative "Network Speed" term
+    r"Data\s*Rate.*?(\d+\.?\d*)\s*Mbps",  # Alternative "Data Rate" term
+    r"(\d+\.?\d*)\s*Mbps",  # Last resort - any Mbps value
+]
+
+RTT_PATTERNS = [
+    r"Round Trip Time\s*.*?\s*Avg\s*:\s*(\d+\.?\d*)\s*ms",  # Standard pattern
+    r"RTT.*?(\d+\.?\d*)\s*ms",  # RTT abbreviation
+    r"Round\s*Trip.*?(\d+\.?\d*)\s*ms",  # Partial "Round Trip" term
+    r"Latency.*?(\d+\.?\d*)\s*ms",  # Alternative "Latency" term
+    r"Ping.*?(\d+\.?\d*)\s*ms",  # Alternative "Ping" term
+    r"Response\s*Time.*?(\d+\.?\d*)\s*ms",  # Alternative "Response Time" term
+]
+
+METRIC_PATTERNS = {
+    "playtime": PLAYTIME_PATTERNS,
+    "fps": FPS_PATTERNS,
+    "bandwidth": BANDWIDTH_PATTERNS,
+    "rtt": RTT_PATTERNS,
+}
+
+# 각 패턴이 시작하는 키워드 (대소문자 무시). 스캐너 엔진은 키워드 위치를 한 번에
+# 찾은 뒤, 키워드가 없는 패턴은 건너뜁니다. (keyword, 패턴이 키워드로 시작하는지)
+METRIC_PATTERN_ANCHORS = {
+    "playtime": [("play", True)] * 6
+    + [("duration", True), ("length", True), ("time", True)],
+    "fps": [
+        ("fps", True),
+        ("fps", True),
+        ("frame", True),
+        ("frame", True),
+        ("average", True),
+        ("fps", True),
+    ],
+    "bandwidth": [
+        ("bandwidth", True),
+        ("bandwidth", True),
+        ("average", True),
+        ("network", True),
+        ("data", True),
+        ("mbps", False),  # 숫자로 시작하므로 키워드 존재 여부만 확인
+    ],
+    "rtt": [
+        ("round", True),
+        ("rtt", True),
+        ("round", True),
+        ("latency", True),
+        ("ping", True),
+        ("response", True),
+    ],
+}
+
+
+def _compile_metric_pattern(pattern):
+    """Compile a metric pattern together with its head (the part before the first '.*?').
+
+    "head.*?rest" 형태(DOTALL)의 패턴은 head가 처음 나타나는 위치에서 매치가 없으면
+    뒤쪽 위치에서도 매치가 없습니다. 따라서 첫 head 위치에서 한 번만 시도해도
+    re.search와 같은 결과를 얻으며, 키워드마다 문서 끝까지 다시 훑는 백트래킹을 피합니다.
+    """
+    head, sep, _ = pattern.partition(".*?")
+    compiled_head = (
+        re.compile(head, re.DOTALL | re.IGNORECASE) if sep and head else None
+    )
+    return re.compile(pattern, re.DOTALL | re.IGNORECASE), compiled_head
 
+
+COMPILED_METRIC_PATTERNS = {
+    metric: [
+        (*_compile_metric_pattern(pattern), keyword, is_prefix)
+        for pattern, (keyword, is_prefix) in zip(
+            METRIC_PATTERNS[metric], METRIC_PATTERN_ANCHORS[metric]
+        )
+    ]
+    for metric in METRIC_PATTERNS
+}
+
+# 모든 키워드를 하나의 대체 패턴으로 묶은 스캐너. 전방탐색으로 겹치는 키워드도 모두 찾습니다.
+_ANCHOR_KEYWORDS = sorted(
+    {keyword for anchors in METRIC_PATTERN_ANCHORS.values() for keyword, _ in anchors}
+)
+_ANCHOR_FIRST_CHARS = sorted({keyword[0] for keyword in _ANCHOR_KEYWORDS})
+ANCHOR_SCANNER = re.compile(
+    f"(?=[{''.join(_ANCHOR_FIRST_CHARS)}])(?:"
+    + "|".join(
+        "|".join(keyword for keyword in _ANCHOR_KEYWORDS if keyword[0] == first)
+        for first in _ANCHOR_FIRST_CHARS
+    )
+    + ")",
+    re.IGNORECASE,
+)
+_ANCHOR_KEYWORD_PATTERNS = {
+    keyword: re.compile(keyword, re.IGNORECASE) for keyword in _ANCHOR_KEYWORDS
+}
+
+# 페이지 단위 조기 종료 판단에 사용하는 각 메트릭의 기본(1순위) 패턴
+PRIMARY_METRIC_PATTERNS = {
+    metric: patterns[0][0] for metric, patterns in COMPILED_METRIC_PATTERNS.items()
+}
+
+
+def iter_pdf_files(root_dir=".", log_callback=None, walk_jobs=1, folder_filter=None):
+    """Lazily yield PDF files in all subdirectories without specific naming restrictions.
+
+    디렉토리를 탐색하면서 발견하는 즉시 PdfEntry(절대 경로 + 크기/수정시간)를
+    반환하므로, 전체 탐색이 끝나기 전에 처리를 시작할 수 있습니다.
+    언더스코어로 시작하는 디렉토리는 내려가지 않으며, walk_jobs가 1보다 크면
+    최상위 하위 폴더들을 동시에 탐색합니다.
+    folder_filter(FolderFilter)가 주어지면 조건에 맞지 않는 폴더는 탐색하지 않습니다.
+    """
     try:
         # 검색 시작 디렉토리의 절대 경로를 구함
         root_abs = os.path.abspath(root_dir)
@@ -71,52 +248,56 @@ def find_pdf_files(root_dir=".", log_callback=None):
         if log_callback:
             log_callback(f"검색 시작 디렉토리: {root_abs}\n")
 
-        for dirpath, dirnames, filenames in os.walk(root_abs):
-            # 현재 디렉토리가 root_dir의 하위 디렉토리인지 확인
-            rel_path = os.path.relpath(dirpath, root_abs)
-            if rel_path == ".":
-                path_parts = []
-            else:
-                # Windows에서도 올바르게 동작하도록 normpath 사용
-                path_parts = os.path.normpath(rel_path).split(os.sep)
+        if folder_filter is not None and folder_filter.active and log_callback:
+            log_callback(f"폴더 필터: {folder_filter.describe()}\n")
 
-            # 언더스코어로 시작하는 디렉토리 건너뛰기
-            should_skip = False
-            for part in path_parts:
-                if part.startswith("_"):
-                    if log_callback:
-                        log_callback(f"건너뛰는 디렉토리: {rel_path}\n")
-                    should_skip = True
-                    break
+        yield from iter_pdf_entries(root_abs, log_callback, walk_jobs, folder_filter)
 
-            if should_skip:
-                dirnames[:] = []  # 하위 디렉토리 탐색 중지
-                continue
+        if folder_filter is not None and folder_filter.pruned and log_callback:
+            log_callback(f"필터로 제외된 디렉토리: {folder_filter.pruned}개\n")
+    except Exception as e:
+        if log_callback:
+            log_callback(f"PDF 파일 검색 중 오류 발생: {e}\n")
 
-            for filename in filenames:
-                if filename.lower().endswith(".pdf"):
-                    # 상대 경로 생성
-                    if rel_path == ".":
-                        rel_file_path = filename
-                    else:
-                        rel_file_path = os.path.join(rel_path, filename)
 
-                    # 절대 경로로 변환
-                    abs_file_path = os.path.join(root_abs, rel_file_path)
-                    pdf_files.append(abs_file_path)
+def find_pdf_files(root_dir=".", log_callback=None, walk_jobs=1, folder_filter=None):
+    """Find all PDF files in all subdirectories without specific naming restrictions."""
+    return list(iter_pdf_files(root_dir, log_callback, walk_jobs, folder_filter))
 
-                    if log_callback:
-                        log_callback(f"PDF 파일 발견: {abs_file_path}\n")
 
-        return pdf_files
-    except Exception as e:
-        if log_callback:
-            log_callback(f"PDF 파일 검색 중 오류 발생: {e}\n")
-        return []
+def normalize_pdf_text(text):
+    """Remove whitespace around periods so split decimals parse correctly."""
+    return re.sub(r"\s*\.\s*", ".", text)
+
 
+def _find_primary_metrics(text, found=()):
+    """Return the set of metrics whose primary pattern matches the partial text.
+
+    숫자로 끝나는 매치는 뒤에 공백이 아닌 문자가 있어야 인정합니다. 다음 페이지
+    텍스트가 이어 붙으면서 숫자가 바뀌는 경우를 막기 위함입니다.
+    """
+    found = set(found)
+    text = normalize_pdf_text(text)
+    for metric, pattern in PRIMARY_METRIC_PATTERNS.items():
+        if metric in found:
+            continue
+        match = pattern.search(text)
+        if not match:
+            continue
+        if not match.group(0)[-1].isdigit() or text[match.end() :].strip():
+            found.add(metric)
+    return found
+
+
+def extract_text_from_pdf(pdf_path, log_callback=None, incremental=False):
+    """Extract text content from a PDF file.
+
+    incremental이 True이면 페이지 단위로 읽으면서 playtime/FPS/bandwidth/RTT가
+    모두 기본 패턴으로 발견되는 즉시 나머지 페이지 추출을 중단합니다.
+    하나라도 빠지면 문서 전체를 추출합니다.
+    """
+    import PyPDF2
 
-def extract_text_from_pdf(pdf_path, log_callback=None):
-    """Extract text content from a PDF file."""
     try:
         # 파일 경로를 절대 경로로 변환
         abs_path = os.path.abspath(pdf_path)
@@ -129,52 +310,213 @@ def extract_text_from_pdf(pdf_path, log_callback=None):
         try:
             with open(abs_path, "rb") as file:
                 reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text()
-            return text
+                page_texts = []
+                found = set()
+                num_pages = len(reader.pages)
+                for page_idx, page in enumerate(reader.pages):
+                    page_texts.append(page.extract_text())
+                    if incremental and page_idx < num_pages - 1:
+                        found = _find_primary_metrics("".join(page_texts), found)
+                        if len(found) == len(PRIMARY_METRIC_PATTERNS):
+                            if log_callback:
+                                log_callback(
+                                    f"모든 메트릭 발견, {page_idx + 1}/{num_pages} 페이지에서 추출 중단\n"
+                                )
+                            break
+            return "".join(page_texts)
         except PermissionError:
             if log_callback:
                 log_callback(f"파일 접근 권한 없음: {abs_path}\n")
             return ""
+        except MemoryError:
+            # 워커의 메모리 제한 초과는 호출한 쪽에서 기록하도록 그대로 전달
+            raise
         except Exception as e:
             if log_callback:
                 log_callback(f"PDF 파일 읽기 오류 {abs_path}: {e}\n")
             return ""
+    except MemoryError:
+        raise
     except Exception as e:
         if log_callback:
             log_callback(f"파일 처리 오류 {pdf_path}: {e}\n")
         return ""
 
 
-def parse_pdf_content(text, pdf_path, log_callback=None):
-    """Parse PDF text content with improved data extraction and error indication."""
-    data = {}
-
-    # Extract filename
+def get_file_timestamp(pdf_path):
+    """Return the timestamp from the filename, or the file modification time as fallback."""
     filename = os.path.basename(pdf_path)
-    data["filename"] = filename
+    timestamp_match = re.search(r"(\d{4}_\d{2}_\d{2}_\d{2}_\d{2}_\d{2})", filename)
+    if timestamp_match:
+        return timestamp_match.group(1).replace("_", "-")
+    # Use file modification date as fallback
+    try:
+        mod_time = file_stat(pdf_path)[1]
+        return datetime.fromtimestamp(mod_time).strftime("%Y-%m-%d-%H-%M-%S")
+    except:
+        return "Unknown"
+
 
+def get_filename_fields(pdf_path):
+    """Return the record fields taken from the file name (filename, region, timestamp)."""
+    filename = os.path.basename(pdf_path)
     # Extract region from filename if available (optional)
     region_match = re.search(r"\(([^)]+)\)", filename)
-    if region_match:
-        data["region"] = region_match.group(1)
-    else:
-        data["region"] = "Unknown"  # Set default value if pattern not found
+    return {
+        "filename": filename,
+        "region": region_match.group(1) if region_match else "Unknown",
+        # Extract timestamp from filename if available (optional)
+        "timestamp": get_file_timestamp(pdf_path),
+    }
 
-    # Extract timestamp from filename if available (optional)
-    timestamp_match = re.search(r"(\d{4}_\d{2}_\d{2}_\d{2}_\d{2}_\d{2})", filename)
-    if timestamp_match:
-        data["timestamp"] = timestamp_match.group(1).replace("_", "-")
-    else:
-        # Use file modification date as fallback
-        try:
-            mod_time = os.path.getmtime(pdf_path)
-            data["timestamp"] = datetime.fromtimestamp(mod_time).strftime(
-                "%Y-%m-%d-%H-%M-%S"
+
+def _anchor_keyword(matched):
+    """Map matched anchor text back to its keyword."""
+    keyword = matched.casefold()
+    if keyword in _ANCHOR_KEYWORD_PATTERNS:
+        return keyword
+    # 유니코드 대소문자 변환으로 일치한 경우 (예: 'ſ', 켈빈 기호)
+    for keyword, pattern in _ANCHOR_KEYWORD_PATTERNS.items():
+        if pattern.fullmatch(matched):
+            return keyword
+    return None
+
+
+def scan_metric_anchors(text):
+    """Find every metric anchor keyword in a single pass over the text.
+
+    Returns a dict mapping anchor keyword to the sorted list of its start positions.
+    finditer는 겹치는 매치를 건너뛰므로, 각 매치 구간 안에서 시작하는 키워드는 따로 확인합니다.
+    """
+    anchors = {}
+    for match in ANCHOR_SCANNER.finditer(text):
+        start, end = match.span()
+        anchors.setdefault(_anchor_keyword(match.group()), []).append(start)
+        for pos in range(start + 1, end):
+            inner = ANCHOR_SCANNER.match(text, pos)
+            if inner:
+                anchors.setdefault(_anchor_keyword(inner.group()), []).append(pos)
+    for positions in anchors.values():
+        positions.sort()
+    return anchors
+
+
+class _LazyAnchors:
+    """Anchor index that scans the text only when a fallback pattern is needed."""
+
+    def __init__(self, text):
+        self.text = text
+        self._anchors = None
+
+    def positions(self, keyword):
+        if self._anchors is None:
+            self._anchors = scan_metric_anchors(self.text)
+        return self._anchors.get(keyword)
+
+
+def _iter_metric_matches(text, metric, anchors=None, limits=None):
+    """Yield (pattern index, match) for each pattern of a metric that matches, in priority order.
+
+    anchors가 None이면 기존 방식(패턴마다 전체 텍스트 re.search)으로 동작합니다.
+    anchors가 있으면 1순위 패턴은 컴파일된 패턴으로 바로 검색하고, 나머지 패턴은
+    키워드 스캔 결과를 사용해 키워드가 없으면 건너뛰고 있으면 첫 키워드 위치부터
+    검색합니다. 모든 매치는 키워드에서 시작하므로 결과는 기존 방식과 동일합니다.
+
+    limits(scanner 엔진 전용):
+      - "window": 보조 패턴을 각 키워드 뒤 N자 이내에서만 매칭
+      - "deadline": time.perf_counter() 기준 파싱 마감 시각. 넘으면 남은 패턴 중단
+      - "stats": 제한에 걸린 패턴을 기록할 dict
+    """
+    if anchors is None:
+        for i, pattern in enumerate(METRIC_PATTERNS[metric]):
+            match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
+            if match:
+                yield i, match
+        return
+
+    limits = limits or {}
+    window = limits.get("window")
+    deadline = limits.get("deadline")
+    stats = limits.get("stats")
+
+    for i, (pattern, head, keyword, is_prefix) in enumerate(
+        COMPILED_METRIC_PATTERNS[metric]
+    ):
+        if deadline is not None and i > 0 and time.perf_counter() > deadline:
+            if stats is not None:
+                stats.setdefault("budget_exceeded", []).append(f"{metric}#{i + 1}")
+            return
+        if i == 0:
+            start = 0
+        else:
+            positions = anchors.positions(keyword)
+            if not positions:
+                continue
+            start = positions[0] if is_prefix else 0
+
+        if i > 0 and window and is_prefix:
+            # 키워드 위치마다 window 범위 안에서만 매칭 (앞쪽 위치부터 = search와 같은 순서)
+            match = None
+            truncated = False
+            for pos in positions:
+                end = min(pos + window, len(text))
+                match = pattern.match(text, pos, end)
+                if match and match.end() == end < len(text):
+                    # 윈도우 경계에서 잘린 숫자일 수 있으므로 인정하지 않음
+                    match = None
+                if match:
+                    break
+                truncated = truncated or end < len(text)
+            if not match and truncated and stats is not None:
+                stats.setdefault("window_limited", []).append(f"{metric}#{i + 1}")
+        elif head is not None:
+            head_match = head.search(text, start)
+            match = pattern.match(text, head_match.start()) if head_match else None
+        else:
+            match = pattern.search(text, start)
+        if match:
+            yield i, match
+
+
+def parse_pdf_content(
+    text,
+    pdf_path,
+    log_callback=None,
+    engine="scanner",
+    match_window=None,
+    time_budget=None,
+    stats=None,
+):
+    """Parse PDF text content with improved data extraction and error indication.
+
+    engine: "scanner"(단일 패스 키워드 스캔), "legacy"(기존 패턴별 전체 검색),
+    "compare"(두 엔진을 모두 실행해 결과가 다르면 로그를 남기고 legacy 결과 사용)
+    match_window/time_budget은 scanner 엔진에서만 적용되며, 제한에 걸린 패턴은
+    stats dict의 "window_limited"/"budget_exceeded" 목록에 기록됩니다.
+    """
+    if engine == "compare":
+        data = parse_pdf_content(text, pdf_path, log_callback, engine="legacy")
+        scanned = parse_pdf_content(text, pdf_path, engine="scanner")
+        if scanned != data and log_callback:
+            log_callback(
+                f"경고: 파서 엔진 결과 불일치 {pdf_path}\n"
+                f"  - legacy: {data}\n  - scanner: {scanned}\n"
             )
-        except:
-            data["timestamp"] = "Unknown"
+        return data
+
+    data = {}
+    anchors = _LazyAnchors(text) if engine == "scanner" else None
+    limits = {
+        "window": match_window,
+        "deadline": (
+            time.perf_counter() + time_budget if time_budget is not None else None
+        ),
+        "stats": stats,
+    }
+
+    # 파일 이름에서 얻는 값 (filename, region, timestamp)
+    data.update(get_filename_fields(pdf_path))
+    filename = data["filename"]
 
     # Debug information about the file being processed
     if log_callback:
@@ -183,33 +525,18 @@ def parse_pdf_content(text, pdf_path, log_callback=None):
     # Playtime extraction - enhanced pattern matching
     playtime_found = False
 
-    # List of pattern strategies to try
-    playtime_patterns = [
-        r"Play\s*Time\s*\n\s*(\d+\.?\d*)\s*s",  # Standard pattern: "Play Time" followed by newline and digits with 's'
-        r"Play\s+Time\s*[\r\n\s]*(\d+\.?\d*)\s*s",  # More flexible with various whitespace
-        r"Play Time.*?(\d+\.\d+)\s*s",  # Any content between "Play Time" and the number
-        r"Play\s*Time[^0-9]*(\d+\.?\d+)",  # Anything except digits between "Play Time" and number
-        r"Play\s*Time.*?(\d+\.?\d+)",  # Most general pattern
-        r"play\s*time.*?(\d+\.?\d+)\s*s",  # Case insensitive variation
-        r"duration.*?(\d+\.?\d+)\s*s",  # Alternative term "duration"
-        r"length.*?(\d+\.?\d+)\s*s",  # Alternative term "length"
-        r"time.*?(\d+\.?\d+)\s*s",  # Last resort - any "time" followed by a number and "s"
-    ]
-
     # Try each pattern strategy
-    for i, pattern in enumerate(playtime_patterns):
-        playtime_match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-        if playtime_match:
-            try:
-                # Extract the value from the matched group
-                data["playtime"] = float(playtime_match.group(1))
-                if log_callback:
-                    log_callback(f"패턴 {i+1}로 재생 시간 찾음: {data['playtime']} s\n")
-                playtime_found = True
-                break
-            except (ValueError, IndexError) as e:
-                if log_callback:
-                    log_callback(f"패턴 {i+1}로 재생 시간 파싱 오류: {e}\n")
+    for i, playtime_match in _iter_metric_matches(text, "playtime", anchors, limits):
+        try:
+            # Extract the value from the matched group
+            data["playtime"] = float(playtime_match.group(1))
+            if log_callback:
+                log_callback(f"패턴 {i+1}로 재생 시간 찾음: {data['playtime']} s\n")
+            playtime_found = True
+            break
+        except (ValueError, IndexError) as e:
+            if log_callback:
+                log_callback(f"패턴 {i+1}로 재생 시간 파싱 오류: {e}\n")
 
     # If still not found, try looking directly at play time context
     if not playtime_found:
@@ -217,8 +544,9 @@ def parse_pdf_content(text, pdf_path, log_callback=None):
             log_callback("재생 시간 패턴 실패, Play Time 섹션 컨텍스트 검사 중...\n")
 
         # Get 200 characters surrounding "Play Time" mention
+        # 스캐너 엔진에서 "play" 키워드가 없으면 전체 텍스트 소문자 변환을 생략
         play_time_idx = text.find("Play Time")
-        if play_time_idx == -1:
+        if play_time_idx == -1 and (anchors is None or anchors.positions("play")):
             play_time_idx = text.lower().find("play time")
 
         if play_time_idx != -1:
@@ -274,29 +602,18 @@ def parse_pdf_content(text, pdf_path, log_callback=None):
             log_callback("재생 시간을 찾을 수 없어 오류 값(-1) 설정\n")
 
     # Extract FPS information
-    fps_patterns = [
-        r"FPS\s*.*?\s*Avg\s*:\s*(\d+\.?\d*)",  # Standard pattern
-        r"FPS.*?average.*?(\d+\.?\d*)",  # Alternative "average" wording
-        r"Frames\s*Per\s*Second.*?(\d+\.?\d*)",  # Full "frames per second" term
-        r"Frame\s*Rate.*?(\d+\.?\d*)",  # Alternative "frame rate" term
-        r"Average\s*FPS.*?(\d+\.?\d*)",  # "Average FPS" pattern
-        r"fps.*?(\d+\.?\d*)",  # Simple "fps" mention
-    ]
-
     fps_found = False
 
-    for i, pattern in enumerate(fps_patterns):
-        fps_match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-        if fps_match:
-            try:
-                data["fps"] = float(fps_match.group(1))
-                if log_callback:
-                    log_callback(f"패턴 {i+1}로 FPS 찾음: {data['fps']}\n")
-                fps_found = True
-                break
-            except (ValueError, IndexError) as e:
-                if log_callback:
-                    log_callback(f"패턴 {i+1}로 FPS 파싱 오류: {e}\n")
+    for i, fps_match in _iter_metric_matches(text, "fps", anchors, limits):
+        try:
+            data["fps"] = float(fps_match.group(1))
+            if log_callback:
+                log_callback(f"패턴 {i+1}로 FPS 찾음: {data['fps']}\n")
+            fps_found = True
+            break
+        except (ValueError, IndexError) as e:
+            if log_callback:
+                log_callback(f"패턴 {i+1}로 FPS 파싱 오류: {e}\n")
 
     # If not found, use error value (-1)
     if not fps_found:
@@ -304,32 +621,19 @@ def parse_pdf_content(text, pdf_path, log_callback=None):
         if log_callback:
             log_callback("FPS를 찾을 수 없어 오류 값(-1) 설정\n")
 
-    # Bandwidth patterns
-    bandwidth_patterns = [
-        r"Bandwidth\s*.*?\s*Avg\s*:\s*(\d+\.?\d*)\s*Mbps",  # Standard pattern
-        r"Bandwidth.*?(\d+\.?\d*)\s*Mbps",  # Simpler pattern
-        r"Average\s*Bandwidth.*?(\d+\.?\d*)\s*Mbps",  # "Average Bandwidth" term
-        r"Network\s*Speed.*?(\d+\.?\d*)\s*Mbps",  # Alternative "Network Speed" term
-        r"Data\s*Rate.*?(\d+\.?\d*)\s*Mbps",  # Alternative "Data Rate" term
-        r"(\d+\.?\d*)\s*Mbps",  # Last resort - any Mbps value
-    ]
-
+    # Extract bandwidth information
     bw_found = False
 
-    for i, pattern in enumerate(bandwidth_patterns):
-        bandwidth_match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-        if bandwidth_match:
-            try:
-                data["bandwidth"] = float(bandwidth_match.group(1))
-                if log_callback:
-                    log_callback(
-                        f"패턴 {i+1}로 대역폭 찾음: {data['bandwidth']} Mbps\n"
-                    )
-                bw_found = True
-                break
-            except (ValueError, IndexError) as e:
-                if log_callback:
-                    log_callback(f"패턴 {i+1}로 대역폭 파싱 오류: {e}\n")
+    for i, bandwidth_match in _iter_metric_matches(text, "bandwidth", anchors, limits):
+        try:
+            data["bandwidth"] = float(bandwidth_match.group(1))
+            if log_callback:
+                log_callback(f"패턴 {i+1}로 대역폭 찾음: {data['bandwidth']} Mbps\n")
+            bw_found = True
+            break
+        except (ValueError, IndexError) as e:
+            if log_callback:
+                log_callback(f"패턴 {i+1}로 대역폭 파싱 오류: {e}\n")
 
     # If not found, use error value (-1)
     if not bw_found:
@@ -337,30 +641,19 @@ def parse_pdf_content(text, pdf_path, log_callback=None):
         if log_callback:
             log_callback("대역폭을 찾을 수 없어 오류 값(-1) 설정\n")
 
-    # RTT patterns
-    rtt_patterns = [
-        r"Round Trip Time\s*.*?\s*Avg\s*:\s*(\d+\.?\d*)\s*ms",  # Standard pattern
-        r"RTT.*?(\d+\.?\d*)\s*ms",  # RTT abbreviation
-        r"Round\s*Trip.*?(\d+\.?\d*)\s*ms",  # Partial "Round Trip" term
-        r"Latency.*?(\d+\.?\d*)\s*ms",  # Alternative "Latency" term
-        r"Ping.*?(\d+\.?\d*)\s*ms",  # Alternative "Ping" term
-        r"Response\s*Time.*?(\d+\.?\d*)\s*ms",  # Alternative "Response Time" term
-    ]
-
+    # Extract RTT information
     rtt_found = False
 
-    for i, pattern in enumerate(rtt_patterns):
-        rtt_match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-        if rtt_match:
-            try:
-                data["rtt"] = float(rtt_match.group(1))
-                if log_callback:
-                    log_callback(f"패턴 {i+1}로 RTT 찾음: {data['rtt']} ms\n")
-                rtt_found = True
-                break
-            except (ValueError, IndexError) as e:
-                if log_callback:
-                    log_callback(f"패턴 {i+1}로 RTT 파싱 오류: {e}\n")
+    for i, rtt_match in _iter_metric_matches(text, "rtt", anchors, limits):
+        try:
+            data["rtt"] = float(rtt_match.group(1))
+            if log_callback:
+                log_callback(f"패턴 {i+1}로 RTT 찾음: {data['rtt']} ms\n")
+            rtt_found = True
+            break
+        except (ValueError, IndexError) as e:
+            if log_callback:
+                log_callback(f"패턴 {i+1}로 RTT 파싱 오류: {e}\n")
 
     # If not found, use error value (-1)
     if not rtt_found:
@@ -387,8 +680,634 @@ def get_folder_path(pdf_path):
         return "."
 
 
-def process_pdf_files(root_dir=".", log_callback=None, progress_callback=None):
-    """Process all PDF files in the directory structure."""
+def _process_single_pdf(pdf_file, log_callback=None, options=None, stats=None):
+    """Extract and parse a single PDF file. Returns the parsed data or None.
+
+    stats dict가 주어지면 파싱 제한(윈도우/시간 예산)에 걸린 패턴과 추출/파싱의
+    경과/CPU 시간(stats["timing"])이 기록됩니다.
+    """
+    options = options or {}
+    timing = {}
+    if stats is not None:
+        stats["timing"] = timing
+    started, cpu_started = time.perf_counter(), time.process_time()
+    text = extract_text_from_pdf(
+        pdf_file,
+        log_callback,
+        incremental=options.get("extract_mode") == "incremental",
+    )
+    text = normalize_pdf_text(text)
+    timing["extract_wall"] = time.perf_counter() - started
+    timing["extract_cpu"] = time.process_time() - cpu_started
+    if not text:
+        if log_callback:
+            log_callback(f"경고: {pdf_file} 파일에서 텍스트를 추출할 수 없습니다.\n")
+        return None
+
+    started, cpu_started = time.perf_counter(), time.process_time()
+    data = parse_pdf_content(
+        text,
+        pdf_file,
+        log_callback,
+        engine=options.get("engine", "scanner"),
+        match_window=options.get("match_window"),
+        time_budget=options.get("time_budget"),
+        stats=stats,
+    )
+    timing["parse_wall"] = time.perf_counter() - started
+    timing["parse_cpu"] = time.process_time() - cpu_started
+    if not data:
+        if log_callback:
+            log_callback(f"경고: {pdf_file} 파일에서 데이터를 파싱할 수 없습니다.\n")
+        return None
+    return data
+
+
+def _process_pdf_worker(pdf_file, options=None, task_id=None):
+    """Process pool worker: returns (data, log messages, stats) for a single PDF file.
+
+    로그는 워커 프로세스에서 바로 출력할 수 없으므로 모아서 반환하고,
+    예외는 풀 전체가 중단되지 않도록 여기서 처리합니다.
+    task_id가 있으면 처리 시작 시각을 시간 제한 확인용 큐로 보냅니다.
+    """
+    if task_id is not None and _worker_start_queue is not None:
+        _worker_start_queue.put((task_id, time.time()))
+    messages = []
+    stats = {}
+    try:
+        data = _process_single_pdf(pdf_file, messages.append, options, stats)
+    except MemoryError:
+        messages.append(f"메모리 제한 초과로 파일을 건너뜁니다: {pdf_file}\n")
+        stats["watchdog"] = "memory_exceeded"
+        data = None
+    except Exception as e:
+        messages.append(f"파일 처리 오류 {pdf_file}: {e}\n")
+        data = None
+    return data, messages, stats
+
+
+def _limit_worker_memory(memory_limit_mb=None):
+    """Process pool initializer: cap the worker's address space (Unix only).
+
+    제한을 넘는 할당은 워커에서 MemoryError로 처리되어 해당 파일만 건너뜁니다.
+    """
+    if not memory_limit_mb:
+        return
+    try:
+        import resource
+    except ImportError:
+        return
+    limit = int(memory_limit_mb * 1024 * 1024)
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ValueError, OSError):
+        pass
+
+
+# 파일 처리 시간 제한을 확인하는 간격 (초)
+_TIMEOUT_POLL_INTERVAL = 0.1
+
+# 워커가 파일 처리를 시작할 때 (작업 번호, 시각)을 보내는 큐 (_init_pool_worker)
+_worker_start_queue = None
+
+
+def _init_pool_worker(memory_limit_mb=None, start_queue=None):
+    """Process pool initializer: apply the memory cap and keep the start-time queue."""
+    global _worker_start_queue
+    _worker_start_queue = start_queue
+    _limit_worker_memory(memory_limit_mb)
+
+
+def _wait_for_result(future, task_id, start_queue, started, file_timeout):
+    """Return future.result(), raising TimeoutError once the file ran past file_timeout.
+
+    제한 시간은 제출 시각이 아니라 워커가 파일 처리를 시작한 시각(start_queue로 받은
+    started[작업 번호])부터 잽니다. 앞 파일을 기다리는 동안 시작한 파일도 시작 시각이
+    기록되므로 대기 시간은 제한에 포함되지 않습니다.
+    """
+    from concurrent.futures import TimeoutError as FutureTimeoutError
+
+    if not file_timeout:
+        return future.result()
+    while True:
+        while not start_queue.empty():
+            started_id, started_at = start_queue.get()
+            started[started_id] = started_at
+        wait = _TIMEOUT_POLL_INTERVAL
+        start = started.get(task_id)
+        if start is not None:
+            remaining = start + file_timeout - time.time()
+            if remaining <= 0 and not future.done():
+                raise FutureTimeoutError()
+            wait = min(wait, max(remaining, 0))
+        try:
+            result = future.result(timeout=wait)
+        except FutureTimeoutError:
+            continue
+        started.pop(task_id, None)
+        return result
+
+
+def _terminate_pool_workers(executor):
+    """Kill every worker process of a ProcessPoolExecutor (e.g. one stuck on a file)."""
+    terminate = getattr(executor, "terminate_workers", None)  # Python 3.14+
+    if terminate:
+        terminate()
+        return
+    for process in list((getattr(executor, "_processes", None) or {}).values()):
+        process.terminate()
+
+
+def _iter_processed_pdfs(
+    pdf_files, jobs=1, log_callback=None, options=None, lookup=None
+):
+    """Yield (pdf_file, data, stats, from_cache) in input order as each file finishes.
+
+    pdf_files는 리스트가 아니어도 되며(지연 생성기 가능), jobs > 1이면 프로세스 풀에
+    최대 jobs * 4개까지만 미리 제출하므로 메모리 사용량이 파일 수와 무관하게 유지됩니다.
+    lookup이 주어지면 (hit, record)를 반환하는 캐시 조회 함수로 사용합니다.
+    options의 file_timeout(초)/memory_limit_mb가 설정되면 jobs가 1이어도 워커 프로세스에서
+    처리합니다. 결과 순서상 차례가 된 파일이 실행을 시작한 뒤 file_timeout 안에 끝나지
+    않으면(_wait_for_result) 워커를 모두 종료하고 풀을 다시 시작하며, 그 파일은
+    stats["watchdog"] = "timed_out"으로 전달됩니다. 함께 처리 중이던 파일은 새 풀에서
+    처음부터 다시 처리합니다.
+    """
+    options = options or {}
+    file_timeout = options.get("file_timeout")
+    memory_limit_mb = options.get("memory_limit_mb")
+    if jobs <= 1 and not (file_timeout or memory_limit_mb):
+        for pdf_file in pdf_files:
+            if lookup:
+                hit, record = lookup(pdf_file)
+                if hit:
+                    yield pdf_file, record, {}, True
+                    continue
+            if log_callback:
+                log_callback(f"\n처리 중: {pdf_file}\n")
+            stats = {}
+            try:
+                data = _process_single_pdf(pdf_file, log_callback, options, stats)
+            except Exception as e:
+                if log_callback:
+                    log_callback(f"파일 처리 오류 {pdf_file}: {e}\n")
+                data = None
+            yield pdf_file, data, stats, False
+        return
+
+    from concurrent.futures import Future, ProcessPoolExecutor
+    from concurrent.futures import TimeoutError as FutureTimeoutError
+    from concurrent.futures.process import BrokenProcessPool
+
+    pending = iter(pdf_files)
+    max_in_flight = jobs * 4
+    # (pdf_file, future, cached_record) - 캐시 적중 항목은 future가 None
+    in_flight = deque()
+    # 풀이 깨진 뒤 다시 제출할 항목 (pdf_file, cached, cached_record)
+    requeue = deque()
+    # 풀이 깨진 뒤 단독으로 재시도 중인 파일
+    isolated = None
+    executor = None
+    # file_timeout 확인용: 워커가 보낸 작업별 시작 시각과 future별 작업 번호
+    start_queue = None
+    started = {}
+    task_ids = {}
+    next_task_id = 0
+
+    def submit(pdf_file):
+        nonlocal executor, start_queue, next_task_id
+        if executor is None:
+            if file_timeout:
+                import multiprocessing
+
+                # 종료된 워커가 남긴 상태를 피하도록 풀마다 새 큐 사용
+                start_queue = multiprocessing.SimpleQueue()
+                started.clear()
+            executor = ProcessPoolExecutor(
+                max_workers=jobs,
+                initializer=_init_pool_worker,
+                initargs=(memory_limit_mb, start_queue),
+            )
+        next_task_id += 1
+        try:
+            future = executor.submit(
+                _process_pdf_worker, pdf_file, options, next_task_id
+            )
+        except BrokenProcessPool as e:
+            # 제출 도중 풀이 깨진 경우 결과를 기다릴 때 재시작 처리되도록 실패한 future로 대체
+            future = Future()
+            future.set_exception(e)
+        task_ids[future] = next_task_id
+        return future
+
+    try:
+        while True:
+            limit = 1 if isolated else max_in_flight
+            while len(in_flight) < limit:
+                if requeue:
+                    pdf_file, cached, record = requeue.popleft()
+                    if cached:
+                        in_flight.append((pdf_file, None, record))
+                        continue
+                else:
+                    pdf_file = next(pending, None)
+                    if pdf_file is None:
+                        break
+                    if lookup:
+                        hit, record = lookup(pdf_file)
+                        if hit:
+                            in_flight.append((pdf_file, None, record))
+                            continue
+                in_flight.append((pdf_file, submit(pdf_file), None))
+            if not in_flight:
+                break
+
+            pdf_file, future, record = in_flight.popleft()
+            if future is None:
+                yield pdf_file, record, {}, True
+                continue
+            if log_callback:
+                log_callback(f"\n처리 중: {pdf_file}\n")
+            try:
+                data, messages, stats = _wait_for_result(
+                    future, task_ids.pop(future), start_queue, started, file_timeout
+                )
+            except FutureTimeoutError:
+                # 파일 처리가 멈춘 경우 - 워커를 종료하고 남은 파일은 새 풀에서 다시 처리
+                _terminate_pool_workers(executor)
+                executor.shutdown(wait=True, cancel_futures=True)
+                executor = None
+                for name, old_future, cached_record in reversed(in_flight):
+                    requeue.appendleft((name, old_future is None, cached_record))
+                in_flight.clear()
+                task_ids.clear()
+                isolated = None
+                if log_callback:
+                    log_callback(
+                        f"처리 시간 제한({file_timeout}초) 초과로 파일을 건너뛰고 "
+                        f"워커를 다시 시작합니다: {pdf_file}\n"
+                    )
+                yield pdf_file, None, {"watchdog": "timed_out"}, False
+                continue
+            except BrokenProcessPool:
+                # 워커 프로세스가 비정상 종료됨 - 풀을 다시 만들고, 원인을 가리기 위해
+                # 현재 파일을 먼저 단독으로 재시도한 뒤 남은 파일을 순서대로 다시 제출
+                executor.shutdown(wait=True, cancel_futures=True)
+                executor = None
+                for name, old_future, cached_record in reversed(in_flight):
+                    requeue.appendleft((name, old_future is None, cached_record))
+                in_flight.clear()
+                task_ids.clear()
+                if isolated == pdf_file:
+                    isolated = None
+                    if log_callback:
+                        log_callback(
+                            f"워커 프로세스 종료로 파일을 건너뜁니다: {pdf_file}\n"
+                        )
+                    yield pdf_file, None, {}, False
+                else:
+                    if log_callback:
+                        log_callback(
+                            "워커 프로세스가 비정상 종료되어 프로세스 풀을 다시 시작합니다.\n"
+                        )
+                    isolated = pdf_file
+                    requeue.appendleft((pdf_file, False, None))
+                continue
+            isolated = None
+            if log_callback:
+                for message in messages:
+                    log_callback(message)
+            yield pdf_file, data, stats, False
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _iter_with_duplicates(pdf_files, find_original, process, originals=None):
+    """Merge duplicate files back into the results of the unique files, in input order.
+
+    find_original(pdf_file)은 입력 스트림에서 파일을 꺼낼 때 호출되며 복사본이면 원본
+    경로를, 아니면 None을 반환합니다. process(반복자)는 복사본을 뺀 파일만 처리하는
+    _iter_processed_pdfs 스트림을 만들고, 복사본은 원본 레코드와 stats["duplicate_of"] =
+    원본 경로로 전달됩니다. originals(레코드를 보관할 원본 집합, None이면 모든 고유 파일)에
+    없는 원본의 복사본은 레코드 없이(None) 바로 전달합니다. 원본이 복사본보다 뒤에
+    있으면 원본까지의 결과를 미리 받아 두었다가 순서대로 전달합니다.
+    """
+    # 입력에서 꺼냈지만 아직 전달하지 않은 (파일, 원본) - 처리 스트림이 읽으며 채움
+    order = deque()
+
+    def unique_files():
+        for pdf_file in pdf_files:
+            original = find_original(pdf_file)
+            order.append((pdf_file, original))
+            if original is None:
+                yield pdf_file
+
+    results = process(unique_files())
+    records = {}
+    ahead = deque()
+
+    def next_result():
+        result = next(results)
+        if originals is None or result[0] in originals:
+            records[result[0]] = result[1]
+        return result
+
+    try:
+        while True:
+            if not order:
+                # 다음 고유 파일의 결과를 받으면서 입력을 더 읽음
+                try:
+                    ahead.append(next_result())
+                except StopIteration:
+                    if not order:
+                        return
+                continue
+            pdf_file, original = order.popleft()
+            if original is None:
+                yield ahead.popleft() if ahead else next_result()
+            elif originals is not None and original not in originals:
+                yield pdf_file, None, {"duplicate_of": original}, False
+            else:
+                while original not in records:
+                    ahead.append(next_result())
+                yield pdf_file, records[original], {"duplicate_of": original}, False
+    finally:
+        results.close()
+
+
+def get_cache_version(parser_engine="scanner", match_window=None):
+    """Return the version string of parsed records (extraction cache / run journal)."""
+    # 윈도우 제한은 결과를 바꿀 수 있으므로 캐시 버전에 포함
+    cache_version = str(PARSER_VERSION)
+    if match_window and parser_engine == "scanner":
+        cache_version += f":window={match_window}"
+    return cache_version
+
+
+def iter_pdf_records(
+    root_dir=".",
+    log_callback=None,
+    jobs=1,
+    use_cache=True,
+    rebuild_cache=False,
+    extract_mode="full",
+    parser_engine="scanner",
+    match_window=None,
+    parse_time_budget=None,
+    reports_dir=None,
+    pdf_files=None,
+    aggregates=None,
+    parse_stats=None,
+    profiler=None,
+    file_timeout=None,
+    memory_limit_mb=None,
+    watchdog_stats=None,
+    walk_jobs=1,
+    folder_filter=None,
+    file_hashes=None,
+    journal=None,
+    duplicate_mode=None,
+    duplicates=None,
+    duplicate_of=None,
+):
+    """Stream (pdf_file, folder, data) tuples as each PDF is extracted and parsed.
+
+    디렉토리 탐색부터 추출/파싱까지 지연 실행되므로 탐색이 끝나기 전에 첫 결과를
+    받을 수 있습니다. 처리에 실패한 파일은 data가 None으로 전달됩니다.
+    aggregates(FolderAggregates)와 parse_stats(dict)가 주어지면 레코드마다 갱신합니다.
+    pdf_files를 주면 디렉토리 탐색 대신 해당 목록(또는 반복자)을 사용합니다.
+    profiler(StageProfiler)가 주어지면 파일별 추출/파싱 시간을 기록합니다.
+    file_timeout(초)/memory_limit_mb를 넘은 파일은 건너뛰고 watchdog_stats(dict)의
+    "timed_out"/"memory_exceeded" 목록에 경로를 기록합니다(캐시하지 않음).
+    walk_jobs는 디렉토리 탐색 스레드 수, folder_filter는 탐색 단계의 폴더 필터입니다
+    (iter_pdf_files 참고).
+    file_hashes(dict)가 주어지면 레코드가 있는 파일의 내용 해시를 {pdf_file: 해시}로
+    기록합니다(캐시에 있으면 재사용, 읽을 수 없으면 None).
+    journal(RunJournal)이 주어지면 이전 실행에서 끝난 파일은 저널의 레코드를 사용하고,
+    새로 처리한 파일(처리 제한으로 건너뛴 파일 제외)은 저널에 추가합니다.
+    duplicate_mode("count"/"ignore")가 주어지면 내용이 같은 PDF는 한 번만 추출하고,
+    나머지 복사본은 원본 레코드(파일 이름에서 얻는 값만 교체)로 전달하거나("count")
+    평균에서 제외하도록 data를 None으로 전달합니다("ignore"). 중복 검사는 탐색 스트림에서
+    파일마다 바로 하므로(DuplicateFinder, 먼저 나온 파일이 원본) 첫 결과가 탐색을 기다리지
+    않습니다. "count"에서는 나중에 나올 복사본을 위해 고유 파일의 레코드를 스트림이 끝날
+    때까지 보관합니다. duplicates(dict)가 주어지면 {원본: [복사본, ...]}을 기록합니다.
+    duplicate_of로 {복사본: 원본}을 직접 주면 중복 검사를 생략하며, 원본도 pdf_files에
+    있어야 합니다.
+    """
+    root_abs = os.path.abspath(root_dir)
+    if reports_dir is None:
+        reports_dir = os.path.join(os.path.dirname(root_abs), "reports")
+    if pdf_files is None:
+        pdf_files = iter_pdf_files(root_dir, log_callback, walk_jobs, folder_filter)
+
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, int(jobs or 1))
+    if jobs > 1 and log_callback:
+        log_callback(f"병렬 처리 프로세스 수: {jobs}\n")
+    if (file_timeout or memory_limit_mb) and log_callback:
+        log_callback(
+            f"파일당 처리 제한: 시간 {file_timeout or '-'}초, "
+            f"메모리 {memory_limit_mb or '-'}MB\n"
+        )
+        if memory_limit_mb and importlib.util.find_spec("resource") is None:
+            log_callback("경고: 이 플랫폼에서는 메모리 제한을 지원하지 않습니다.\n")
+
+    if (match_window or parse_time_budget is not None) and parser_engine != "scanner":
+        if log_callback:
+            log_callback(
+                "경고: 매칭 윈도우/파싱 시간 예산은 scanner 엔진에서만 적용됩니다.\n"
+            )
+
+    cache_version = get_cache_version(parser_engine, match_window)
+    cache = None
+    if use_cache or rebuild_cache:
+        cache_path = os.path.join(get_cache_dir(reports_dir), CACHE_FILE_NAME)
+        cache = ExtractionCache(
+            cache_path, cache_version, log_callback, rebuild=rebuild_cache
+        )
+    options = {
+        "extract_mode": extract_mode,
+        "engine": parser_engine,
+        "match_window": match_window,
+        "time_budget": parse_time_budget,
+        "file_timeout": file_timeout,
+        "memory_limit_mb": memory_limit_mb,
+    }
+    if watchdog_stats is None:
+        watchdog_stats = {}
+    watchdog_stats.setdefault("timed_out", [])
+    watchdog_stats.setdefault("memory_exceeded", [])
+    if parse_stats is None:
+        parse_stats = {}
+    parse_stats.setdefault("window_limited", 0)
+    parse_stats.setdefault("budget_exceeded", 0)
+    parse_stats.setdefault("files", {})
+
+    find_original = None
+    originals = None
+    if duplicate_mode and duplicate_of is None:
+        find_original = DuplicateFinder(cache.file_hash if cache else hash_file).check
+    elif duplicate_mode and duplicate_of:
+        find_original = duplicate_of.get
+        originals = set(duplicate_of.values())
+        if log_callback:
+            log_callback(
+                f"내용이 같은 PDF {len(duplicate_of)}개는 원본 레코드를 사용합니다 "
+                f"(평균 {'포함' if duplicate_mode == 'count' else '제외'}).\n"
+            )
+    if find_original is not None and duplicate_mode != "count":
+        # 평균에서 제외하는 복사본에는 원본 레코드가 필요 없음
+        originals = set()
+    if duplicates is None:
+        duplicates = {}
+
+    lookup = cache.lookup if cache else None
+    if journal is not None:
+
+        def lookup(pdf_file, cache_lookup=lookup):
+            hit, record = journal.lookup(pdf_file)
+            if hit or cache_lookup is None:
+                return hit, record
+            return cache_lookup(pdf_file)
+
+    def process(files):
+        return _iter_processed_pdfs(files, jobs, log_callback, options, lookup)
+
+    if find_original is None:
+        results = process(pdf_files)
+    else:
+        results = _iter_with_duplicates(pdf_files, find_original, process, originals)
+    try:
+        for pdf_file, data, stats, from_cache in results:
+            timing = stats.pop("timing", None)
+            failure = stats.pop("watchdog", None)
+            original = stats.pop("duplicate_of", None)
+            if profiler is not None:
+                if from_cache:
+                    profiler.add_cached(pdf_file)
+                elif timing:
+                    profiler.add_file(pdf_file, timing)
+            if original is not None:
+                # 원본과 내용이 같은 복사본 - 캐시/저널에는 원본만 기록
+                duplicates.setdefault(original, []).append(pdf_file)
+                if data and duplicate_mode == "count":
+                    data = {**data, **get_filename_fields(pdf_file)}
+                else:
+                    data = None
+                if log_callback:
+                    log_callback(f"\n중복 파일: {pdf_file} (원본: {original})\n")
+            elif from_cache:
+                if data:
+                    data = dict(data)
+                    data["timestamp"] = get_file_timestamp(pdf_file)
+                if log_callback:
+                    log_callback(f"\n캐시 사용: {pdf_file}\n")
+            elif failure:
+                # 시간/메모리 제한에 걸린 파일은 다음 실행에서 다시 시도하도록 캐시하지 않음
+                watchdog_stats[failure].append(pdf_file)
+            else:
+                if stats:
+                    parse_stats["files"][pdf_file] = stats
+                    for key in ("window_limited", "budget_exceeded"):
+                        parse_stats[key] += len(stats.get(key, []))
+                    if log_callback:
+                        log_callback(f"파싱 제한 도달: {stats}\n")
+                # 시간 예산에 걸린 결과는 실행마다 달라질 수 있으므로 캐시하지 않음
+                if cache and not stats.get("budget_exceeded"):
+                    cache.store(pdf_file, data)
+            if journal is not None and not failure and original is None:
+                journal.add(pdf_file, data)
+
+            folder = None
+            if data:
+                folder = get_folder_path(pdf_file)
+                if aggregates is not None:
+                    aggregates.add(folder, data)
+                if file_hashes is not None:
+                    try:
+                        file_hashes[pdf_file] = (
+                            cache.file_hash(pdf_file) if cache else hash_file(pdf_file)
+                        )
+                    except OSError:
+                        file_hashes[pdf_file] = None
+
+                if log_callback:
+                    log_callback("추출된 데이터:\n")
+                    for key, value in data.items():
+                        if (
+                            key != "filename"
+                        ):  # filename은 이미 위에서 표시했으므로 제외
+                            log_callback(f"  - {key}: {value}\n")
+
+            yield pdf_file, folder, data
+    finally:
+        results.close()
+        if cache:
+            cache.save()
+            if log_callback:
+                log_callback(
+                    f"\n추출 캐시: 적중 {cache.hits}개, 미스 {cache.misses}개\n"
+                )
+
+
+def process_pdf_files(
+    root_dir=".",
+    log_callback=None,
+    progress_callback=None,
+    jobs=1,
+    use_cache=True,
+    rebuild_cache=False,
+    extract_mode="full",
+    parser_engine="scanner",
+    match_window=None,
+    parse_time_budget=None,
+    profiler=None,
+    file_timeout=None,
+    memory_limit_mb=None,
+    walk_jobs=1,
+    folder_filter=None,
+    use_warehouse=True,
+    snapshot=True,
+    resume=False,
+    duplicate_mode="count",
+):
+    """Process all PDF files in the directory structure.
+
+    jobs가 1보다 크면 PDF 추출/파싱을 프로세스 풀에서 병렬로 수행합니다.
+    결과와 진행 콜백 순서는 순차 처리와 동일합니다.
+    use_cache가 켜져 있으면 변경되지 않은 PDF는 추출 캐시에서 불러옵니다.
+    extract_mode가 "incremental"이면 메트릭을 모두 찾은 뒤 남은 페이지는 읽지 않습니다.
+    parser_engine은 parse_pdf_content의 engine 옵션으로 전달됩니다.
+    match_window/parse_time_budget을 지정하면 보조 패턴을 키워드 뒤 N자로 제한하고
+    파일당 파싱 시간을 제한합니다(scanner 엔진). 제한에 걸린 횟수는 실행 통계
+    (folder_data["_config"]["parse_stats"])에 기록됩니다.
+    내부적으로 iter_pdf_records 스트림을 소비하며, 폴더별 누적 집계(FolderAggregates)는
+    folder_data["_config"]["aggregates"]에 저장됩니다.
+    레코드는 열 단위 저장소(RecordStore, folder_data["_config"]["records"])에 보관되며
+    folder_data[폴더]["files"]는 레코드 딕셔너리 목록처럼 읽을 수 있는 뷰입니다.
+    profiler(StageProfiler)가 주어지면 folder_data["_config"]["profiler"]에 저장되어
+    탐색/추출 단계와 이후 리포트 생성 단계의 시간이 함께 기록됩니다.
+    file_timeout(초)/memory_limit_mb를 지정하면 파일마다 워커 프로세스에서 제한을 두고
+    처리하며, 제한을 넘어 건너뛴 파일은 folder_data["_config"]["watchdog"]에 기록됩니다.
+    walk_jobs가 1보다 크면 최상위 날짜 폴더들을 동시에 탐색합니다(느린 네트워크 공유 폴더용).
+    folder_filter(FolderFilter)가 주어지면 날짜 범위/통신사/네트워크 등 조건에 맞지
+    않는 폴더는 PDF를 열기 전에 탐색 단계에서 제외합니다.
+    use_warehouse가 켜져 있으면(기본값, CLI/GUI와 동일) 레코드를 리포트 폴더의 SQLite
+    메트릭 저장소(MetricsWarehouse, folder_data["_config"]["warehouse"])에 파일 경로
+    기준으로 upsert하여 실행 간에 누적합니다. snapshot이 켜져 있으면 처리 후 레코드 스냅샷을
+    저장합니다(save_record_snapshot).
+    처리가 끝난 파일의 레코드는 리포트 폴더의 실행 저널(RunJournal)에 일정 개수마다
+    기록되며 정상 완료 시 삭제됩니다. resume이 켜져 있으면 중단된 이전 실행의 저널에
+    있는 파일은 다시 추출하지 않고 저널의 레코드를 사용합니다.
+    내용이 같은 PDF 복사본은 한 번만 추출하며 duplicate_mode("count"/"ignore", None이면
+    중복 검사 안 함)에 따라 폴더 평균에 포함하거나 제외합니다. 복사본 목록은
+    folder_data["_config"]["duplicates"]({"mode", "groups": {원본: [복사본]}})에 저장되어
+    리포트의 중복 PDF 섹션에 표시됩니다.
+    """
     if log_callback:
         log_callback("PDF 파일 검색 중...\n")
 
@@ -423,11 +1342,31 @@ def process_pdf_files(root_dir=".", log_callback=None, progress_callback=None):
             return None
 
     # Initialize folder_data with reports_dir and root_abs information
-    folder_data = defaultdict(lambda: defaultdict(list))
-    folder_data["_config"] = {"reports_dir": reports_dir, "root_abs": root_abs}
+    folder_data = {"_config": {"reports_dir": reports_dir, "root_abs": root_abs}}
+    # 레코드는 열 단위 저장소에 보관하고 folder_data[폴더]["files"]는 그 뷰로 제공
+    store = RecordStore(parse_folder_path)
+    folder_data["_config"]["records"] = store
+    if profiler is not None:
+        folder_data["_config"]["profiler"] = profiler
+    warehouse = None
+    file_hashes = None
+    if use_warehouse:
+        warehouse = MetricsWarehouse(
+            warehouse_path(reports_dir),
+            parse_folder_path,
+            parser_version=PARSER_VERSION,
+            log_callback=log_callback,
+        )
+        folder_data["_config"]["warehouse"] = warehouse
+        file_hashes = {}
 
-    pdf_files = find_pdf_files(root_dir, log_callback)
+    with timed_stage(profiler, "discovery"):
+        pdf_files = find_pdf_files(root_dir, log_callback, walk_jobs, folder_filter)
     total = len(pdf_files)
+    # 감시 모드(watch_pdf_files)에서 변경 여부를 비교할 탐색 시점의 크기/수정시간
+    folder_data["_config"]["sources"] = {
+        str(pdf_file): (pdf_file.size, pdf_file.mtime) for pdf_file in pdf_files
+    }
 
     if not pdf_files:
         if log_callback:
@@ -440,96 +1379,593 @@ def process_pdf_files(root_dir=".", log_callback=None, progress_callback=None):
             log_callback(f"  - {pdf_file}\n")
         log_callback("\n파일 처리 시작...\n")
 
-    for idx, pdf_file in enumerate(pdf_files):
+    journal = None
+    try:
+        journal = RunJournal(
+            journal_path(reports_dir, folder_filter.shard if folder_filter else None),
+            root_abs,
+            get_cache_version(parser_engine, match_window),
+            log_callback,
+            resume=resume,
+        )
+    except Exception as e:
         if log_callback:
-            log_callback(f"\n처리 중: {pdf_file}\n")
-
-        text = extract_text_from_pdf(pdf_file, log_callback)
-        text = re.sub(r"\s*\.\s*", ".", text)
-        if not text:
-            if log_callback:
-                log_callback(
-                    f"경고: {pdf_file} 파일에서 텍스트를 추출할 수 없습니다.\n"
-                )
-            continue
-
-        data = parse_pdf_content(text, pdf_file, log_callback)
-        if not data:
-            if log_callback:
-                log_callback(
-                    f"경고: {pdf_file} 파일에서 데이터를 파싱할 수 없습니다.\n"
-                )
-            continue
-
-        folder = get_folder_path(pdf_file)
-        folder_data[folder]["files"].append(data)
+            log_callback(f"실행 기록 파일을 열 수 없어 기록 없이 처리합니다: {e}\n")
+
+    aggregates = FolderAggregates()
+    parse_stats = {"window_limited": 0, "budget_exceeded": 0, "files": {}}
+    watchdog_stats = {"timed_out": [], "memory_exceeded": []}
+    duplicates = {}
+    records = iter_pdf_records(
+        root_dir,
+        log_callback,
+        jobs=jobs,
+        use_cache=use_cache,
+        rebuild_cache=rebuild_cache,
+        extract_mode=extract_mode,
+        parser_engine=parser_engine,
+        match_window=match_window,
+        parse_time_budget=parse_time_budget,
+        reports_dir=reports_dir,
+        pdf_files=pdf_files,
+        aggregates=aggregates,
+        parse_stats=parse_stats,
+        profiler=profiler,
+        file_timeout=file_timeout,
+        memory_limit_mb=memory_limit_mb,
+        watchdog_stats=watchdog_stats,
+        file_hashes=file_hashes,
+        journal=journal,
+        duplicate_mode=duplicate_mode,
+        duplicates=duplicates,
+    )
+    completed = False
+    try:
+        with timed_stage(profiler, "extraction"):
+            for idx, (pdf_file, folder, data) in enumerate(records):
+                if data:
+                    if folder not in folder_data:
+                        folder_data[folder] = {"files": store.view(folder)}
+                    store.append(folder, data)
+                    if warehouse is not None:
+                        warehouse.add(
+                            pdf_file, folder, data, file_hashes.pop(pdf_file, None)
+                        )
+                elif warehouse is not None:
+                    # 이전 실행의 레코드가 남아 query 결과가 리포트와 달라지지 않도록 삭제
+                    warehouse.remove(pdf_file)
+                if progress_callback:
+                    progress_callback(idx + 1, total)
+        completed = True
+    finally:
+        if journal is not None and not completed:
+            # 중단된 경우에도 지금까지 처리한 레코드를 기록해 둠 (--resume)
+            journal.close()
+    if warehouse is not None:
+        warehouse.flush()
+        if log_callback:
+            log_callback(
+                f"메트릭 저장소에 {warehouse.saved}개 레코드 저장됨: {warehouse.path}\n"
+            )
 
+    folder_data["_config"]["parse_stats"] = parse_stats
+    folder_data["_config"]["aggregates"] = aggregates
+    folder_data["_config"]["watchdog"] = watchdog_stats
+    if duplicates:
+        # 리포트/감시 모드 갱신 결과가 탐색 순서와 관계없도록 경로 순으로 정렬
+        folder_data["_config"]["duplicates"] = {
+            "mode": duplicate_mode,
+            "groups": {
+                original: sorted(duplicates[original])
+                for original in sorted(duplicates)
+            },
+        }
         if log_callback:
-            log_callback("추출된 데이터:\n")
-            for key, value in data.items():
-                if key != "filename":  # filename은 이미 위에서 표시했으므로 제외
-                    log_callback(f"  - {key}: {value}\n")
+            log_callback(
+                f"\n중복 PDF: 원본 {len(duplicates)}개, 복사본 "
+                f"{sum(len(copies) for copies in duplicates.values())}개\n"
+            )
+    if log_callback and parse_stats["files"]:
+        log_callback(
+            f"\n파싱 제한 통계: 윈도우 제한 {parse_stats['window_limited']}건, "
+            f"시간 예산 초과 {parse_stats['budget_exceeded']}건 "
+            f"({len(parse_stats['files'])}개 파일)\n"
+        )
 
-        if progress_callback:
-            progress_callback(idx + 1, total)
+    if log_callback and (
+        watchdog_stats["timed_out"] or watchdog_stats["memory_exceeded"]
+    ):
+        log_callback(
+            f"\n처리 제한으로 건너뛴 파일: 시간 초과 {len(watchdog_stats['timed_out'])}개, "
+            f"메모리 초과 {len(watchdog_stats['memory_exceeded'])}개\n"
+        )
+        for pdf_file in watchdog_stats["timed_out"]:
+            log_callback(f"  - (시간 초과) {pdf_file}\n")
+        for pdf_file in watchdog_stats["memory_exceeded"]:
+            log_callback(f"  - (메모리 초과) {pdf_file}\n")
+
+    if snapshot:
+        save_record_snapshot(folder_data, log_callback)
+    if journal is not None:
+        journal.close(completed=True)
+        if journal.restored and log_callback:
+            log_callback(
+                f"이전 실행 기록에서 {journal.restored}개 파일을 재사용했습니다.\n"
+            )
 
     if log_callback:
         log_callback("\nPDF 파일 처리가 완료되었습니다.\n")
 
-    # 마지막에 folder_data와 내부를 모두 dict로 변환해서 반환
-    def deep_dict(obj):
-        if isinstance(obj, defaultdict):
-            return {k: deep_dict(v) for k, v in obj.items()}
-        return obj
+    return folder_data
 
-    return deep_dict(folder_data)
 
+def save_record_snapshot(folder_data, log_callback=None):
+    """Save the parsed records of folder_data as a snapshot next to the caches.
 
-def generate_folder_report(folder_data, log_callback=None, exclude_mode=None):
-    """Generate markdown and HTML reports for the folder data."""
-    if log_callback:
-        log_callback("마크다운 및 HTML 리포트 생성 중...\n")
-    if exclude_mode is None or not isinstance(exclude_mode, dict):
-        exclude_mode = {"fps": "minmax", "bw": "minmax", "rtt": "minmax"}
-
+    --from-snapshot(GUI의 리포트 재생성)은 이 스냅샷으로 PDF를 다시 추출하지 않고
+    리포트를 만듭니다. 저장에 실패해도 처리는 계속됩니다.
+    """
     try:
-        # Get reports directory and root_abs from folder_data
-        reports_dir = folder_data.get("_config", {}).get("reports_dir")
-        root_abs = folder_data.get("_config", {}).get("root_abs", "")
-        if not reports_dir:
-            if log_callback:
-                log_callback("reports 디렉토리 경로를 찾을 수 없습니다.\n")
-            return None, None, None, None
-
+        config = folder_data["_config"]
+        path = save_snapshot(
+            folder_data,
+            snapshot_path(config["reports_dir"]),
+            parser_version=PARSER_VERSION,
+            extra={"duplicates": config.get("duplicates")},
+        )
         if log_callback:
-            log_callback(f"리포트 저장 위치: {reports_dir}\n")
+            log_callback(f"레코드 스냅샷 저장됨: {path}\n")
+    except Exception as e:
+        if log_callback:
+            log_callback(f"레코드 스냅샷 저장 중 오류 발생: {e}\n")
 
-        # 옵션 문자열 생성
-        def mode_str(mode):
-            return mode if mode else "minmax"
 
-        opt_str = f"fps-{mode_str(exclude_mode.get('fps'))}_bw-{mode_str(exclude_mode.get('bw'))}_rtt-{mode_str(exclude_mode.get('rtt'))}"
+def has_resumable_run(root_dir):
+    """Return True if an interrupted run journal exists for the PDF root folder."""
+    root_abs = os.path.abspath(root_dir)
+    reports_dir = os.path.join(os.path.dirname(root_abs), "reports")
+    header = read_journal_header(journal_path(reports_dir))
+    return header is not None and header.get("root_abs") == root_abs
 
-        # 현재 시간을 이용한 타임스탬프 생성
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-        # 파일명 생성 (옵션 포함)
-        fixed_md = os.path.join(reports_dir, f"folder_metrics_report_{opt_str}.md")
-        timestamped_md = os.path.join(
-            reports_dir, f"folder_metrics_report_{opt_str}_{timestamp}.md"
-        )
-        fixed_html = os.path.join(reports_dir, f"folder_metrics_report_{opt_str}.html")
-        timestamped_html = os.path.join(
-            reports_dir, f"folder_metrics_report_{opt_str}_{timestamp}.html"
-        )
+def record_snapshot_path(root_dir):
+    """Return the default record snapshot path for a PDF root folder."""
+    reports_dir = os.path.join(os.path.dirname(os.path.abspath(root_dir)), "reports")
+    return snapshot_path(reports_dir)
 
-        if log_callback:
-            log_callback("리포트 파일 생성 중...\n")
 
-        # HTML 스타일 정의
-        html_style = """
-        <style>
-            body { font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }
+def load_record_snapshot(path, log_callback=None):
+    """Load a record snapshot saved by process_pdf_files; return folder_data or None."""
+    started = time.perf_counter()
+    try:
+        folder_data, index = load_snapshot(path)
+    except Exception as e:
+        if log_callback:
+            log_callback(f"레코드 스냅샷을 불러올 수 없습니다: {path} ({e})\n")
+        return None
+    if index.get("duplicates"):
+        folder_data["_config"]["duplicates"] = index["duplicates"]
+    if log_callback:
+        log_callback(
+            f"레코드 스냅샷 로드됨: {path} ({len(folder_data['_config']['records'])}개 "
+            f"레코드, {index.get('created')} 생성, "
+            f"{time.perf_counter() - started:.3f}초)\n"
+        )
+        if index.get("parser_version") != PARSER_VERSION:
+            log_callback(
+                "경고: 스냅샷을 만든 뒤 파서 버전이 바뀌었습니다. "
+                "최신 결과가 필요하면 PDF를 다시 처리하세요.\n"
+            )
+    return folder_data
+
+
+def load_warehouse_folder_data(
+    root_dir, path=None, folder_filter=None, log_callback=None
+):
+    """Return folder_data whose report tables come from the metrics warehouse, or None.
+
+    root_dir 아래 폴더의 누적 레코드를 SQL 집계 쿼리로 읽으므로 PDF를 열지 않으며,
+    folder_filter(FolderFilter) 조건은 저장소의 구성요소 인덱스로 적용됩니다.
+    """
+    root_abs = os.path.abspath(root_dir)
+    reports_dir = os.path.join(os.path.dirname(root_abs), "reports")
+    path = path or warehouse_path(reports_dir)
+    if not os.path.exists(path):
+        if log_callback:
+            log_callback(f"메트릭 저장소를 찾을 수 없습니다: {path}\n")
+        return None
+    warehouse = MetricsWarehouse(
+        path,
+        parse_folder_path,
+        parser_version=PARSER_VERSION,
+        log_callback=log_callback,
+    )
+    selection = warehouse.select(root_abs, folder_filter)
+    try:
+        count = selection.count()
+    except Exception as e:
+        if log_callback:
+            log_callback(f"메트릭 저장소를 읽을 수 없습니다: {path} ({e})\n")
+        return None
+    if log_callback:
+        log_callback(f"메트릭 저장소 사용: {path} ({count}개 레코드)\n")
+    return {
+        "_config": {
+            "reports_dir": reports_dir,
+            "root_abs": root_abs,
+            "warehouse": warehouse,
+            "table_source": selection,
+        }
+    }
+
+
+def save_shard_results(folder_data, shard, log_callback=None):
+    """Write the partial results of a --shard run to reports/shards; return the path.
+
+    저장에 실패하면 오류를 기록하고 None을 반환합니다.
+    """
+    try:
+        path = save_shard(
+            folder_data,
+            shard_file_path(folder_data["_config"]["reports_dir"], shard),
+            shard,
+            parser_version=PARSER_VERSION,
+        )
+    except Exception as e:
+        if log_callback:
+            log_callback(f"샤드 결과 저장 중 오류 발생: {e}\n")
+        return None
+    if log_callback:
+        log_callback(f"샤드 {shard[0]}/{shard[1]} 결과 저장됨: {path}\n")
+    return path
+
+
+def merge_shard_files(paths, root_dir, log_callback=None, use_warehouse=True):
+    """Merge --shard result files into folder_data for the report functions, or None.
+
+    병합 결과는 한 번에 처리한 실행과 같이 레코드 스냅샷으로 저장하며, use_warehouse가
+    켜져 있으면 메트릭 저장소에도 upsert합니다(샤드 결과에는 내용 해시가 없음).
+    """
+    try:
+        folder_data = merge_shards(
+            paths, root_dir, path_parser=parse_folder_path, log_callback=log_callback
+        )
+    except Exception as e:
+        if log_callback:
+            log_callback(f"샤드 결과를 병합할 수 없습니다: {e}\n")
+        return None
+    config = folder_data["_config"]
+    os.makedirs(config["reports_dir"], exist_ok=True)
+    if log_callback:
+        log_callback(
+            f"샤드 {len(paths)}개에서 {len(config['records'])}개 레코드 병합됨\n"
+        )
+
+    if use_warehouse:
+        warehouse = MetricsWarehouse(
+            warehouse_path(config["reports_dir"]),
+            parse_folder_path,
+            parser_version=PARSER_VERSION,
+            log_callback=log_callback,
+        )
+        for folder, info in folder_data.items():
+            if folder == "_config":
+                continue
+            for record in info["files"]:
+                pdf_file = os.path.join(folder, record.get("filename", ""))
+                warehouse.add(pdf_file, folder, record)
+        warehouse.flush()
+        config["warehouse"] = warehouse
+        if log_callback:
+            log_callback(
+                f"메트릭 저장소에 {warehouse.saved}개 레코드 저장됨: {warehouse.path}\n"
+            )
+    save_record_snapshot(folder_data, log_callback)
+    return folder_data
+
+
+def update_pdf_files(folder_data, changed, removed=(), log_callback=None, **options):
+    """Re-process changed PDFs and drop removed ones in folder_data (in place).
+
+    변경된 파일의 기존 레코드는 같은 위치에서 교체하고 새 파일은 폴더 끝에 추가합니다.
+    영향받은 폴더만 누적 집계를 다시 계산하며(집계 테이블은 revision으로 다시 생성),
+    레코드가 바뀐 폴더 집합을 반환합니다. options는 iter_pdf_records로 전달됩니다.
+    메트릭 저장소(folder_data["_config"]["warehouse"])가 있으면 새 레코드를 upsert하고,
+    다시 처리한 결과 레코드가 없는 파일은 저장소에서도 지웁니다.
+    options의 duplicate_mode가 켜져 있으면 현재 전체 파일(_config["sources"]) 기준으로
+    중복 PDF를 다시 검사해 _config["duplicates"]를 갱신하고, 중복 여부나 원본이 바뀐
+    파일도 함께 다시 반영합니다.
+    """
+    options.pop("use_warehouse", None)
+    duplicate_mode = options.pop("duplicate_mode", None)
+    config = folder_data.setdefault("_config", {})
+    aggregates = config.setdefault("aggregates", FolderAggregates())
+    parse_stats = config.setdefault(
+        "parse_stats", {"window_limited": 0, "budget_exceeded": 0, "files": {}}
+    )
+    watchdog_stats = config.setdefault(
+        "watchdog", {"timed_out": [], "memory_exceeded": []}
+    )
+    store = config.setdefault("records", RecordStore(parse_folder_path))
+
+    # 이전 실행의 파일별 통계는 다시 처리하는 파일에 대해 지움
+    for pdf_file in [*changed, *removed]:
+        old_stats = parse_stats["files"].pop(pdf_file, None)
+        for key in ("window_limited", "budget_exceeded"):
+            parse_stats[key] -= len((old_stats or {}).get(key, []))
+        for paths in watchdog_stats.values():
+            if pdf_file in paths:
+                paths.remove(pdf_file)
+
+    affected = set()
+
+    def record_index(folder, filename):
+        if folder not in folder_data:
+            return None
+        filenames = store.view(folder).filenames()
+        return filenames.index(filename) if filename in filenames else None
+
+    for pdf_file in removed:
+        folder = get_folder_path(pdf_file)
+        idx = record_index(folder, os.path.basename(pdf_file))
+        if idx is not None:
+            del folder_data[folder]["files"][idx]
+            affected.add(folder)
+            if log_callback:
+                log_callback(f"삭제된 파일 제외: {pdf_file}\n")
+
+    duplicate_of = None
+    if duplicate_mode:
+        changed, duplicate_of = _refresh_duplicates(
+            config, changed, removed, duplicate_mode, log_callback
+        )
+
+    warehouse = config.get("warehouse")
+    file_hashes = {} if warehouse is not None else None
+    records = ()
+    if changed:
+        records = iter_pdf_records(
+            config.get("root_abs", "."),
+            log_callback,
+            reports_dir=config.get("reports_dir"),
+            pdf_files=changed,
+            parse_stats=parse_stats,
+            watchdog_stats=watchdog_stats,
+            file_hashes=file_hashes,
+            duplicate_mode=duplicate_mode,
+            duplicate_of=duplicate_of,
+            **options,
+        )
+    for pdf_file, folder, data in records:
+        folder = folder or get_folder_path(pdf_file)
+        if warehouse is not None:
+            if data:
+                warehouse.add(pdf_file, folder, data, file_hashes.pop(pdf_file, None))
+            else:
+                # 다시 처리해 레코드가 없어진 파일(파싱 실패, 평균 제외 복사본)
+                warehouse.remove(pdf_file)
+        idx = record_index(folder, os.path.basename(pdf_file))
+        if idx is not None:
+            files = folder_data[folder]["files"]
+            if data:
+                files[idx] = data
+            else:
+                del files[idx]
+            affected.add(folder)
+        elif data:
+            folder_data.setdefault(folder, {"files": store.view(folder)})
+            store.append(folder, data)
+            affected.add(folder)
+
+    if warehouse is not None:
+        warehouse.flush()
+
+    for folder in affected:
+        files = folder_data[folder]["files"]
+        aggregates.replace(folder, files)
+        if not files:
+            del folder_data[folder]
+    if affected and config.get("reports_dir"):
+        save_record_snapshot(folder_data, log_callback)
+    return affected
+
+
+def _refresh_duplicates(config, changed, removed, duplicate_mode, log_callback=None):
+    """Re-check duplicates over all current files for update_pdf_files.
+
+    (다시 처리할 파일 목록, 그 안의 {복사본: 원본})을 반환하고 _config["duplicates"]를
+    갱신합니다. 중복 여부나 원본이 바뀐 파일, 바뀐 원본의 복사본, 처리할 복사본의
+    원본(대부분 추출 캐시 적중)이 changed에 더해집니다. 파일 크기/수정시간은
+    _config["sources"]를 사용하며 내용 해시는 _config["content_hashes"]에 보관합니다.
+    처음 실행과 같이 _config["sources"] 순서(탐색 순서, 새 파일은 뒤)상 먼저 있는 파일이
+    원본입니다.
+    """
+    removed = set(removed)
+    files = {
+        path: signature
+        for path, signature in (config.get("sources") or {}).items()
+        if path not in removed
+    }
+    for pdf_file in changed:
+        try:
+            files.setdefault(str(pdf_file), file_stat(pdf_file))
+        except OSError:
+            pass
+    hashes = config.setdefault("content_hashes", {})
+
+    def content_hash(pdf_file):
+        signature = (pdf_file.size, pdf_file.mtime)
+        known = hashes.get(str(pdf_file))
+        if known and tuple(known[:2]) == signature:
+            return known[2]
+        digest = hash_file(pdf_file)
+        hashes[str(pdf_file)] = (*signature, digest)
+        return digest
+
+    entries = [PdfEntry(path, *signature) for path, signature in files.items()]
+    current = {
+        str(copy): str(original)
+        for copy, original in find_duplicate_files(entries, content_hash).items()
+    }
+    old_duplicates = config.get("duplicates") or {}
+    previous = {
+        copy: original
+        for original, copies in old_duplicates.get("groups", {}).items()
+        for copy in copies
+    }
+
+    targets = {str(pdf_file): pdf_file for pdf_file in changed}
+    changed_paths = set(targets)
+    for path in set(previous) | set(current):
+        if path in files and (
+            previous.get(path) != current.get(path)
+            or current.get(path) in changed_paths
+        ):
+            targets.setdefault(path, PdfEntry(path, *files[path]))
+    for path in list(targets):
+        original = current.get(path)
+        if original is not None:
+            targets.setdefault(original, PdfEntry(original, *files[original]))
+
+    groups = {}
+    for copy, original in sorted(current.items()):
+        groups.setdefault(original, []).append(copy)
+    groups = {original: groups[original] for original in sorted(groups)}
+    if groups:
+        config["duplicates"] = {"mode": duplicate_mode, "groups": groups}
+    else:
+        config.pop("duplicates", None)
+    for path in set(hashes) - set(files):
+        del hashes[path]
+
+    if log_callback and len(targets) > len(changed):
+        log_callback(
+            f"중복 PDF 변경으로 {len(targets) - len(changed)}개 파일을 함께 반영합니다.\n"
+        )
+    pdf_files = list(targets.values())
+    return pdf_files, {path: current[path] for path in targets if path in current}
+
+
+def watch_pdf_files(
+    folder_data,
+    on_update,
+    log_callback=None,
+    interval=DEFAULT_POLL_INTERVAL,
+    debounce=DEFAULT_DEBOUNCE,
+    should_stop=None,
+    walk_jobs=1,
+    folder_filter=None,
+    **options,
+):
+    """Watch the processed root folder and keep folder_data up to date.
+
+    process_pdf_files 결과(folder_data)의 루트 폴더를 interval초마다 다시 탐색하고,
+    변경이 debounce초 동안 멈추면 추가/수정된 PDF만 추출해 반영한 뒤
+    on_update(영향받은 폴더 집합)를 호출합니다. should_stop()이 True가 되거나
+    KeyboardInterrupt가 발생하면 종료합니다. options는 update_pdf_files로 전달됩니다.
+    """
+    config = folder_data["_config"]
+    watcher = PdfTreeWatcher(
+        config["root_abs"],
+        known=config.setdefault("sources", {}),
+        interval=interval,
+        debounce=debounce,
+        folder_filter=folder_filter,
+        walk_jobs=walk_jobs,
+    )
+    if log_callback:
+        log_callback(
+            f"\n폴더 감시 시작: {watcher.root_abs} "
+            f"(확인 간격 {interval}초, 변경 후 {debounce}초 대기)\n"
+        )
+    try:
+        while True:
+            batch = watcher.wait_for_changes(should_stop)
+            if batch is None:
+                break
+            changed, removed = batch
+            if log_callback:
+                log_callback(
+                    f"\n변경 감지: 추가/수정 {len(changed)}개, 삭제 {len(removed)}개\n"
+                )
+            try:
+                affected = update_pdf_files(
+                    folder_data, changed, removed, log_callback, **options
+                )
+            except Exception as e:
+                if log_callback:
+                    log_callback(f"변경된 파일 처리 중 오류 발생: {e}\n")
+                continue
+            if not affected:
+                if log_callback:
+                    log_callback("리포트에 반영할 변경이 없습니다.\n")
+                continue
+            if log_callback:
+                log_callback(f"변경된 폴더 {len(affected)}개:\n")
+                for folder in sorted(affected):
+                    rel_folder = os.path.relpath(folder, watcher.root_abs)
+                    log_callback(f"  - {rel_folder}\n")
+            on_update(affected)
+    except KeyboardInterrupt:
+        pass
+    if log_callback:
+        log_callback("\n폴더 감시를 종료했습니다.\n")
+
+
+@profiled_stage("markdown_html")
+def generate_folder_report(
+    folder_data, log_callback=None, exclude_mode=None, timestamped=True
+):
+    """Generate markdown and HTML reports for the folder data.
+
+    timestamped가 False이면(감시 모드 갱신) 고정 파일명 리포트만 덮어쓰고 타임스탬프
+    사본은 만들지 않으며, 반환값의 타임스탬프 경로는 None입니다.
+    """
+    import markdown
+    import pandas as pd
+
+    if log_callback:
+        log_callback("마크다운 및 HTML 리포트 생성 중...\n")
+    if exclude_mode is None or not isinstance(exclude_mode, dict):
+        exclude_mode = {"fps": "minmax", "bw": "minmax", "rtt": "minmax"}
+
+    try:
+        # Get reports directory and root_abs from folder_data
+        reports_dir = folder_data.get("_config", {}).get("reports_dir")
+        if not reports_dir:
+            if log_callback:
+                log_callback("reports 디렉토리 경로를 찾을 수 없습니다.\n")
+            return None, None, None, None
+
+        if log_callback:
+            log_callback(f"리포트 저장 위치: {reports_dir}\n")
+
+        # 옵션 문자열 생성
+        def mode_str(mode):
+            return mode if mode else "minmax"
+
+        opt_str = f"fps-{mode_str(exclude_mode.get('fps'))}_bw-{mode_str(exclude_mode.get('bw'))}_rtt-{mode_str(exclude_mode.get('rtt'))}"
+
+        # 현재 시간을 이용한 타임스탬프 생성
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        # 파일명 생성 (옵션 포함)
+        fixed_md = os.path.join(reports_dir, f"folder_metrics_report_{opt_str}.md")
+        timestamped_md = os.path.join(
+            reports_dir, f"folder_metrics_report_{opt_str}_{timestamp}.md"
+        )
+        fixed_html = os.path.join(reports_dir, f"folder_metrics_report_{opt_str}.html")
+        timestamped_html = os.path.join(
+            reports_dir, f"folder_metrics_report_{opt_str}_{timestamp}.html"
+        )
+
+        if log_callback:
+            log_callback("리포트 파일 생성 중...\n")
+
+        # HTML 스타일 정의
+        html_style = """
+        <style>
+            body { font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }
             table { border-collapse: collapse; width: 100%; margin: 20px 0; }
             th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
             th { background-color: #f2f2f2; }
@@ -546,10 +1982,12 @@ def generate_folder_report(folder_data, log_callback=None, exclude_mode=None):
             f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
         )
 
-        # Sort folders for consistent output (excluding _config)
-        sorted_folders = sorted([k for k in folder_data.keys() if k != "_config"])
+        # 모든 리포트 출력이 공유하는 집계 테이블 (한 번만 생성)
+        table = get_metrics_table(folder_data, parse_folder_path, log_callback)
+        folders = table.folders
+        averages = table.averages(exclude_mode)
 
-        if not sorted_folders:
+        if table.empty:
             if log_callback:
                 log_callback("처리할 폴더 데이터가 없습니다.\n")
             return None, None, None, None
@@ -579,67 +2017,18 @@ def generate_folder_report(folder_data, log_callback=None, exclude_mode=None):
             "|" + "|".join(["-" * len(h) for h in summary_headers]) + "|\n"
         )
 
-        for folder in sorted_folders:
-            folder_info = folder_data[folder]
-            if not isinstance(folder_info, dict):
-                folder_info = dict(folder_info)
-            files = list(folder_info.get("files", []))
-            num_files = len(files)
-            path_components = parse_folder_path(folder)
-            # Calculate averages
-            valid_playtimes = [
-                file.get("playtime")
-                for file in files
-                if isinstance(file.get("playtime"), (int, float))
-                and file.get("playtime") > 0
-            ]
-            valid_fps = [
-                file.get("fps")
-                for file in files
-                if isinstance(file.get("fps"), (int, float)) and file.get("fps") > 0
-            ]
-            valid_bandwidths = [
-                file.get("bandwidth")
-                for file in files
-                if isinstance(file.get("bandwidth"), (int, float))
-                and file.get("bandwidth") > 0
-            ]
-            valid_rtts = [
-                file.get("rtt")
-                for file in files
-                if isinstance(file.get("rtt"), (int, float)) and file.get("rtt") > 0
-            ]
+        def fmt(val):
+            return f"{val:.2f}" if not pd.isna(val) else "N/A"
 
-            # Calculate averages (excluding min/max if enough values)
-            def get_avg(values, mode):
-                if not values:
-                    return None
-                if len(values) < 3 or mode == "none":
-                    return sum(values) / len(values)
-                sorted_vals = sorted(values)
-                if mode == "minmax":
-                    return sum(sorted_vals[1:-1]) / len(sorted_vals[1:-1])
-                elif mode == "min":
-                    return sum(sorted_vals[1:]) / len(sorted_vals[1:])
-                elif mode == "max":
-                    return sum(sorted_vals[:-1]) / len(sorted_vals[:-1])
-                else:
-                    return sum(values) / len(values)
-
-            avg_playtime = get_avg(valid_playtimes, "minmax")
-            avg_fps = get_avg(valid_fps, exclude_mode.get("fps", "minmax"))
-            avg_bw = get_avg(valid_bandwidths, exclude_mode.get("bw", "minmax"))
-            avg_rtt = get_avg(valid_rtts, exclude_mode.get("rtt", "minmax"))
-            rel_folder = os.path.relpath(folder, root_abs)
-            if rel_folder == ".":
-                rel_folder = "(root)"
-
-            def fmt(val):
-                return (
-                    f"{val:.2f}"
-                    if isinstance(val, (int, float)) and val is not None
-                    else (val if val not in [None, -1] else "N/A")
-                )
+        for folder, info in folders.iterrows():
+            avg = averages.loc[folder]
+            avg_fps = avg["fps_avg"]
+            avg_bw = avg["bandwidth_avg"]
+            avg_rtt = avg["rtt_avg"]
+            avg_playtime = avg["playtime_avg"]
+            path_components = info
+            rel_folder = info["rel_folder"]
+            num_files = info["files"]
 
             row_data = {
                 "Date": path_components["date"],
@@ -678,14 +2067,17 @@ def generate_folder_report(folder_data, log_callback=None, exclude_mode=None):
             "Folder",
             "Filename",
         ]
-        for folder in sorted_folders:
-            folder_info = folder_data[folder]
-            if not isinstance(folder_info, dict):
-                folder_info = dict(folder_info)
-            files = list(folder_info.get("files", []))
-            rel_folder = os.path.relpath(folder, root_abs)
-            if rel_folder == ".":
-                rel_folder = "(root)"
+
+        # Format values
+        def fmt(val):
+            return (
+                f"{val:.2f}"
+                if isinstance(val, (int, float)) and val > 0
+                else (val if val != -1 else "N/A")
+            )
+
+        for folder, path_components in folders.iterrows():
+            rel_folder = path_components["rel_folder"]
             report_content += f"### {rel_folder}\n\n"
 
             # Create table header (new order)
@@ -695,8 +2087,10 @@ def generate_folder_report(folder_data, log_callback=None, exclude_mode=None):
             )
 
             # Add file data in new order
-            for file_data in sorted(files, key=lambda x: x.get("filename", "")):
-                path_components = parse_folder_path(folder)
+            file_rows = table.folder_records(folder).sort_values(
+                "filename", kind="stable"
+            )
+            for file_data in file_rows.itertuples(index=False):
                 row_data = {
                     "Date": path_components["date"],
                     "Network Type": path_components["network"],
@@ -706,22 +2100,13 @@ def generate_folder_report(folder_data, log_callback=None, exclude_mode=None):
                     "Region": path_components["region"],
                     "Device": path_components["device"],
                     "Game": path_components["game"],
-                    "FPS": file_data.get("fps", "N/A"),
-                    "Bandwidth (Mbps)": file_data.get("bandwidth", "N/A"),
-                    "RTT (ms)": file_data.get("rtt", "N/A"),
-                    "Playtime (s)": file_data.get("playtime", "N/A"),
+                    "FPS": file_data.fps,
+                    "Bandwidth (Mbps)": file_data.bandwidth,
+                    "RTT (ms)": file_data.rtt,
+                    "Playtime (s)": file_data.playtime,
                     "Folder": rel_folder,
-                    "Filename": file_data.get("filename", "Unknown"),
+                    "Filename": file_data.filename,
                 }
-
-                # Format values
-                def fmt(val):
-                    return (
-                        f"{val:.2f}"
-                        if isinstance(val, (int, float)) and val > 0
-                        else (val if val != -1 else "N/A")
-                    )
-
                 row = [fmt(row_data[h]) for h in detail_headers]
                 report_content += "| " + " | ".join(row) + " |\n"
 
@@ -772,53 +2157,42 @@ def generate_folder_report(folder_data, log_callback=None, exclude_mode=None):
         ]
         report_content += "| " + " | ".join(minmax_headers) + " |\n"
         report_content += "|" + "|".join(["-" * len(h) for h in minmax_headers]) + "|\n"
-        for folder in sorted_folders:
-            folder_info = folder_data[folder]
-            if not isinstance(folder_info, dict):
-                folder_info = dict(folder_info)
-            files = list(folder_info.get("files", []))
-            rel_folder = os.path.relpath(folder, root_abs)
-            if rel_folder == ".":
-                rel_folder = "(root)"
-            fps_vals = [
-                f.get("fps")
-                for f in files
-                if isinstance(f.get("fps"), (int, float)) and f.get("fps") > 0
-            ]
-            bw_vals = [
-                f.get("bandwidth")
-                for f in files
-                if isinstance(f.get("bandwidth"), (int, float))
-                and f.get("bandwidth") > 0
-            ]
-            rtt_vals = [
-                f.get("rtt")
-                for f in files
-                if isinstance(f.get("rtt"), (int, float)) and f.get("rtt") > 0
-            ]
-            playtime_vals = [
-                f.get("playtime")
-                for f in files
-                if isinstance(f.get("playtime"), (int, float)) and f.get("playtime") > 0
-            ]
 
-            def fmt(val):
-                return f"{val:.2f}" if isinstance(val, (int, float)) else "N/A"
-
-            row = [
-                rel_folder,
-                fmt(min(fps_vals)) if fps_vals else "N/A",
-                fmt(max(fps_vals)) if fps_vals else "N/A",
-                fmt(min(bw_vals)) if bw_vals else "N/A",
-                fmt(max(bw_vals)) if bw_vals else "N/A",
-                fmt(min(rtt_vals)) if rtt_vals else "N/A",
-                fmt(max(rtt_vals)) if rtt_vals else "N/A",
-                fmt(min(playtime_vals)) if playtime_vals else "N/A",
-                fmt(max(playtime_vals)) if playtime_vals else "N/A",
-            ]
+        def fmt(val):
+            return f"{val:.2f}" if not pd.isna(val) else "N/A"
+
+        for folder, info in folders.iterrows():
+            row = [info["rel_folder"]]
+            for metric in ("fps", "bandwidth", "rtt", "playtime"):
+                row += [fmt(info[f"{metric}_min"]), fmt(info[f"{metric}_max"])]
             report_content += "| " + " | ".join(row) + " |\n"
         report_content += "\n"
 
+        # 내용이 같은 PDF 복사본 (process_pdf_files의 중복 검사 결과)
+        duplicates = folder_data["_config"].get("duplicates")
+        if duplicates and duplicates.get("groups"):
+            root_abs = folder_data["_config"].get("root_abs") or ""
+            counted = duplicates.get("mode") == "count"
+            report_content += "## 중복 PDF\n\n"
+            report_content += (
+                "내용이 같은 PDF는 한 번만 추출했으며, 복사본은 폴더 평균에 "
+                f"{'포함했습니다' if counted else '포함하지 않았습니다'}.\n\n"
+            )
+            duplicate_headers = ["Original", "Duplicate Folder", "Duplicate File"]
+            report_content += "| " + " | ".join(duplicate_headers) + " |\n"
+            report_content += (
+                "|" + "|".join(["-" * len(h) for h in duplicate_headers]) + "|\n"
+            )
+            for original, copies in duplicates["groups"].items():
+                for copy in copies:
+                    row = [
+                        os.path.relpath(original, root_abs),
+                        os.path.relpath(os.path.dirname(copy), root_abs),
+                        os.path.basename(copy),
+                    ]
+                    report_content += "| " + " | ".join(row) + " |\n"
+            report_content += "\n"
+
         if log_callback:
             log_callback("리포트 파일 저장 중...\n")
 
@@ -827,8 +2201,9 @@ def generate_folder_report(folder_data, log_callback=None, exclude_mode=None):
             with open(fixed_md, "w", encoding="utf-8") as f:
                 f.write(report_content)
 
-            with open(timestamped_md, "w", encoding="utf-8") as f:
-                f.write(report_content)
+            if timestamped:
+                with open(timestamped_md, "w", encoding="utf-8") as f:
+                    f.write(report_content)
 
             # Convert to HTML and save
             html_content = markdown.markdown(report_content, extensions=["tables"])
@@ -837,12 +2212,17 @@ def generate_folder_report(folder_data, log_callback=None, exclude_mode=None):
             with open(fixed_html, "w", encoding="utf-8") as f:
                 f.write(html_full_content)
 
-            with open(timestamped_html, "w", encoding="utf-8") as f:
-                f.write(html_full_content)
+            if timestamped:
+                with open(timestamped_html, "w", encoding="utf-8") as f:
+                    f.write(html_full_content)
+            else:
+                timestamped_md = timestamped_html = None
 
             if log_callback:
+                written = [fixed_md, timestamped_md, fixed_html, timestamped_html]
                 log_callback(
-                    f"생성된 파일:\n- {fixed_md}\n- {timestamped_md}\n- {fixed_html}\n- {timestamped_html}\n"
+                    "생성된 파일:\n"
+                    + "".join(f"- {path}\n" for path in written if path)
                 )
 
             return fixed_md, timestamped_md, fixed_html, timestamped_html
@@ -858,14 +2238,73 @@ def generate_folder_report(folder_data, log_callback=None, exclude_mode=None):
         return None, None, None, None
 
 
+EXCEL_HEADER_STYLE = "report_header"
+EXCEL_BAND_STYLES = ("report_band_light", "report_band_shaded")
+
+
+def _add_excel_styles(workbook):
+    """Register the shared header/alternating band named styles on a workbook."""
+    from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
+
+    workbook.add_named_style(
+        NamedStyle(
+            name=EXCEL_HEADER_STYLE,
+            font=Font(bold=True),
+            fill=PatternFill(
+                start_color="CCCCCC", end_color="CCCCCC", fill_type="solid"
+            ),
+            alignment=Alignment(horizontal="center"),
+        )
+    )
+    for name, color in zip(EXCEL_BAND_STYLES, ("FFFFFF", "F5F5F5")):
+        workbook.add_named_style(
+            NamedStyle(
+                name=name,
+                fill=PatternFill(start_color=color, end_color=color, fill_type="solid"),
+            )
+        )
+
+
+def _styled_row(ws, values, style):
+    """Build a row of write-only cells sharing one named style."""
+    from openpyxl.cell import WriteOnlyCell
+
+    cells = []
+    for value in values:
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        cells.append(cell)
+    return cells
+
+
+@contextmanager
+def _open_report_csv(path, headers):
+    """Open a CSV report (UTF-8 with BOM for Excel) and yield a writer after the header."""
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f, lineterminator=os.linesep)
+        writer.writerow(headers)
+        yield writer
+
+
+@profiled_stage("excel")
 def export_to_excel(
     folder_data,
     reports_dir=None,
     timestamp=None,
     log_callback=None,
     exclude_mode=None,
+    affected=None,
 ):
-    """Export data to Excel files - one for detailed data and one for averages."""
+    """Export data to Excel files - one for detailed data and one for averages.
+
+    affected(감시 모드에서 바뀐 폴더 집합)가 주어지면 나머지 폴더의 행은 이전 갱신에서
+    만든 것(folder_data["_config"]["excel_rows"])을 재사용합니다. 워크북은 한 파일이므로
+    매번 전체를 다시 쓰며, 같은 timestamp를 주면 기존 파일을 덮어씁니다.
+    """
+    import pandas as pd
+    from openpyxl import Workbook
+    from openpyxl.utils import get_column_letter
+
     if log_callback:
         log_callback("Excel 파일 생성 중...\n")
     if exclude_mode is None or not isinstance(exclude_mode, dict):
@@ -877,10 +2316,9 @@ def export_to_excel(
     opt_str = f"fps-{mode_str(exclude_mode.get('fps'))}_bw-{mode_str(exclude_mode.get('bw'))}_rtt-{mode_str(exclude_mode.get('rtt'))}"
 
     try:
-        # Get reports directory and root_abs from folder_data if not provided
+        # Get reports directory from folder_data if not provided
         if reports_dir is None:
             reports_dir = folder_data.get("_config", {}).get("reports_dir", "reports")
-        root_abs = folder_data.get("_config", {}).get("root_abs", "")
 
         # Create timestamp if not provided
         if timestamp is None:
@@ -894,17 +2332,14 @@ def export_to_excel(
             reports_dir, f"metrics_averages_{opt_str}_{timestamp}.xlsx"
         )
 
-        if log_callback:
-            log_callback("Excel 워크북 생성 중...\n")
+        # 모든 리포트 출력이 공유하는 집계 테이블 (한 번만 생성)
+        table = get_metrics_table(folder_data, parse_folder_path, log_callback)
+        folders = table.folders
 
-        # Create workbook for detailed data
-        wb_details = Workbook()
-        ws_details = wb_details.active
-        ws_details.title = "Metrics Details"
-
-        # Define alternating colors
-        color1 = "FFFFFF"  # White
-        color2 = "F5F5F5"  # Very light gray
+        if table.empty:
+            if log_callback:
+                log_callback("처리할 폴더 데이터가 없습니다.\n")
+            return None, None
 
         # Set up headers (new order)
         headers = [
@@ -949,216 +2384,111 @@ def export_to_excel(
             "Folder",
             "Number of Files",
         ]
-
-        if log_callback:
-            log_callback("상세 데이터 시트 작성 중...\n")
-
-        # Set up headers for details worksheet
-        for col, header in enumerate(headers, 1):
-            cell = ws_details.cell(row=1, column=col)
-            cell.value = header
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(
-                start_color="CCCCCC", end_color="CCCCCC", fill_type="solid"
+        components = ["date", "network", "carrier", "city", "area", "region"]
+        components += ["device", "game"]
+
+        averages = table.averages(exclude_mode)
+
+        def fmt_avg(val):
+            return round(float(val), 2) if val > 0 else "N/A"
+
+        def fmt(val):
+            return round(float(val), 2) if not pd.isna(val) else "N/A"
+
+        # 감시 모드 갱신이면 바뀌지 않은 폴더의 행을 재사용 ({폴더: 행} 상세/평균)
+        detail_cache = average_cache = None
+        if affected is not None:
+            config = folder_data.setdefault("_config", {})
+            cached = config.get("excel_rows")
+            if cached is None or cached[0] != opt_str:
+                cached = config["excel_rows"] = (opt_str, {}, {})
+            _, detail_cache, average_cache = cached
+            for folder in affected:
+                detail_cache.pop(folder, None)
+                average_cache.pop(folder, None)
+
+        def detail_rows(folder, info):
+            """Return the detail rows of one folder."""
+            if detail_cache is not None and folder in detail_cache:
+                return detail_cache[folder]
+            prefix = [info[key] for key in components]
+            rows = [
+                prefix
+                + [
+                    file_data.fps,
+                    file_data.bandwidth,
+                    file_data.rtt,
+                    file_data.playtime,
+                    info["rel_folder"],
+                    file_data.filename,
+                ]
+                for file_data in table.folder_records(folder).itertuples(index=False)
+            ]
+            if detail_cache is not None:
+                detail_cache[folder] = rows
+            return rows
+
+        def average_row(folder, info):
+            """Return the averages row of one folder."""
+            if average_cache is not None and folder in average_cache:
+                return average_cache[folder]
+            avg = averages.loc[folder]
+            row = [info[key] for key in components]
+            row += [
+                fmt_avg(avg[f"{metric}_avg"])
+                for metric in ("fps", "bandwidth", "rtt", "playtime")
+            ]
+            for metric in ("fps", "bandwidth", "rtt", "playtime"):
+                row += [fmt(info[f"{metric}_min"]), fmt(info[f"{metric}_max"])]
+            row += [info["rel_folder"], int(info["files"])]
+            if average_cache is not None:
+                average_cache[folder] = row
+            return row
+
+        def iter_detail_rows():
+            """Yield (band, row) for every file, grouped by folder name."""
+            ordered = folders.sort_values(
+                "rel_folder", key=lambda col: col.str.lower(), kind="stable"
             )
-            cell.alignment = Alignment(horizontal="center")
-
-        # Get sorted folders (excluding _config)
-        sorted_folders = sorted([k for k in folder_data.keys() if k != "_config"])
-
-        if not sorted_folders:
-            if log_callback:
-                log_callback("처리할 폴더 데이터가 없습니다.\n")
-            return None, None
+            for band, (folder, info) in enumerate(ordered.iterrows()):
+                for row in detail_rows(folder, info):
+                    yield band % 2, list(row)
 
-        # Prepare sorted data
-        all_data = []
-        for folder in sorted_folders:
-            folder_info = folder_data[folder]
-            if not isinstance(folder_info, dict):
-                folder_info = dict(folder_info)
-            files = list(folder_info.get("files", []))
+        def iter_average_rows():
+            """Yield one averages row per folder."""
+            for folder, info in folders.iterrows():
+                yield list(average_row(folder, info))
 
-            # Parse folder path
-            path_components = parse_folder_path(folder)
-
-            # 폴더 경로를 선택한 폴더(root_abs) 기준 상대경로로 변환
-            rel_folder = os.path.relpath(folder, root_abs)
-            if rel_folder == ".":
-                rel_folder = "(root)"
-
-            for file_data in files:
-                data_row = {
-                    "Date": path_components["date"],
-                    "Network Type": path_components["network"],
-                    "Carrier": path_components["carrier"],
-                    "City": path_components["city"],
-                    "Area": path_components["area"],
-                    "Region": path_components["region"],
-                    "Device": path_components["device"],
-                    "Game": path_components["game"],
-                    "FPS": file_data.get("fps", -1),
-                    "Bandwidth (Mbps)": file_data.get("bandwidth", -1),
-                    "RTT (ms)": file_data.get("rtt", -1),
-                    "Playtime (s)": file_data.get("playtime", -1),
-                    "Folder": rel_folder,
-                    "Filename": file_data.get("filename", "Unknown"),
-                }
-                all_data.append(data_row)
-
-        # Sort data by folder name
-        all_data.sort(key=lambda x: x["Folder"].lower())
-
-        # Fill details data with alternating colors
-        row = 2
-        current_folder = None
-        color_toggle = True  # True for color1, False for color2
-
-        for data in all_data:
-            # Check if folder changed
-            if current_folder != data["Folder"]:
-                current_folder = data["Folder"]
-                color_toggle = not color_toggle  # Switch color for new folder
-
-            # Apply background color to entire row
-            fill_color = color1 if color_toggle else color2
-            for col in range(1, len(headers) + 1):
-                cell = ws_details.cell(row=row, column=col)
-                cell.fill = PatternFill(
-                    start_color=fill_color, end_color=fill_color, fill_type="solid"
-                )
-
-            # Fill data in new order
-            for col, header in enumerate(headers, 1):
-                ws_details.cell(row=row, column=col, value=data[header])
-            row += 1
+        if log_callback:
+            log_callback("Excel 워크북 생성 중...\n")
+            log_callback("상세 데이터 시트 작성 중...\n")
 
-        # Auto-adjust column widths
+        # 쓰기 전용 워크북에 행을 바로 스트리밍 (셀마다 스타일 객체를 만들지 않고
+        # 미리 등록한 named style을 공유)
+        wb_details = Workbook(write_only=True)
+        _add_excel_styles(wb_details)
+        ws_details = wb_details.create_sheet("Metrics Details")
         for col in range(1, len(headers) + 1):
             ws_details.column_dimensions[get_column_letter(col)].auto_size = True
+        ws_details.append(_styled_row(ws_details, headers, EXCEL_HEADER_STYLE))
+        # 폴더가 바뀔 때마다 배경색을 번갈아 적용 (첫 폴더는 회색)
+        for band, values in iter_detail_rows():
+            style = EXCEL_BAND_STYLES[1 - band]
+            ws_details.append(_styled_row(ws_details, values, style))
 
         if log_callback:
             log_callback("평균값 시트 작성 중...\n")
 
-        # Create workbook for averages
-        wb_averages = Workbook()
-        ws_averages = wb_averages.active
-        ws_averages.title = "Folder Averages"
-
-        # Set up headers for averages worksheet
-        for col, header in enumerate(avg_headers, 1):
-            cell = ws_averages.cell(row=1, column=col)
-            cell.value = header
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(
-                start_color="CCCCCC", end_color="CCCCCC", fill_type="solid"
-            )
-            cell.alignment = Alignment(horizontal="center")
-
-        # Calculate and fill averages data with alternating colors
-        row = 2
-        color_toggle = True  # Reset color toggle for averages sheet
-
-        for folder in sorted_folders:
-            # 폴더 경로를 선택한 폴더(root_abs) 기준 상대경로로 변환
-            rel_folder = os.path.relpath(folder, root_abs)
-            if rel_folder == ".":
-                rel_folder = "(root)"
-
-            folder_info = folder_data[folder]
-            if not isinstance(folder_info, dict):
-                folder_info = dict(folder_info)
-            files = list(folder_info.get("files", []))
-            path_components = parse_folder_path(folder)
-
-            # Calculate averages
-            fps_values = [f.get("fps", -1) for f in files if f.get("fps", -1) > 0]
-            bw_values = [
-                f.get("bandwidth", -1) for f in files if f.get("bandwidth", -1) > 0
-            ]
-            rtt_values = [f.get("rtt", -1) for f in files if f.get("rtt", -1) > 0]
-            playtime_values = [
-                f.get("playtime", -1) for f in files if f.get("playtime", -1) > 0
-            ]
-
-            # Calculate averages (excluding min/max if enough values)
-            def get_avg(values, mode):
-                if not values:
-                    return -1
-                if len(values) < 3 or mode == "none":
-                    return sum(values) / len(values)
-                sorted_vals = sorted(values)
-                if mode == "minmax":
-                    return sum(sorted_vals[1:-1]) / len(sorted_vals[1:-1])
-                elif mode == "min":
-                    return sum(sorted_vals[1:]) / len(sorted_vals[1:])
-                elif mode == "max":
-                    return sum(sorted_vals[:-1]) / len(sorted_vals[:-1])
-                else:
-                    return sum(values) / len(values)
-
-            avg_fps = get_avg(fps_values, exclude_mode.get("fps", "minmax"))
-            avg_bw = get_avg(bw_values, exclude_mode.get("bw", "minmax"))
-            avg_rtt = get_avg(rtt_values, exclude_mode.get("rtt", "minmax"))
-            avg_playtime = get_avg(playtime_values, "minmax")
-
-            # min/max 값 계산
-            def fmt(val):
-                return round(val, 2) if isinstance(val, (int, float)) else "N/A"
-
-            fps_min = fmt(min(fps_values)) if fps_values else "N/A"
-            fps_max = fmt(max(fps_values)) if fps_values else "N/A"
-            bw_min = fmt(min(bw_values)) if bw_values else "N/A"
-            bw_max = fmt(max(bw_values)) if bw_values else "N/A"
-            rtt_min = fmt(min(rtt_values)) if rtt_values else "N/A"
-            rtt_max = fmt(max(rtt_values)) if rtt_values else "N/A"
-            playtime_min = fmt(min(playtime_values)) if playtime_values else "N/A"
-            playtime_max = fmt(max(playtime_values)) if playtime_values else "N/A"
-
-            # Apply background color to entire row
-            fill_color = color1 if color_toggle else color2
-            for col in range(1, len(avg_headers) + 1):
-                cell = ws_averages.cell(row=row, column=col)
-                cell.fill = PatternFill(
-                    start_color=fill_color, end_color=fill_color, fill_type="solid"
-                )
-
-            # Fill data for averages in new order
-            avg_data = {
-                "Date": path_components["date"],
-                "Network Type": path_components["network"],
-                "Carrier": path_components["carrier"],
-                "City": path_components["city"],
-                "Area": path_components["area"],
-                "Region": path_components["region"],
-                "Device": path_components["device"],
-                "Game": path_components["game"],
-                "Average FPS": round(avg_fps, 2) if avg_fps > 0 else "N/A",
-                "Average Bandwidth (Mbps)": round(avg_bw, 2) if avg_bw > 0 else "N/A",
-                "Average RTT (ms)": round(avg_rtt, 2) if avg_rtt > 0 else "N/A",
-                "Average Playtime (s)": (
-                    round(avg_playtime, 2) if avg_playtime > 0 else "N/A"
-                ),
-                "FPS Min": fps_min,
-                "FPS Max": fps_max,
-                "BW Min": bw_min,
-                "BW Max": bw_max,
-                "RTT Min": rtt_min,
-                "RTT Max": rtt_max,
-                "Playtime Min": playtime_min,
-                "Playtime Max": playtime_max,
-                "Folder": rel_folder,
-                "Number of Files": len(files),
-            }
-            for col, header in enumerate(avg_headers, 1):
-                ws_averages.cell(row=row, column=col, value=avg_data[header])
-
-            row += 1
-            color_toggle = not color_toggle  # Switch color for next folder
-
-        # Auto-adjust column widths for averages
+        wb_averages = Workbook(write_only=True)
+        _add_excel_styles(wb_averages)
+        ws_averages = wb_averages.create_sheet("Folder Averages")
         for col in range(1, len(avg_headers) + 1):
             ws_averages.column_dimensions[get_column_letter(col)].auto_size = True
+        ws_averages.append(_styled_row(ws_averages, avg_headers, EXCEL_HEADER_STYLE))
+        # 행마다 배경색을 번갈아 적용 (첫 행은 흰색)
+        for idx, values in enumerate(iter_average_rows()):
+            style = EXCEL_BAND_STYLES[idx % 2]
+            ws_averages.append(_styled_row(ws_averages, values, style))
 
         if log_callback:
             log_callback("Excel 파일 저장 중...\n")
@@ -1171,75 +2501,33 @@ def export_to_excel(
             log_callback(f"생성된 파일:\n- {details_filename}\n- {averages_filename}\n")
 
         # CSV 파일로도 저장 (상세/평균)
-        try:
-            # 상세 데이터 CSV
-            details_csv = os.path.join(
-                reports_dir, f"metrics_details_{opt_str}_{timestamp}.csv"
-            )
-            df_details = pd.DataFrame(all_data, columns=headers)
-            df_details.to_csv(details_csv, index=False, encoding="utf-8-sig")
-            # 평균 데이터 CSV
-            averages_csv = os.path.join(
-                reports_dir, f"metrics_averages_{opt_str}_{timestamp}.csv"
-            )
-            avg_rows = []
-            for folder in sorted_folders:
-                rel_folder = os.path.relpath(folder, root_abs)
-                if rel_folder == ".":
-                    rel_folder = "(root)"
-                folder_info = folder_data[folder]
-                if not isinstance(folder_info, dict):
-                    folder_info = dict(folder_info)
-                files = list(folder_info.get("files", []))
-                path_components = parse_folder_path(folder)
-                fps_values = [f.get("fps", -1) for f in files if f.get("fps", -1) > 0]
-                bw_values = [
-                    f.get("bandwidth", -1) for f in files if f.get("bandwidth", -1) > 0
-                ]
-                rtt_values = [f.get("rtt", -1) for f in files if f.get("rtt", -1) > 0]
-                playtime_values = [
-                    f.get("playtime", -1) for f in files if f.get("playtime", -1) > 0
-                ]
-                if len(fps_values) >= 3:
-                    fps_values = sorted(fps_values)[1:-1]
-                if len(bw_values) >= 3:
-                    bw_values = sorted(bw_values)[1:-1]
-                if len(rtt_values) >= 3:
-                    rtt_values = sorted(rtt_values)[1:-1]
-                if len(playtime_values) >= 3:
-                    playtime_values = sorted(playtime_values)[1:-1]
-                avg_fps = get_avg(fps_values, exclude_mode.get("fps", "minmax"))
-                avg_bw = get_avg(bw_values, exclude_mode.get("bw", "minmax"))
-                avg_rtt = get_avg(rtt_values, exclude_mode.get("rtt", "minmax"))
-                avg_playtime = get_avg(playtime_values, "minmax")
-                avg_data = {
-                    "Date": path_components["date"],
-                    "Network Type": path_components["network"],
-                    "Carrier": path_components["carrier"],
-                    "City": path_components["city"],
-                    "Area": path_components["area"],
-                    "Region": path_components["region"],
-                    "Device": path_components["device"],
-                    "Game": path_components["game"],
-                    "Average FPS": round(avg_fps, 2) if avg_fps > 0 else "N/A",
-                    "Average Bandwidth (Mbps)": (
-                        round(avg_bw, 2) if avg_bw > 0 else "N/A"
-                    ),
-                    "Average RTT (ms)": round(avg_rtt, 2) if avg_rtt > 0 else "N/A",
-                    "Average Playtime (s)": (
-                        round(avg_playtime, 2) if avg_playtime > 0 else "N/A"
-                    ),
-                    "Folder": rel_folder,
-                    "Number of Files": len(files),
-                }
-                avg_rows.append(avg_data)
-            df_avg = pd.DataFrame(avg_rows, columns=avg_headers)
-            df_avg.to_csv(averages_csv, index=False, encoding="utf-8-sig")
-            if log_callback:
-                log_callback(f"CSV 파일도 생성됨:\n- {details_csv}\n- {averages_csv}\n")
-        except Exception as e:
-            if log_callback:
-                log_callback(f"CSV 저장 중 오류 발생: {e}\n")
+        with timed_stage(folder_data.get("_config", {}).get("profiler"), "csv"):
+            try:
+                # 상세 데이터 CSV
+                details_csv = os.path.join(
+                    reports_dir, f"metrics_details_{opt_str}_{timestamp}.csv"
+                )
+                metric_cols = range(len(components), len(components) + 4)
+                with _open_report_csv(details_csv, headers) as writer:
+                    for _, values in iter_detail_rows():
+                        # 메트릭 열은 실수로 기록 (-1 -> -1.0)
+                        for col in metric_cols:
+                            if isinstance(values[col], int):
+                                values[col] = float(values[col])
+                        writer.writerow(values)
+                # 평균 데이터 CSV
+                averages_csv = os.path.join(
+                    reports_dir, f"metrics_averages_{opt_str}_{timestamp}.csv"
+                )
+                with _open_report_csv(averages_csv, avg_headers) as writer:
+                    writer.writerows(iter_average_rows())
+                if log_callback:
+                    log_callback(
+                        f"CSV 파일도 생성됨:\n- {details_csv}\n- {averages_csv}\n"
+                    )
+            except Exception as e:
+                if log_callback:
+                    log_callback(f"CSV 저장 중 오류 발생: {e}\n")
 
         return details_filename, averages_filename
 
@@ -1250,65 +2538,63 @@ def export_to_excel(
         return None, None
 
 
-def generate_performance_plots(folder_data, timestamp, log_callback=None):
-    """Generate performance visualization plots grouped by Region and Carrier."""
+@profiled_stage("plots")
+def generate_performance_plots(
+    folder_data,
+    timestamp,
+    log_callback=None,
+    reports_dir=None,
+    dpi=300,
+    image_format="png",
+    jobs=1,
+    use_cache=True,
+    rebuild_cache=False,
+    affected=None,
+):
+    """Generate performance visualization plots grouped by Region and Carrier.
+
+    차트는 pyplot 전역 상태 없이 Figure API(Agg)로 그리며, jobs가 1보다 크면
+    프로세스 풀에서 병렬로 렌더링합니다. 차트별 렌더링 시간은 로그로 요약되고
+    folder_data["_config"]["chart_timings"]에 저장됩니다.
+    use_cache가 켜져 있으면 입력 데이터/제목/렌더링 설정의 해시가 같은 차트는
+    다시 그리지 않고 캐시(_cache/charts)의 파일을 새 이름으로 링크하거나 복사합니다.
+    affected(감시 모드에서 바뀐 폴더 집합)가 주어지면 그 폴더가 속한 지역/통신사 차트만
+    다시 만들고, 같은 timestamp의 다른 차트 파일은 그대로 둡니다(더 이상 폴더가 없는
+    그룹의 차트는 삭제).
+    """
+    import numpy as np
+    import pandas as pd
+
     if log_callback:
         log_callback("성능 차트 생성 중...\n")
 
     try:
         # Create plots directory if it doesn't exist
-        plots_dir = os.path.join("reports", "plots")
+        if reports_dir is None:
+            reports_dir = folder_data.get("_config", {}).get("reports_dir", "reports")
+        plots_dir = os.path.join(reports_dir, "plots")
         os.makedirs(plots_dir, exist_ok=True)
 
         if log_callback:
             log_callback("데이터 준비 중...\n")
 
         # Prepare data for plotting with region and carrier information
+        table = get_metrics_table(folder_data, parse_folder_path, log_callback)
         plot_data = []
-        for folder, data in folder_data.items():
-            fps_values = []
-            bandwidth_values = []
-            rtt_values = []
-
-            # Parse folder path to get region and carrier
-            path_components = parse_folder_path(folder)
-            region = path_components["region"]
-            carrier = path_components["carrier"]
-
-            for file_data in data["files"]:
-                if isinstance(file_data, dict):
-                    if (
-                        "fps" in file_data
-                        and isinstance(file_data["fps"], (int, float))
-                        and file_data["fps"] > -1
-                    ):
-                        fps_values.append(file_data["fps"])
-                    if (
-                        "bandwidth" in file_data
-                        and isinstance(file_data["bandwidth"], (int, float))
-                        and file_data["bandwidth"] > -1
-                    ):
-                        bandwidth_values.append(file_data["bandwidth"])
-                    if (
-                        "rtt" in file_data
-                        and isinstance(file_data["rtt"], (int, float))
-                        and file_data["rtt"] > -1
-                    ):
-                        rtt_values.append(file_data["rtt"])
+        for folder, info in table.folders.iterrows():
+            fps_values = table.values(folder, "fps")
+            bandwidth_values = table.values(folder, "bandwidth")
+            rtt_values = table.values(folder, "rtt")
 
             if fps_values or bandwidth_values or rtt_values:
                 plot_data.append(
                     {
                         "folder": folder,
-                        "region": region,
-                        "carrier": carrier,
-                        "avg_fps": float(np.mean(fps_values)) if fps_values else 0.0,
-                        "avg_bandwidth": (
-                            float(np.mean(bandwidth_values))
-                            if bandwidth_values
-                            else 0.0
-                        ),
-                        "avg_rtt": float(np.mean(rtt_values)) if rtt_values else 0.0,
+                        "region": info["region"],
+                        "carrier": info["carrier"],
+                        "avg_fps": float(np.nan_to_num(info["fps_mean"])),
+                        "avg_bandwidth": float(np.nan_to_num(info["bandwidth_mean"])),
+                        "avg_rtt": float(np.nan_to_num(info["rtt_mean"])),
                         "fps_values": fps_values,
                         "bandwidth_values": bandwidth_values,
                         "rtt_values": rtt_values,
@@ -1323,122 +2609,75 @@ def generate_performance_plots(folder_data, timestamp, log_callback=None):
         # Convert to DataFrame for plotting
         df = pd.DataFrame(plot_data)
 
-        if log_callback:
-            log_callback("차트 생성 시작...\n")
-
-        # Set figure size and font size for better readability
-        plt.rcParams.update(
-            {"font.size": 10, "figure.autolayout": True, "figure.figsize": (20, 10)}
-        )
-
         # Group data by region and carrier
         regions = sorted(df["region"].unique())
         carriers = sorted(df["carrier"].unique())
-
-        # 1. Bar plots for averages by region
-        for region in regions:
-            if log_callback:
-                log_callback(f"리전별 평균 차트 생성 중: {region}\n")
-
-            region_data = df[df["region"] == region]
-            if not region_data.empty:
-                fig, ax = plt.subplots()
-                x = np.arange(len(region_data))
-                width = 0.25
-
-                ax.bar(
-                    x - width,
-                    region_data["avg_fps"],
-                    width,
-                    label="FPS",
-                    color="skyblue",
-                )
-                ax.bar(
-                    x,
-                    region_data["avg_bandwidth"],
-                    width,
-                    label="Bandwidth (Mbps)",
-                    color="lightgreen",
+        groups = [("region", "Region", region) for region in regions]
+        groups += [("carrier", "Carrier", carrier) for carrier in carriers]
+        stale = set()
+        if affected is not None:
+            # 바뀐(삭제된 폴더 포함) 폴더가 속한 그룹과 아직 차트가 없는 그룹만 다시 생성
+            affected_groups = set()
+            for folder in affected:
+                components = parse_folder_path(folder)
+                affected_groups.add(("region", components["region"]))
+                affected_groups.add(("carrier", components["carrier"]))
+            chart_names = ["averages_bar_plot"]
+            chart_names += [f"{m}_boxplot" for m in ("fps", "bandwidth", "rtt")]
+            stale = {
+                chart_filename(
+                    plots_dir, f"{name}_{column}_{value}", timestamp, image_format
                 )
-                ax.bar(
-                    x + width,
-                    region_data["avg_rtt"],
-                    width,
-                    label="RTT (ms)",
-                    color="salmon",
-                )
-
-                ax.set_title(f"Average Performance Metrics - Region: {region}")
-                ax.set_xlabel("Folder")
-                ax.set_ylabel("Value")
-                ax.set_xticks(x)
-                ax.set_xticklabels(region_data["folder"], rotation=45, ha="right")
-                ax.legend()
-                ax.grid(True, linestyle="--", alpha=0.3)
-
-                plt.tight_layout()
-                plt.savefig(
-                    os.path.join(
-                        plots_dir, f"averages_bar_plot_region_{region}_{timestamp}.png"
-                    ),
-                    dpi=300,
-                    bbox_inches="tight",
+                for column, value in affected_groups
+                for name in chart_names
+            }
+            groups = [
+                (column, label, value)
+                for column, label, value in groups
+                if (column, value) in affected_groups
+                or not os.path.exists(
+                    chart_filename(
+                        plots_dir,
+                        f"averages_bar_plot_{column}_{value}",
+                        timestamp,
+                        image_format,
+                    )
                 )
-                plt.close()
+            ]
 
-        # 2. Bar plots for averages by carrier
-        for carrier in carriers:
-            if log_callback:
-                log_callback(f"통신사별 평균 차트 생성 중: {carrier}\n")
-
-            carrier_data = df[df["carrier"] == carrier]
-            if not carrier_data.empty:
-                fig, ax = plt.subplots()
-                x = np.arange(len(carrier_data))
-                width = 0.25
-
-                ax.bar(
-                    x - width,
-                    carrier_data["avg_fps"],
-                    width,
-                    label="FPS",
-                    color="skyblue",
-                )
-                ax.bar(
-                    x,
-                    carrier_data["avg_bandwidth"],
-                    width,
-                    label="Bandwidth (Mbps)",
-                    color="lightgreen",
-                )
-                ax.bar(
-                    x + width,
-                    carrier_data["avg_rtt"],
-                    width,
-                    label="RTT (ms)",
-                    color="salmon",
-                )
+        # 각 차트를 워커로 넘길 수 있는 단순 딕셔너리(spec)로 준비
+        specs = []
 
-                ax.set_title(f"Average Performance Metrics - Carrier: {carrier}")
-                ax.set_xlabel("Folder")
-                ax.set_ylabel("Value")
-                ax.set_xticks(x)
-                ax.set_xticklabels(carrier_data["folder"], rotation=45, ha="right")
-                ax.legend()
-                ax.grid(True, linestyle="--", alpha=0.3)
-
-                plt.tight_layout()
-                plt.savefig(
-                    os.path.join(
-                        plots_dir,
-                        f"averages_bar_plot_carrier_{carrier}_{timestamp}.png",
-                    ),
-                    dpi=300,
-                    bbox_inches="tight",
+        # 1. Bar plots for averages by region / carrier
+        for column, label, value in groups:
+            group_data = df[df[column] == value]
+            if not group_data.empty:
+                specs.append(
+                    {
+                        "kind": "bar",
+                        "title": f"Average Performance Metrics - {label}: {value}",
+                        "xlabel": "Folder",
+                        "ylabel": "Value",
+                        "labels": group_data["folder"].tolist(),
+                        "series": [
+                            ("FPS", group_data["avg_fps"].tolist(), "skyblue"),
+                            (
+                                "Bandwidth (Mbps)",
+                                group_data["avg_bandwidth"].tolist(),
+                                "lightgreen",
+                            ),
+                            ("RTT (ms)", group_data["avg_rtt"].tolist(), "salmon"),
+                        ],
+                        "path": chart_filename(
+                            plots_dir,
+                            f"averages_bar_plot_{column}_{value}",
+                            timestamp,
+                            image_format,
+                        ),
+                    }
                 )
-                plt.close()
 
-        # 3. Box plots for distributions
+        # 2. Box plots for distributions by region / carrier
         metrics = ["fps_values", "bandwidth_values", "rtt_values"]
         titles = [
             "FPS Distribution",
@@ -1447,109 +2686,85 @@ def generate_performance_plots(folder_data, timestamp, log_callback=None):
         ]
         colors = ["skyblue", "lightgreen", "salmon"]
 
-        # Box plots by region
-        for region in regions:
-            if log_callback:
-                log_callback(f"리전별 분포도 차트 생성 중: {region}\n")
-
-            region_data = df[df["region"] == region]
-            if not region_data.empty:
-                for metric, title, color in zip(metrics, titles, colors):
-                    fig, ax = plt.subplots()
-                    data_to_plot = [
-                        d[metric] for _, d in region_data.iterrows() if d[metric]
-                    ]
-                    if data_to_plot:
-                        bp = ax.boxplot(data_to_plot, patch_artist=True)
-                        for element in [
-                            "boxes",
-                            "whiskers",
-                            "fliers",
-                            "means",
-                            "medians",
-                            "caps",
-                        ]:
-                            plt.setp(bp[element], color="black")
-                        plt.setp(bp["boxes"], facecolor=color)
-
-                        ax.set_title(f"{title} - Region: {region}")
-                        ax.set_xticks(range(1, len(data_to_plot) + 1))
-                        ax.set_xticklabels(
-                            [
-                                d["folder"]
-                                for _, d in region_data.iterrows()
-                                if d[metric]
-                            ],
-                            rotation=45,
-                            ha="right",
-                        )
-                        ax.grid(True, linestyle="--", alpha=0.3)
-
-                        plt.tight_layout()
-                        metric_name = metric.split("_")[0]
-                        plt.savefig(
-                            os.path.join(
+        for column, label, value in groups:
+            group_data = df[df[column] == value]
+            for metric, title, color in zip(metrics, titles, colors):
+                rows = [d for _, d in group_data.iterrows() if d[metric]]
+                if rows:
+                    metric_name = metric.split("_")[0]
+                    specs.append(
+                        {
+                            "kind": "box",
+                            "title": f"{title} - {label}: {value}",
+                            "labels": [d["folder"] for d in rows],
+                            "data": [d[metric] for d in rows],
+                            "color": color,
+                            "path": chart_filename(
                                 plots_dir,
-                                f"{metric_name}_boxplot_region_{region}_{timestamp}.png",
+                                f"{metric_name}_boxplot_{column}_{value}",
+                                timestamp,
+                                image_format,
                             ),
-                            dpi=300,
-                            bbox_inches="tight",
-                        )
-                        plt.close()
+                        }
+                    )
 
-        # Box plots by carrier
-        for carrier in carriers:
-            if log_callback:
-                log_callback(f"통신사별 분포도 차트 생성 중: {carrier}\n")
-
-            carrier_data = df[df["carrier"] == carrier]
-            if not carrier_data.empty:
-                for metric, title, color in zip(metrics, titles, colors):
-                    fig, ax = plt.subplots()
-                    data_to_plot = [
-                        d[metric] for _, d in carrier_data.iterrows() if d[metric]
-                    ]
-                    if data_to_plot:
-                        bp = ax.boxplot(data_to_plot, patch_artist=True)
-                        for element in [
-                            "boxes",
-                            "whiskers",
-                            "fliers",
-                            "means",
-                            "medians",
-                            "caps",
-                        ]:
-                            plt.setp(bp[element], color="black")
-                        plt.setp(bp["boxes"], facecolor=color)
-
-                        ax.set_title(f"{title} - Carrier: {carrier}")
-                        ax.set_xticks(range(1, len(data_to_plot) + 1))
-                        ax.set_xticklabels(
-                            [
-                                d["folder"]
-                                for _, d in carrier_data.iterrows()
-                                if d[metric]
-                            ],
-                            rotation=45,
-                            ha="right",
-                        )
-                        ax.grid(True, linestyle="--", alpha=0.3)
-                        plt.tight_layout()
-                        metric_name = metric.split("_")[0]
-                        plt.savefig(
-                            os.path.join(
-                                plots_dir,
-                                f"{metric_name}_boxplot_carrier_{carrier}_{timestamp}.png",
-                            ),
-                            dpi=300,
-                            bbox_inches="tight",
-                        )
-                        plt.close()
+        # 바뀐 그룹에서 더 이상 만들지 않는 차트 (폴더가 없어진 그룹/메트릭)
+        for path in stale - {spec["path"] for spec in specs}:
+            if os.path.exists(path):
+                os.remove(path)
 
+        if jobs == 0:
+            jobs = os.cpu_count() or 1
+        jobs = max(1, int(jobs or 1))
         if log_callback:
+            log_callback(
+                f"차트 생성 시작... ({len(specs)}개, 프로세스 {jobs}개, "
+                f"{image_format}, {dpi} DPI)\n"
+            )
+
+        started = time.perf_counter()
+        cache = None
+        keys = {}
+        if use_cache or rebuild_cache:
+            cache_dir = os.path.join(get_cache_dir(reports_dir), "charts")
+            cache = ChartCache(cache_dir, rebuild=rebuild_cache)
+            pending = []
+            for spec in specs:
+                key = chart_key(spec, dpi, image_format)
+                if not cache.restore(key, image_format, spec["path"]):
+                    keys[spec["path"]] = key
+                    pending.append(spec)
+            specs = pending
+
+        timings = []
+        failed = 0
+        for path, seconds, error in render_charts(specs, dpi, image_format, jobs):
+            if error:
+                failed += 1
+                if log_callback:
+                    log_callback(f"차트 생성 실패 {os.path.basename(path)}: {error}\n")
+                continue
+            timings.append((os.path.basename(path), seconds))
+            if cache:
+                cache.store(keys[path], image_format, path)
+        elapsed = time.perf_counter() - started
+
+        if cache and log_callback:
+            log_callback(
+                f"차트 캐시: 재사용 {cache.reused}개, 렌더링 {cache.rendered}개\n"
+            )
+
+        folder_data.setdefault("_config", {})["chart_timings"] = timings
+        if log_callback:
+            log_callback(
+                f"차트 렌더링 시간: {len(timings)}개, 합계 {sum(t for _, t in timings):.2f}초, "
+                f"경과 {elapsed:.2f}초\n"
+            )
+            for name, seconds in sorted(timings, key=lambda t: t[1], reverse=True):
+                log_callback(f"  - {name}: {seconds:.2f}초\n")
             log_callback(f"모든 차트가 {plots_dir}/ 폴더에 저장되었습니다.\n")
 
-        return True
+        return failed == 0
 
     except Exception as e:
         if log_callback:
@@ -1633,23 +2848,531 @@ def parse_folder_path(path):
     return result
 
 
+# --carrier/--network 등 탐색 필터로 지정할 수 있는 폴더 구성요소 (parse_folder_path 키)
+FILTER_COMPONENTS = ("city", "area", "region", "carrier", "network", "game", "device")
+
+
+def _folder_date(value):
+    """argparse type: a YYYYMMDD date string as used by the date folders."""
+    try:
+        datetime.strptime(value, "%Y%m%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"YYYYMMDD 형식이 아닙니다: {value}")
+    if len(value) != 8:
+        raise argparse.ArgumentTypeError(f"YYYYMMDD 형식이 아닙니다: {value}")
+    return value
+
+
+def _shard_spec(value):
+    """argparse type: an "i/N" shard spec."""
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def _comma_list(value):
+    """argparse type: a comma-separated list of folder names."""
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+# query 서브커맨드의 --metrics 별칭 (평균 옵션과 같은 이름)
+QUERY_METRIC_ALIASES = {"bw": "bandwidth"}
+
+QUERY_FORMATS = ("table", "csv", "json")
+
+
+def query_stats(selection, group_by=(), metrics=METRICS, exclude_mode=None):
+    """Return result rows (dicts) of a warehouse query with report-style averages.
+
+    selection(WarehouseSelection)의 레코드를 group_by 기준으로 묶고, 그룹의 모든
+    유효값으로 리포트와 같은 제외 방식(exclude_mode)의 평균과 count/min/max를
+    계산합니다. 값이 없으면 None이며 소수점 둘째 자리로 반올림합니다.
+    """
+    modes = metric_modes(exclude_mode)
+
+    def rounded(value):
+        return None if value is None or math.isnan(value) else round(value, 2)
+
+    rows = []
+    for stats in selection.group_stats(group_by, metrics):
+        row = {key: stats[key] for key in group_by}
+        row["files"] = stats["files"]
+        for metric in metrics:
+            count = stats[f"{metric}_count"]
+            sums = {trim: stats[f"{metric}_sum_{trim}"] for trim in TRIM_MODES}
+            row[f"{metric}_avg"] = rounded(select_mean(count, sums, modes[metric]))
+            row[f"{metric}_count"] = count
+            row[f"{metric}_min"] = rounded(stats[f"{metric}_min"])
+            row[f"{metric}_max"] = rounded(stats[f"{metric}_max"])
+        rows.append(row)
+    return rows
+
+
+def format_query_rows(rows, columns, output_format="table"):
+    """Format query rows as an aligned text table, CSV or JSON string."""
+    if output_format == "json":
+        return json.dumps(rows, ensure_ascii=False, indent=2) + "\n"
+    if output_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+        return buffer.getvalue()
+
+    def cell(value):
+        if value is None:
+            return "-"
+        return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+    def width(text):
+        # 한글 등 전각 문자는 두 칸으로 계산
+        return sum(2 if unicodedata.east_asian_width(c) in "WF" else 1 for c in text)
+
+    cells = [[cell(row.get(column)) for column in columns] for row in rows]
+    widths = [
+        max([width(column)] + [width(line[i]) for line in cells])
+        for i, column in enumerate(columns)
+    ]
+    lines = []
+    for line in [columns, ["-" * w for w in widths], *cells]:
+        lines.append(
+            "  ".join(
+                text + " " * (w - width(text)) for text, w in zip(line, widths)
+            ).rstrip()
+        )
+    if not rows:
+        lines.append("(결과 없음)")
+    return "\n".join(lines) + "\n"
+
+
+def query_main(argv=None):
+    """`main.py query`: answer filter/group-by questions from the metrics warehouse.
+
+    이전 실행에서 저장한 메트릭 저장소만 읽으며 PDF는 열지 않습니다.
+    결과는 표준 출력(또는 --output)에, 진행 메시지는 표준 오류에 씁니다.
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py query",
+        description="Query the records accumulated in the metrics warehouse "
+        "(PDFs are not opened)",
+    )
+    parser.add_argument(
+        "--folder",
+        help="PDF root folder: use its metrics warehouse and only its records "
+        "(default: last folder)",
+    )
+    parser.add_argument(
+        "--warehouse", help="Path of the metrics warehouse database to query"
+    )
+    parser.add_argument(
+        "--since",
+        type=_folder_date,
+        default=None,
+        help="Only date folders on or after YYYYMMDD",
+    )
+    parser.add_argument(
+        "--until",
+        type=_folder_date,
+        default=None,
+        help="Only date folders on or before YYYYMMDD",
+    )
+    for component in FILTER_COMPONENTS:
+        parser.add_argument(
+            f"--{component}",
+            type=_comma_list,
+            default=None,
+            help=f"Only these {component} values (comma-separated)",
+        )
+    parser.add_argument(
+        "--group-by",
+        type=_comma_list,
+        default=[],
+        help=f"Comma-separated columns to group by ({', '.join(GROUP_KEYS)})",
+    )
+    parser.add_argument(
+        "--metrics",
+        type=_comma_list,
+        default=None,
+        help="Comma-separated metrics (fps, bw, rtt, playtime; default: all)",
+    )
+    for key in ("fps", "bw", "rtt"):
+        parser.add_argument(
+            f"--{key}-avg",
+            choices=TRIM_MODES,
+            default="minmax",
+            help=f"Values excluded from the {key} average (default: %(default)s)",
+        )
+    parser.add_argument("--format", choices=QUERY_FORMATS, default="table")
+    parser.add_argument("--output", help="Write the result to this file")
+    args = parser.parse_args(argv)
+
+    def log(message):
+        print(message, end="", file=sys.stderr)
+
+    unknown = [key for key in args.group_by if key not in GROUP_KEYS]
+    if unknown:
+        parser.error(f"지원하지 않는 그룹 기준입니다: {', '.join(unknown)}")
+    metrics = [
+        QUERY_METRIC_ALIASES.get(metric, metric) for metric in (args.metrics or METRICS)
+    ]
+    unknown = [metric for metric in metrics if metric not in METRICS]
+    if unknown:
+        parser.error(f"지원하지 않는 메트릭입니다: {', '.join(unknown)}")
+
+    folder = args.folder
+    if not folder and not args.warehouse:
+        folder, _ = get_last_folder()
+        if not folder:
+            parser.error("--folder 또는 --warehouse를 지정해주세요.")
+    path = args.warehouse or warehouse_path(
+        os.path.join(os.path.dirname(os.path.abspath(folder)), "reports")
+    )
+    if not os.path.exists(path):
+        log(f"메트릭 저장소를 찾을 수 없습니다: {path}\n")
+        return 1
+
+    started = time.perf_counter()
+    folder_filter = FolderFilter(
+        parse_folder_path,
+        since=args.since,
+        until=args.until,
+        **{component: getattr(args, component) for component in FILTER_COMPONENTS},
+    )
+    selection = MetricsWarehouse(path).select(folder, folder_filter)
+    try:
+        rows = query_stats(
+            selection,
+            args.group_by,
+            metrics,
+            {"fps": args.fps_avg, "bw": args.bw_avg, "rtt": args.rtt_avg},
+        )
+    except Exception as e:
+        log(f"메트릭 저장소 조회 중 오류 발생: {e}\n")
+        return 1
+    if folder and "folder" in args.group_by:
+        root_abs = os.path.abspath(folder)
+        for row in rows:
+            row["folder"] = os.path.relpath(row["folder"], root_abs)
+
+    columns = [*args.group_by, "files"]
+    for metric in metrics:
+        columns += [f"{metric}_{name}" for name in ("avg", "count", "min", "max")]
+    output = format_query_rows(rows, columns, args.format)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            f.write(output)
+        log(f"결과 저장됨: {os.path.abspath(args.output)}\n")
+    else:
+        sys.stdout.write(output)
+    log(f"조회 완료: {len(rows)}개 행 ({time.perf_counter() - started:.2f}초)\n")
+    return 0
+
+
+def preload_stage_modules():
+    """Import every lazily loaded stage module now (import cost is excluded from stages)."""
+    for _, module in LAZY_STAGE_MODULES:
+        importlib.import_module(module)
+
+
+def profile_startup(log_callback, budget_ms=STARTUP_IMPORT_BUDGET_MS):
+    """Print per-module import cost of main.py and of each lazily loaded stage.
+
+    새 인터프리터를 `-X importtime`으로 실행해 측정하므로 이미 로드된 모듈의 영향을
+    받지 않습니다. main import 시간이 budget_ms 이하이면 True를 반환합니다.
+    """
+    import subprocess
+
+    if getattr(sys, "frozen", False):
+        log_callback("실행 파일 환경에서는 시작 프로파일을 지원하지 않습니다.\n")
+        return True
+
+    script = "import main\n" + "".join(
+        f"import {module}\n" for _, module in LAZY_STAGE_MODULES
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        log_callback(f"시작 프로파일 실행 중 오류 발생:\n{result.stderr}\n")
+        return False
+
+    # "import time: self [us] | cumulative | imported package" 형식 파싱
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # 헤더 줄
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        entries.append((depth, name.strip(), int(cumulative) / 1000))
+
+    # 자식 모듈이 부모보다 먼저 출력되므로 깊이 1인 항목은 다음 최상위 항목에 속함
+    top_level = []
+    children = []
+    for depth, name, ms in entries:
+        if depth == 1:
+            children.append((name, ms))
+        elif depth == 0:
+            top_level.append((name, ms, children))
+            children = []
+
+    root_of = {module.split(".")[0]: label for label, module in LAZY_STAGE_MODULES}
+    main_ms = 0.0
+    stage_ms = {}
+    for name, ms, direct in top_level:
+        if name == "main":
+            main_ms = ms
+            log_callback(f"시작 비용 (import main): {ms:.1f}ms\n")
+            for child, child_ms in sorted(direct, key=lambda c: c[1], reverse=True):
+                if child_ms >= 1:
+                    log_callback(f"  - {child}: {child_ms:.1f}ms\n")
+        elif name.split(".")[0] in root_of:
+            label = root_of[name.split(".")[0]]
+            stage_ms[label] = stage_ms.get(label, 0.0) + ms
+
+    log_callback("\n필요할 때 로드되는 단계별 모듈 (앞 단계에서 로드된 모듈 제외):\n")
+    for label, module in LAZY_STAGE_MODULES:
+        log_callback(f"  - {label} ({module}): {stage_ms.get(label, 0.0):.1f}ms\n")
+
+    within = main_ms <= budget_ms
+    status = "예산 이내" if within else "예산 초과"
+    log_callback(f"\n시작 비용 {main_ms:.1f}ms / 예산 {budget_ms}ms: {status}\n")
+    return within
+
+
 def main():
     """Main function to process PDF files and generate folder-based report."""
+    if len(sys.argv) > 1 and sys.argv[1] == "query":
+        sys.exit(query_main(sys.argv[2:]))
+
+    # main.py merge: 같은 리포트 옵션으로 --shard 결과를 병합해 리포트 생성
+    argv = sys.argv[1:]
+    merge = bool(argv) and argv[0] == "merge"
+    if merge:
+        argv = argv[1:]
     parser = argparse.ArgumentParser(
-        description="Process PDF files and generate reports"
+        prog="main.py merge" if merge else None,
+        description=(
+            "Merge --shard results and generate reports"
+            if merge
+            else "Process PDF files and generate reports"
+        ),
+        epilog="Use 'main.py query --help' to query previously parsed results "
+        "and 'main.py merge --help' to combine --shard runs.",
     )
+    if merge:
+        parser.add_argument(
+            "shard_files",
+            nargs="*",
+            metavar="SHARD_FILE",
+            help="Shard result files (default: all files in reports/shards)",
+        )
     parser.add_argument("--excel", action="store_true", help="Generate Excel reports")
     parser.add_argument(
         "--plots", action="store_true", help="Generate performance plots"
     )
     parser.add_argument("--folder", help="Specify folder path directly")
-    args = parser.parse_args()
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for PDF extraction (0 = all CPU cores)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the extraction and chart caches",
+    )
+    parser.add_argument(
+        "--rebuild-cache",
+        action="store_true",
+        help="Ignore the existing extraction and chart caches and rebuild them",
+    )
+    parser.add_argument(
+        "--extract-mode",
+        choices=["full", "incremental"],
+        default="full",
+        help="incremental: stop reading pages once all metrics are found",
+    )
+    parser.add_argument(
+        "--parser-engine",
+        choices=["scanner", "legacy", "compare"],
+        default="scanner",
+        help="Metric parser engine (compare: run both and log differences)",
+    )
+    parser.add_argument(
+        "--match-window",
+        type=int,
+        default=None,
+        help="Limit fallback patterns to N characters after their keyword",
+    )
+    parser.add_argument(
+        "--parse-time-budget",
+        type=float,
+        default=None,
+        help="Per-file parse time budget in seconds",
+    )
+    parser.add_argument(
+        "--walk-jobs",
+        type=int,
+        default=1,
+        help="Threads for walking top-level (date) folders, e.g. on network shares",
+    )
+    parser.add_argument(
+        "--since",
+        type=_folder_date,
+        default=None,
+        help="Only process date folders on or after YYYYMMDD",
+    )
+    parser.add_argument(
+        "--until",
+        type=_folder_date,
+        default=None,
+        help="Only process date folders on or before YYYYMMDD",
+    )
+    for component in FILTER_COMPONENTS:
+        parser.add_argument(
+            f"--{component}",
+            type=_comma_list,
+            default=None,
+            help=f"Only process these {component} folders (comma-separated)",
+        )
+    parser.add_argument(
+        "--shard",
+        type=_shard_spec,
+        default=None,
+        metavar="I/N",
+        help="Process only the date folders of shard I of N and write a partial "
+        "result file for 'main.py merge'",
+    )
+    parser.add_argument(
+        "--duplicates",
+        choices=DUPLICATE_MODES,
+        default="count",
+        help="PDFs with identical contents are extracted once; count their copies "
+        "in folder averages or ignore them (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume an interrupted run: reuse the records journaled before the "
+        "interruption and extract only the remaining PDFs",
+    )
+    parser.add_argument(
+        "--file-timeout",
+        type=float,
+        default=None,
+        help="Skip a PDF (and restart the workers) if it runs longer than N seconds "
+        "after it starts; other files in progress are then processed again",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=int,
+        default=None,
+        help="Per-worker memory cap in MB; larger files are skipped (Unix only)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep watching the folder and update reports when PDFs are added/changed",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help="Seconds between folder scans in --watch mode (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--watch-debounce",
+        type=float,
+        default=DEFAULT_DEBOUNCE,
+        help="Quiet seconds after the last change before updating (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--from-snapshot",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help="Build reports from the last run's record snapshot instead of the PDFs",
+    )
+    parser.add_argument(
+        "--no-warehouse",
+        action="store_true",
+        help="Do not save parsed records to the SQLite metrics warehouse",
+    )
+    parser.add_argument(
+        "--from-warehouse",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help="Build reports from the records accumulated in the metrics warehouse",
+    )
+    parser.add_argument(
+        "--plot-dpi",
+        type=int,
+        default=300,
+        help="Resolution of generated plots (default: 300)",
+    )
+    parser.add_argument(
+        "--plot-format",
+        choices=list(CHART_FORMATS),
+        default="png",
+        help="Image format of generated plots (default: png)",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print per-module import cost and check the cold start budget",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record per-stage wall/CPU time and write a profile_<timestamp>.json",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        help="Number of slowest files / allocation sites listed (default: 10)",
+    )
+    parser.add_argument(
+        "--memprofile",
+        action="store_true",
+        help="Track peak/retained memory and top allocation sites per stage",
+    )
+    args = parser.parse_args(argv)
+    if (args.shard or merge) and (
+        args.watch or args.from_snapshot is not None or args.from_warehouse is not None
+    ):
+        parser.error(
+            "--shard/merge는 --watch, --from-snapshot, --from-warehouse와 "
+            "함께 사용할 수 없습니다."
+        )
+    if args.shard and merge:
+        parser.error("merge에는 --shard를 지정할 수 없습니다.")
+    if args.resume and (
+        merge or args.from_snapshot is not None or args.from_warehouse is not None
+    ):
+        parser.error(
+            "--resume은 merge, --from-snapshot, --from-warehouse와 "
+            "함께 사용할 수 없습니다."
+        )
 
     def console_log(message):
         """Print log messages to console."""
         print(message, end="")
         sys.stdout.flush()
 
+    if args.profile_startup:
+        sys.exit(0 if profile_startup(console_log) else 1)
+
     try:
         # 폴더 경로가 지정된 경우에만 처리
         if not args.folder:
@@ -1666,24 +3389,126 @@ def main():
         os.makedirs(plots_dir, exist_ok=True)
         console_log(f"생성된 디렉토리:\n- {reports_dir}\n- {plots_dir}\n")
 
-        # Process PDF files
-        console_log("\nPDF 파일 처리 시작...\n")
-        folder_data = process_pdf_files(folder_path, log_callback=console_log)
+        profiler = None
+        if args.memprofile:
+            # 모듈 import 메모리가 처음 사용하는 단계에 잡히지 않도록 미리 불러옴
+            preload_stage_modules()
+        if args.profile or args.memprofile:
+            profiler = StageProfiler(
+                top_n=args.profile_top, track_memory=args.memprofile
+            )
+            profiler.meta.update(
+                {
+                    "parser_version": PARSER_VERSION,
+                    "jobs": args.jobs,
+                    "cache": not args.no_cache and not args.rebuild_cache,
+                    "extract_mode": args.extract_mode,
+                    "parser_engine": args.parser_engine,
+                    "excel": args.excel,
+                    "plots": args.plots,
+                }
+            )
 
-        if folder_data:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # 최초 처리와 감시 모드의 변경 파일 처리에 같은 옵션을 사용
+        processing_options = {
+            "jobs": args.jobs,
+            "use_cache": not args.no_cache,
+            "rebuild_cache": args.rebuild_cache,
+            "extract_mode": args.extract_mode,
+            "parser_engine": args.parser_engine,
+            "match_window": args.match_window,
+            "parse_time_budget": args.parse_time_budget,
+            "file_timeout": args.file_timeout,
+            "memory_limit_mb": args.memory_limit,
+            # 샤드 결과는 merge에서 저장소/스냅샷에 저장
+            "use_warehouse": not args.no_warehouse and not args.shard,
+            "duplicate_mode": args.duplicates,
+        }
+        folder_filter = FolderFilter(
+            parse_folder_path,
+            since=args.since,
+            until=args.until,
+            shard=args.shard,
+            **{component: getattr(args, component) for component in FILTER_COMPONENTS},
+        )
+
+        if merge:
+            console_log("\n샤드 결과 병합...\n")
+            shard_files = args.shard_files or find_shard_files(reports_dir)
+            with timed_stage(profiler, "merge"):
+                folder_data = merge_shard_files(
+                    shard_files,
+                    folder_path,
+                    console_log,
+                    use_warehouse=not args.no_warehouse,
+                )
+            if folder_data and profiler is not None:
+                folder_data["_config"]["profiler"] = profiler
+        elif args.from_snapshot is not None:
+            # PDF를 다시 추출하지 않고 마지막 실행의 레코드 스냅샷으로 리포트 생성
+            console_log("\n레코드 스냅샷에서 리포트 생성...\n")
+            with timed_stage(profiler, "snapshot"):
+                folder_data = load_record_snapshot(
+                    args.from_snapshot or record_snapshot_path(folder_path),
+                    console_log,
+                )
+            if folder_data and profiler is not None:
+                folder_data["_config"]["profiler"] = profiler
+        elif args.from_warehouse is not None:
+            # 실행마다 누적된 메트릭 저장소에서 SQL 집계로 리포트 생성
+            console_log("\n메트릭 저장소에서 리포트 생성...\n")
+            folder_data = load_warehouse_folder_data(
+                folder_path, args.from_warehouse, folder_filter, console_log
+            )
+            if folder_data and profiler is not None:
+                folder_data["_config"]["profiler"] = profiler
+        else:
+            # Process PDF files
+            console_log("\nPDF 파일 처리 시작...\n")
+            folder_data = process_pdf_files(
+                folder_path,
+                log_callback=console_log,
+                profiler=profiler,
+                walk_jobs=args.walk_jobs,
+                folder_filter=folder_filter,
+                snapshot=not args.shard,
+                resume=args.resume,
+                **processing_options,
+            )
 
+        if folder_data and args.shard:
+            # 샤드는 부분 결과만 저장하고 리포트는 merge에서 생성
+            if save_shard_results(folder_data, args.shard, console_log):
+                console_log(
+                    "\n모든 샤드가 끝나면 'python main.py merge --folder "
+                    f"{folder_path}'로 리포트를 생성하세요.\n"
+                )
+                return
+            sys.exit(1)
+
+        def write_reports(timestamp, affected=None):
+            """Write the markdown/HTML (and requested Excel/plot) reports.
+
+            affected(감시 모드 갱신)가 주어지면 고정 파일명 리포트만 덮어쓰고, Excel과
+            차트는 같은 timestamp의 파일을 바뀐 폴더 기준으로 갱신합니다.
+            """
             # Generate markdown and HTML reports
             console_log("\n마크다운 및 HTML 리포트 생성 중...\n")
             fixed_md, timestamped_md, fixed_html, timestamped_html = (
-                generate_folder_report(folder_data, log_callback=console_log)
+                generate_folder_report(
+                    folder_data, log_callback=console_log, timestamped=affected is None
+                )
             )
 
             # Generate Excel reports if requested
             if args.excel:
                 console_log("\nExcel 리포트 생성 중...\n")
                 details_excel, averages_excel = export_to_excel(
-                    folder_data, reports_dir, timestamp, log_callback=console_log
+                    folder_data,
+                    reports_dir,
+                    timestamp,
+                    log_callback=console_log,
+                    affected=affected,
                 )
                 if details_excel and averages_excel:
                     console_log(f"\nExcel 리포트 생성됨:\n")
@@ -1696,14 +3521,27 @@ def main():
             if args.plots:
                 console_log("\n성능 차트 생성 중...\n")
                 plots_success = generate_performance_plots(
-                    folder_data, timestamp, log_callback=console_log
+                    folder_data,
+                    timestamp,
+                    log_callback=console_log,
+                    reports_dir=reports_dir,
+                    dpi=args.plot_dpi,
+                    image_format=args.plot_format,
+                    jobs=args.jobs,
+                    use_cache=not args.no_cache,
+                    rebuild_cache=processing_options["rebuild_cache"],
+                    affected=affected,
                 )
                 if plots_success:
                     console_log(f"\n성능 차트가 {plots_dir} 폴더에 저장되었습니다.\n")
                 else:
                     console_log("\n성능 차트 생성 실패.\n")
 
-            if fixed_md and timestamped_md and fixed_html and timestamped_html:
+            if affected is not None and fixed_md and fixed_html:
+                console_log(f"\n갱신된 리포트:\n")
+                console_log(f"1. 마크다운 리포트: {os.path.abspath(fixed_md)}\n")
+                console_log(f"2. HTML 리포트: {os.path.abspath(fixed_html)}\n")
+            elif fixed_md and timestamped_md and fixed_html and timestamped_html:
                 console_log(f"\n생성된 리포트:\n")
                 console_log(
                     f"1. 고정 파일명 마크다운 리포트: {os.path.abspath(fixed_md)}\n"
@@ -1719,6 +3557,47 @@ def main():
                 )
             else:
                 console_log("\n리포트 생성 실패.\n")
+
+        if folder_data:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            write_reports(timestamp)
+
+            if profiler is not None:
+                profiler.stop()
+                summary = profiler.summary()
+                for line in profiler.format_summary(summary):
+                    console_log(line)
+                try:
+                    profile_path = profiler.write_json(
+                        profile_filename(
+                            folder_data["_config"].get("reports_dir", reports_dir),
+                            timestamp,
+                        ),
+                        summary,
+                    )
+                    console_log(f"프로파일 저장됨: {os.path.abspath(profile_path)}\n")
+                except OSError as e:
+                    console_log(f"프로파일 저장 중 오류 발생: {e}\n")
+
+            if args.watch:
+                # 감시 중에는 변경된 파일만 처리하며, 리포트는 새 사본을 만들지 않고
+                # 처음 실행의 파일(같은 timestamp)을 바뀐 폴더 기준으로 갱신
+                processing_options["rebuild_cache"] = False
+
+                def on_update(affected):
+                    console_log("\n변경 사항으로 리포트 갱신 중...\n")
+                    write_reports(timestamp, affected)
+
+                watch_pdf_files(
+                    folder_data,
+                    on_update,
+                    log_callback=console_log,
+                    interval=args.watch_interval,
+                    debounce=args.watch_debounce,
+                    walk_jobs=args.walk_jobs,
+                    folder_filter=folder_filter,
+                    **processing_options,
+                )
         else:
             console_log("\n데이터 처리 실패. 리포트가 생성되지 않았습니다.\n")
 
@@ -1728,4 +3607,7 @@ def main():
 
 
 if __name__ == "__main__":
+    import multiprocessing
+
+    multiprocessing.freeze_support()
     main()
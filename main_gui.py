@@ -1,5 +1,6 @@
 import sys
 import os
+import multiprocessing
 from datetime import datetime
 from PySide6.QtWidgets import (
     QApplication,
@@ -17,6 +18,7 @@ from PySide6.QtWidgets import (
     QFileDialog,
     QLineEdit,
     QComboBox,
+    QSpinBox,
 )
 from PySide6.QtCore import Qt, QThread, Signal
 from main import (
@@ -26,7 +28,12 @@ from main import (
     generate_performance_plots,
     get_last_folder,
     save_last_folder,
+    watch_pdf_files,
+    load_record_snapshot,
+    record_snapshot_path,
+    has_resumable_run,
 )
+from profiling import StageProfiler, profile_filename
 
 
 class ProcessorThread(QThread):
@@ -35,15 +42,95 @@ class ProcessorThread(QThread):
     progress = Signal(str)
     log = Signal(str)
     progress_count = Signal(int, int)  # (current, total)
-
-    def __init__(self, excel_enabled, plots_enabled, root_dir=".", avg_mode=None):
+    profile_ready = Signal(list)  # 단계별 실행 시간 요약 (로그 줄 목록)
+
+    def __init__(
+        self,
+        excel_enabled,
+        plots_enabled,
+        root_dir=".",
+        avg_mode=None,
+        jobs=1,
+        profile_enabled=False,
+        file_timeout=None,
+        memory_limit_mb=None,
+        watch_enabled=False,
+        from_snapshot=False,
+        resume=False,
+        duplicate_mode="count",
+    ):
         super().__init__()
         self.excel_enabled = excel_enabled
         self.plots_enabled = plots_enabled
         self.root_dir = root_dir
         self.avg_mode = avg_mode or {"fps": "minmax", "bw": "minmax", "rtt": "minmax"}
+        self.jobs = jobs
+        self.profile_enabled = profile_enabled
+        # 파일당 처리 제한 (None/0이면 제한 없음)
+        self.file_timeout = file_timeout
+        self.memory_limit_mb = memory_limit_mb
+        # 처리 후 폴더를 감시하며 리포트 갱신 (requestInterruption()으로 중지)
+        self.watch_enabled = watch_enabled
+        # PDF를 다시 처리하지 않고 마지막 실행의 레코드 스냅샷으로 리포트만 생성
+        self.from_snapshot = from_snapshot
+        # 중단된 이전 실행의 저널에 있는 파일은 다시 추출하지 않음
+        self.resume = resume
+        self.duplicate_mode = duplicate_mode
+
+    def generate_reports(self, folder_data, reports_dir, timestamp=None, affected=None):
+        """Generate the enabled reports; return (timestamp, generated report types).
+
+        감시 모드 갱신(affected: 바뀐 폴더 집합)에서는 처음 실행의 timestamp를 그대로 받아
+        고정 파일명 리포트와 같은 Excel/차트 파일을 바뀐 폴더 기준으로 갱신합니다.
+        """
+        if timestamp is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        reports_generated = []
+
+        # 마크다운 및 HTML 리포트 생성
+        self.progress.emit("마크다운 및 HTML 리포트 생성 중...")
+        fixed_md, timestamped_md, fixed_html, timestamped_html = generate_folder_report(
+            folder_data,
+            log_callback=self.log.emit,
+            exclude_mode=self.avg_mode,
+            timestamped=affected is None,
+        )
+        if fixed_md:
+            reports_generated.append("마크다운/HTML 리포트")
+
+        # Excel 리포트 생성
+        if self.excel_enabled:
+            self.progress.emit("Excel 리포트 생성 중...")
+            details_excel, averages_excel = export_to_excel(
+                folder_data,
+                reports_dir=reports_dir,
+                timestamp=timestamp,
+                log_callback=self.log.emit,
+                exclude_mode=self.avg_mode,
+                affected=affected,
+            )
+            if details_excel:
+                reports_generated.append("Excel 리포트")
+
+        # 성능 차트 생성
+        if self.plots_enabled:
+            self.progress.emit("성능 차트 생성 중...")
+            generate_performance_plots(
+                folder_data,
+                reports_dir=reports_dir,
+                timestamp=timestamp,
+                log_callback=self.log.emit,
+                jobs=self.jobs,
+                affected=affected,
+            )
+            reports_generated.append("성능 차트")
+
+        return timestamp, reports_generated
 
     def run(self):
+        if self.from_snapshot:
+            self.run_from_snapshot()
+            return
         try:
             # PDF 파일 처리
             self.progress.emit("PDF 파일 처리 중...")
@@ -51,10 +138,24 @@ class ProcessorThread(QThread):
             def progress_callback(current, total):
                 self.progress_count.emit(current, total)
 
+            profiler = None
+            if self.profile_enabled:
+                profiler = StageProfiler()
+                profiler.meta.update(
+                    {"jobs": self.jobs, "excel": self.excel_enabled, "gui": True}
+                )
+
             folder_data = process_pdf_files(
                 self.root_dir,
                 log_callback=self.log.emit,
                 progress_callback=progress_callback,
+                jobs=self.jobs,
+                profiler=profiler,
+                file_timeout=self.file_timeout or None,
+                memory_limit_mb=self.memory_limit_mb or None,
+                use_warehouse=True,
+                resume=self.resume,
+                duplicate_mode=self.duplicate_mode,
             )
 
             if not folder_data:
@@ -67,43 +168,68 @@ class ProcessorThread(QThread):
                 self.error.emit("리포트 디렉토리 정보를 찾을 수 없습니다.")
                 return
 
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            reports_generated = []
+            timestamp, reports_generated = self.generate_reports(
+                folder_data, reports_dir
+            )
 
-            # 마크다운 및 HTML 리포트 생성
-            self.progress.emit("마크다운 및 HTML 리포트 생성 중...")
-            fixed_md, timestamped_md, fixed_html, timestamped_html = (
-                generate_folder_report(
-                    folder_data, log_callback=self.log.emit, exclude_mode=self.avg_mode
+            if profiler is not None:
+                summary = profiler.summary()
+                lines = profiler.format_summary(summary)
+                try:
+                    profile_path = profiler.write_json(
+                        profile_filename(reports_dir, timestamp), summary
+                    )
+                    lines.append(f"프로파일 저장됨: {profile_path}\n")
+                except OSError as e:
+                    lines.append(f"프로파일 저장 중 오류 발생: {e}\n")
+                self.profile_ready.emit(lines)
+
+            if self.watch_enabled:
+                self.progress.emit(
+                    "폴더 감시 중... (새 PDF가 추가되면 리포트를 갱신합니다)"
                 )
-            )
-            if fixed_md:
-                reports_generated.append("마크다운/HTML 리포트")
 
-            # Excel 리포트 생성
-            if self.excel_enabled:
-                self.progress.emit("Excel 리포트 생성 중...")
-                details_excel, averages_excel = export_to_excel(
+                def on_update(affected):
+                    self.generate_reports(folder_data, reports_dir, timestamp, affected)
+                    self.progress.emit(
+                        f"폴더 감시 중... (마지막 갱신: {datetime.now():%H:%M:%S})"
+                    )
+
+                watch_pdf_files(
                     folder_data,
-                    reports_dir=reports_dir,
-                    timestamp=timestamp,
+                    on_update,
                     log_callback=self.log.emit,
-                    exclude_mode=self.avg_mode,
+                    should_stop=self.isInterruptionRequested,
+                    jobs=self.jobs,
+                    file_timeout=self.file_timeout or None,
+                    memory_limit_mb=self.memory_limit_mb or None,
+                    duplicate_mode=self.duplicate_mode,
                 )
-                if details_excel:
-                    reports_generated.append("Excel 리포트")
 
-            # 성능 차트 생성
-            if self.plots_enabled:
-                self.progress.emit("성능 차트 생성 중...")
-                generate_performance_plots(
-                    folder_data,
-                    reports_dir=reports_dir,
-                    timestamp=timestamp,
-                    log_callback=self.log.emit,
+            self.finished.emit((True, reports_generated, reports_dir))
+
+        except Exception as e:
+            self.error.emit(str(e))
+
+    def run_from_snapshot(self):
+        try:
+            self.progress.emit("레코드 스냅샷 불러오는 중...")
+            folder_data = load_record_snapshot(
+                record_snapshot_path(self.root_dir), log_callback=self.log.emit
+            )
+            if not folder_data:
+                self.error.emit(
+                    "레코드 스냅샷을 찾을 수 없습니다. 먼저 리포트를 생성해주세요."
                 )
-                reports_generated.append("성능 차트")
+                return
 
+            reports_dir = folder_data["_config"].get("reports_dir")
+            if not reports_dir:
+                self.error.emit("리포트 디렉토리 정보를 찾을 수 없습니다.")
+                return
+            os.makedirs(reports_dir, exist_ok=True)
+
+            _, reports_generated = self.generate_reports(folder_data, reports_dir)
             self.finished.emit((True, reports_generated, reports_dir))
 
         except Exception as e:
@@ -178,6 +304,55 @@ class MainWindow(QMainWindow):
         options_layout.addWidget(QLabel("RTT 평균:"))
         options_layout.addWidget(self.rtt_avg_combo)
 
+        # 병렬 처리 프로세스 수
+        self.jobs_spin = QSpinBox()
+        self.jobs_spin.setRange(1, os.cpu_count() or 1)
+        self.jobs_spin.setValue(1)
+        options_layout.addWidget(QLabel("작업 프로세스:"))
+        options_layout.addWidget(self.jobs_spin)
+
+        # 파일당 처리 제한 (0 = 제한 없음)
+        self.timeout_spin = QSpinBox()
+        self.timeout_spin.setRange(0, 3600)
+        self.timeout_spin.setValue(0)
+        self.timeout_spin.setSuffix("초")
+        self.timeout_spin.setToolTip("PDF 한 개 처리 시간 제한 (0 = 제한 없음)")
+        options_layout.addWidget(QLabel("파일당 제한:"))
+        options_layout.addWidget(self.timeout_spin)
+
+        self.memory_spin = QSpinBox()
+        self.memory_spin.setRange(0, 65536)
+        self.memory_spin.setSingleStep(256)
+        self.memory_spin.setValue(0)
+        self.memory_spin.setSuffix("MB")
+        self.memory_spin.setToolTip("작업 프로세스당 메모리 제한 (0 = 제한 없음)")
+        options_layout.addWidget(QLabel("메모리 제한:"))
+        options_layout.addWidget(self.memory_spin)
+
+        # 내용이 같은 PDF 복사본 (한 번만 추출하고 평균 포함 여부 선택)
+        self.duplicates_combo = QComboBox()
+        self.duplicates_combo.addItem("평균 포함", "count")
+        self.duplicates_combo.addItem("평균 제외", "ignore")
+        self.duplicates_combo.setToolTip(
+            "여러 폴더에 복사된 같은 PDF는 한 번만 추출하고 리포트의 중복 PDF 섹션에 "
+            "표시합니다"
+        )
+        options_layout.addWidget(QLabel("중복 PDF:"))
+        options_layout.addWidget(self.duplicates_combo)
+
+        # 단계별 실행 시간 측정
+        self.profile_checkbox = QCheckBox("실행 시간 측정")
+        self.profile_checkbox.setChecked(False)
+        options_layout.addWidget(self.profile_checkbox)
+
+        # 처리 후 폴더 감시 (새 PDF만 처리해 리포트 갱신)
+        self.watch_checkbox = QCheckBox("폴더 감시")
+        self.watch_checkbox.setChecked(False)
+        self.watch_checkbox.setToolTip(
+            "처리 후 새로 추가되거나 수정된 PDF만 처리해 리포트를 자동으로 갱신합니다"
+        )
+        options_layout.addWidget(self.watch_checkbox)
+
         layout.addLayout(options_layout)
 
         # 마지막으로 선택한 폴더와 옵션 로드 (콤보박스 생성 이후에 해야 함)
@@ -212,6 +387,21 @@ class MainWindow(QMainWindow):
         )
         layout.addWidget(self.log_output)
 
+        # 실행 시간 패널 (실행 시간 측정을 켠 경우에만 표시)
+        self.timing_output = QTextEdit()
+        self.timing_output.setReadOnly(True)
+        self.timing_output.setMaximumHeight(160)
+        self.timing_output.setStyleSheet(
+            """
+            QTextEdit {
+                font-family: 'Courier New', monospace;
+                font-size: 12px;
+            }
+        """
+        )
+        self.timing_output.setVisible(False)
+        layout.addWidget(self.timing_output)
+
         # 진행 상태 표시줄
         self.progress_label = QLabel("대기 중...")
         layout.addWidget(self.progress_label)
@@ -225,6 +415,31 @@ class MainWindow(QMainWindow):
         self.start_button.clicked.connect(self.start_processing)
         layout.addWidget(self.start_button)
 
+        # 스냅샷으로 리포트 재생성 버튼 (평균 계산 방식 등 옵션만 바꿔 다시 만들 때)
+        self.regenerate_button = QPushButton("리포트 재생성 (스냅샷)")
+        self.regenerate_button.setToolTip(
+            "PDF를 다시 읽지 않고 마지막 실행에서 저장한 레코드 스냅샷으로 "
+            "리포트를 다시 생성합니다."
+        )
+        self.regenerate_button.clicked.connect(self.regenerate_reports)
+        layout.addWidget(self.regenerate_button)
+
+        # 중단된 실행 이어서 처리 버튼 (실행 저널이 남아 있을 때만 활성화)
+        self.resume_button = QPushButton("이전 실행 이어서 처리")
+        self.resume_button.setToolTip(
+            "프로그램 종료나 절전으로 중단된 마지막 실행에서 이미 처리한 PDF는 "
+            "건너뛰고 남은 파일만 처리합니다."
+        )
+        self.resume_button.clicked.connect(self.resume_processing)
+        layout.addWidget(self.resume_button)
+        self.update_resume_button()
+
+        # 감시 중지 버튼 (폴더 감시 중에만 표시)
+        self.stop_button = QPushButton("감시 중지")
+        self.stop_button.clicked.connect(self.stop_watching)
+        self.stop_button.setVisible(False)
+        layout.addWidget(self.stop_button)
+
         # 프로세서 스레드 초기화
         self.processor_thread = None
 
@@ -245,14 +460,24 @@ class MainWindow(QMainWindow):
                 "rtt": self.rtt_avg_combo.currentData(),
             }
             save_last_folder(folder, avg_mode)  # 선택한 폴더와 옵션 저장
+            self.update_resume_button()
+
+    def update_resume_button(self):
+        folder = self.folder_path.text()
+        self.resume_button.setEnabled(bool(folder) and has_resumable_run(folder))
 
-    def start_processing(self):
+    def start_processing(self, from_snapshot=False, resume=False):
         if not self.folder_path.text():
             QMessageBox.warning(self, "경고", "폴더를 선택해주세요.")
             return
+        watch_enabled = self.watch_checkbox.isChecked() and not from_snapshot
 
         self.start_button.setEnabled(False)
+        self.regenerate_button.setEnabled(False)
+        self.resume_button.setEnabled(False)
         self.log_output.clear()
+        self.timing_output.clear()
+        self.timing_output.setVisible(self.profile_checkbox.isChecked())
         self.progress_label.setText("처리 중...")
         self.progress_bar.setValue(0)
         self.progress_bar.setMaximum(0)  # Indeterminate until we know total
@@ -272,6 +497,14 @@ class MainWindow(QMainWindow):
             self.plots_checkbox.isChecked(),
             self.folder_path.text(),
             avg_mode,
+            self.jobs_spin.value(),
+            self.profile_checkbox.isChecked(),
+            self.timeout_spin.value(),
+            self.memory_spin.value(),
+            watch_enabled,
+            from_snapshot,
+            resume,
+            self.duplicates_combo.currentData(),
         )
 
         # 시그널 연결
@@ -280,9 +513,25 @@ class MainWindow(QMainWindow):
         self.processor_thread.finished.connect(self.handle_completion)
         self.processor_thread.log.connect(self.append_log)
         self.processor_thread.progress_count.connect(self.update_progress_count)
+        self.processor_thread.profile_ready.connect(self.show_timings)
 
         # 스레드 시작
         self.processor_thread.start()
+        if watch_enabled:
+            self.stop_button.setEnabled(True)
+            self.stop_button.setVisible(True)
+
+    def regenerate_reports(self):
+        self.start_processing(from_snapshot=True)
+
+    def resume_processing(self):
+        self.start_processing(resume=True)
+
+    def stop_watching(self):
+        if self.processor_thread is not None:
+            self.processor_thread.requestInterruption()
+        self.stop_button.setEnabled(False)
+        self.progress_label.setText("감시 종료 중...")
 
     def append_log(self, message):
         self.log_output.append(message)
@@ -290,6 +539,9 @@ class MainWindow(QMainWindow):
         scrollbar = self.log_output.verticalScrollBar()
         scrollbar.setValue(scrollbar.maximum())
 
+    def show_timings(self, lines):
+        self.timing_output.setPlainText("".join(lines).strip())
+
     def update_progress(self, message):
         self.progress_label.setText(message)
 
@@ -299,10 +551,22 @@ class MainWindow(QMainWindow):
             self, "오류", f"처리 중 오류가 발생했습니다:\n{error_message}"
         )
         self.start_button.setEnabled(True)
+        self.regenerate_button.setEnabled(True)
+        self.update_resume_button()
+        self.stop_button.setVisible(False)
 
     def handle_completion(self, result):
         success, reports, reports_dir = result
         self.start_button.setEnabled(True)
+        self.regenerate_button.setEnabled(True)
+        self.update_resume_button()
+        if self.progress_bar.maximum() == 0:
+            # 스냅샷 재생성처럼 파일 수를 알리지 않은 경우 진행 표시를 완료로 설정
+            self.progress_bar.setRange(0, 1)
+            self.progress_bar.setValue(1)
+        if self.stop_button.isVisible():
+            self.progress_label.setText("폴더 감시가 종료되었습니다.")
+            self.stop_button.setVisible(False)
 
         if success and reports:
             report_types = ", ".join(reports)
@@ -323,6 +587,7 @@ class MainWindow(QMainWindow):
 
 
 def main():
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     app.setStyle("Fusion")  # 모던한 스타일 적용
     window = MainWindow()
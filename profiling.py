@@ -0,0 +1,264 @@
+import os
+import sys
+import json
+import time
+import platform
+import functools
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+from discovery import file_stat
+
+# 사이드카 JSON 구조가 바뀌면 올립니다 (릴리스 간 비교 스크립트용).
+PROFILE_FORMAT_VERSION = 1
+
+DEFAULT_TOP_FILES = 10
+
+# 메모리 프로파일에서 제외할 할당 위치 (tracemalloc/프로파일러 자체와 import 시스템)
+_MEMORY_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+# _process_single_pdf가 파일마다 기록하는 시간 항목 (초)
+_FILE_TIMING_KEYS = ("extract_wall", "extract_cpu", "parse_wall", "parse_cpu")
+
+
+def cpu_time():
+    """현재 프로세스와 종료된 자식 프로세스(풀 워커)의 CPU 시간 합계 (초)."""
+    times = os.times()
+    return time.process_time() + times.children_user + times.children_system
+
+
+class StageProfiler:
+    """파이프라인 단계별 경과(wall)/CPU 시간과 파일별 추출/파싱 시간을 기록합니다.
+
+    단계는 중첩될 수 있으며, 바깥 단계에는 안쪽 단계를 뺀 시간만 기록되므로
+    단계 시간의 합이 전체 실행 시간을 넘지 않습니다.
+    track_memory가 켜져 있으면 tracemalloc으로 단계별 최대(peak) 메모리, 단계가 끝난
+    뒤 남아 있는(retained) 메모리와 단계 동안 늘어난 상위 할당 위치도 기록합니다.
+    최대 메모리는 안쪽 단계를 포함하며, 프로세스 풀 워커의 메모리는 포함되지 않습니다.
+    """
+
+    def __init__(self, top_n=DEFAULT_TOP_FILES, track_memory=False):
+        self.top_n = top_n
+        self.track_memory = track_memory
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.stages = {}
+        self.files = {}
+        self.cached = 0
+        self.meta = {}
+        self._stack = []
+        self._memory_overhead = 0
+        self._started = time.perf_counter()
+        self._created = datetime.now().isoformat(timespec="seconds")
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as stage `name` (repeated calls accumulate)."""
+        enter_wall, enter_cpu = time.perf_counter(), cpu_time()
+        # [안쪽 단계 경과, 안쪽 단계 CPU, 최대 메모리, 시작 시점 할당 크기, 기준 정보 크기]
+        frame = [0.0, 0.0, 0, None, 0]
+        if self.track_memory:
+            if self._stack:
+                # reset_peak 전에 바깥 단계의 최대값을 보관
+                parent = self._stack[-1]
+                parent[2] = max(parent[2], tracemalloc.get_traced_memory()[1])
+            before = tracemalloc.get_traced_memory()[0]
+            frame[3] = self._allocation_sizes()
+            # 비교 기준으로 보관하는 dict도 추적되므로 보고 값에서 뺌
+            frame[4] = max(tracemalloc.get_traced_memory()[0] - before, 0)
+            self._memory_overhead += frame[4]
+            tracemalloc.reset_peak()
+        self._stack.append(frame)
+        wall_start, cpu_start = time.perf_counter(), cpu_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = cpu_time() - cpu_start
+            self._stack.pop()
+            entry = self.stages.setdefault(name, {"calls": 0, "wall": 0.0, "cpu": 0.0})
+            entry["calls"] += 1
+            entry["wall"] += wall - frame[0]
+            entry["cpu"] += cpu - frame[1]
+            if self.track_memory:
+                retained, peak = tracemalloc.get_traced_memory()
+                peak = max(frame[2], peak)
+                entry["peak_mb"] = max(
+                    entry.get("peak_mb", 0.0),
+                    (peak - self._memory_overhead) / 1e6,
+                )
+                entry["retained_mb"] = (retained - self._memory_overhead) / 1e6
+                entry["top_allocations"] = self._top_growth(frame[3])
+                self._memory_overhead -= frame[4]
+                frame[3] = None
+                if self._stack:
+                    parent = self._stack[-1]
+                    parent[2] = max(parent[2], peak - frame[4])
+                # 스냅샷 비교에 쓴 메모리가 바깥 단계의 최대값에 잡히지 않도록 초기화
+                tracemalloc.reset_peak()
+            if self._stack:
+                # 스냅샷 시간은 바깥 단계에 포함되지 않도록 안쪽 단계 시간으로 처리
+                self._stack[-1][0] += time.perf_counter() - enter_wall
+                self._stack[-1][1] += cpu_time() - enter_cpu
+
+    @staticmethod
+    def _allocation_sizes():
+        """Return {source line: (size, count)} of the currently traced allocations."""
+        snapshot = tracemalloc.take_snapshot().filter_traces(_MEMORY_FILTERS)
+        return {
+            stat.traceback[0]: (stat.size, stat.count)
+            for stat in snapshot.statistics("lineno")
+        }
+
+    def _top_growth(self, baseline):
+        """Return the top_n source lines by memory allocated since baseline."""
+        growth = []
+        for site, (size, count) in self._allocation_sizes().items():
+            old_size, old_count = baseline.get(site, (0, 0))
+            if size > old_size:
+                growth.append((size - old_size, count - old_count, site))
+        growth.sort(key=lambda item: item[0], reverse=True)
+        return [
+            {
+                "site": f"{site.filename}:{site.lineno}",
+                "size_mb": size / 1e6,
+                "count": count,
+            }
+            for size, count, site in growth[: self.top_n]
+        ]
+
+    def stop(self):
+        """Stop tracemalloc if this profiler started memory tracking."""
+        if self.track_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def add_file(self, pdf_file, timing):
+        """Record the extract/parse timing dict of one processed PDF file."""
+        record = {key: timing.get(key, 0.0) for key in _FILE_TIMING_KEYS}
+        try:
+            record["bytes"] = file_stat(pdf_file)[0]
+        except OSError:
+            record["bytes"] = 0
+        self.files[pdf_file] = record
+
+    def add_cached(self, pdf_file):
+        """Count a file served from the extraction cache (no timing)."""
+        self.cached += 1
+
+    def summary(self):
+        """Return a JSON-serializable dict of stage, file and throughput timings."""
+        files = self.files.values()
+        totals = {key: sum(f[key] for f in files) for key in _FILE_TIMING_KEYS}
+        total_bytes = sum(f["bytes"] for f in files)
+        extraction_wall = self.stages.get("extraction", {}).get("wall", 0.0)
+        slowest = sorted(
+            self.files.items(),
+            key=lambda item: item[1]["extract_wall"] + item[1]["parse_wall"],
+            reverse=True,
+        )[: self.top_n]
+        return {
+            "format_version": PROFILE_FORMAT_VERSION,
+            "created": self._created,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "meta": self.meta,
+            "track_memory": self.track_memory,
+            "total_wall": time.perf_counter() - self._started,
+            "stages": [{"name": name, **entry} for name, entry in self.stages.items()],
+            "files": {
+                "processed": len(self.files),
+                "cached": self.cached,
+                "bytes": total_bytes,
+                **totals,
+                "files_per_sec": (
+                    len(self.files) / extraction_wall if extraction_wall else None
+                ),
+                "mb_per_sec": (
+                    total_bytes / 1e6 / extraction_wall if extraction_wall else None
+                ),
+            },
+            "slowest_files": [{"path": path, **record} for path, record in slowest],
+        }
+
+    def format_summary(self, summary=None):
+        """Return the summary as human-readable log lines."""
+        summary = summary or self.summary()
+        lines = [f"\n단계별 실행 시간 (전체 {summary['total_wall']:.2f}초):\n"]
+        for entry in summary["stages"]:
+            lines.append(
+                f"  - {entry['name']}: 경과 {entry['wall']:.2f}초, "
+                f"CPU {entry['cpu']:.2f}초 ({entry['calls']}회)\n"
+            )
+            if "peak_mb" in entry:
+                lines.append(
+                    f"      메모리: 최대 {entry['peak_mb']:.1f}MB, "
+                    f"종료 후 유지 {entry['retained_mb']:.1f}MB\n"
+                )
+        files = summary["files"]
+        lines.append(
+            f"파일 처리: {files['processed']}개 (캐시 {files['cached']}개), "
+            f"추출 {files['extract_wall']:.2f}초/CPU {files['extract_cpu']:.2f}초, "
+            f"파싱 {files['parse_wall']:.2f}초/CPU {files['parse_cpu']:.2f}초\n"
+        )
+        if files["files_per_sec"]:
+            lines.append(
+                f"처리량: {files['files_per_sec']:.1f}개/초, "
+                f"{files['mb_per_sec']:.2f}MB/초\n"
+            )
+        if summary["slowest_files"]:
+            lines.append(f"가장 느린 파일 {len(summary['slowest_files'])}개:\n")
+            for entry in summary["slowest_files"]:
+                lines.append(
+                    f"  - {entry['path']}: 추출 {entry['extract_wall']:.3f}초, "
+                    f"파싱 {entry['parse_wall']:.3f}초\n"
+                )
+        for entry in summary["stages"]:
+            if entry.get("top_allocations"):
+                lines.append(f"{entry['name']} 단계에서 늘어난 상위 할당 위치:\n")
+                for site in entry["top_allocations"]:
+                    lines.append(
+                        f"  - {site['site']}: {site['size_mb']:.2f}MB "
+                        f"({site['count']}개)\n"
+                    )
+        return lines
+
+    def write_json(self, path, summary=None):
+        """Write the summary as a JSON sidecar file and return its path."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary or self.summary(), f, ensure_ascii=False, indent=2)
+        return path
+
+
+def profile_filename(reports_dir, timestamp):
+    """Return the path of the profile sidecar written next to the reports."""
+    return os.path.join(reports_dir, f"profile_{timestamp}.json")
+
+
+def timed_stage(profiler, name):
+    """profiler가 None이면 아무것도 하지 않는 stage 컨텍스트."""
+    return profiler.stage(name) if profiler is not None else nullcontext()
+
+
+def profiled_stage(name):
+    """Decorator: time a report function taking folder_data as its first argument.
+
+    프로파일러는 folder_data["_config"]["profiler"]에서 찾습니다.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(folder_data, *args, **kwargs):
+            config = (folder_data or {}).get("_config") or {}
+            with timed_stage(config.get("profiler"), name):
+                return func(folder_data, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,475 @@
+import os
+import json
+import math
+from array import array
+from datetime import datetime
+
+from aggregation import METRICS, PATH_COMPONENTS
+from extraction_cache import get_cache_dir
+
+# 메트릭을 찾지 못했을 때 parse_pdf_content가 기록하는 오류 값
+ERROR_VALUE = -1
+
+# 스냅샷 구조가 바뀌면 올립니다 (이전 스냅샷은 읽지 않음).
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FILE_NAME = "records_snapshot.npz"
+
+# array 타입 코드별 스냅샷 저장 dtype
+_ARRAY_DTYPES = {"d": "=f8", "I": "=u4", "Q": "=u8"}
+
+# 열(column)로 보관하는 레코드 키. 그 밖의 키는 레코드별 extras에 보관합니다.
+_TEXT_KEYS = ("filename", "timestamp")
+
+# 교체/삭제로 남은 행이 이 수 이상이고 활성 행보다 많아지면 배열을 압축합니다.
+_COMPACT_MIN_DEAD_ROWS = 256
+
+
+class StringPool:
+    """같은 문자열을 한 번만 보관하고 정수 코드로 참조하는 문자열 풀."""
+
+    def __init__(self, values=()):
+        self.values = []
+        self._codes = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value):
+        """Return the code of value, adding it to the pool if needed."""
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def get(self, value):
+        """Return the code of value, or None if it is not in the pool."""
+        return self._codes.get(value)
+
+    def __getitem__(self, code):
+        return self.values[code]
+
+    def __len__(self):
+        return len(self.values)
+
+
+class TextColumn:
+    """UTF-8 문자열을 하나의 버퍼에 이어 붙여 보관하는 추가 전용 열 (파일명 등)."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.offsets = array("Q", [0])
+
+    def append(self, value):
+        self.buffer += value.encode("utf-8")
+        self.offsets.append(len(self.buffer))
+
+    def __getitem__(self, index):
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self.buffer[start:end].decode("utf-8")
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+
+class RecordStore:
+    """파싱된 PDF 레코드를 열 단위 배열로 보관하는 저장소.
+
+    메트릭은 float 배열, 폴더와 parse_folder_path 구성요소 및 파일명의 지역(region)은
+    문자열 풀의 코드, 파일명/타임스탬프는 TextColumn에 보관하므로 레코드마다
+    딕셔너리를 유지하는 것보다 메모리를 크게 줄일 수 있습니다. 오류 값(-1)은 그대로
+    -1.0으로 저장하고 레코드를 딕셔너리로 되돌릴 때 -1로 복원합니다.
+    감시 모드에서 교체/삭제된 행은 폴더의 행 목록에서 바로 빠지고, 그런 행이
+    쌓이면 compact()로 배열에서도 제거합니다.
+    """
+
+    METRICS = METRICS
+
+    def __init__(self, path_parser=None):
+        self.path_parser = path_parser
+        self.metrics = {metric: array("d") for metric in METRICS}
+        self.folder_codes = array("I")
+        self.region_codes = array("I")
+        self.filenames = TextColumn()
+        self.timestamps = TextColumn()
+        self.folders = StringPool()
+        self.regions = StringPool()
+        # 폴더 코드별 구성요소 값 코드와 활성 레코드 행 번호
+        self.dimensions = {key: StringPool() for key in PATH_COMPONENTS}
+        self.folder_dimensions = {key: array("I") for key in PATH_COMPONENTS}
+        self.folder_rows = []
+        # 열로 표현할 수 없는 값 ({행 번호: {키: 값}})
+        self.extras = {}
+        # 레코드가 추가/교체/삭제될 때마다 증가 (get_metrics_table 캐시 확인용)
+        self.revision = 0
+
+    def __len__(self):
+        return sum(len(rows) for rows in self.folder_rows)
+
+    def _folder_code(self, folder):
+        code = self.folders.code(folder)
+        if code == len(self.folder_rows):
+            self.folder_rows.append(array("I"))
+            components = self.path_parser(folder) if self.path_parser else {}
+            for key in PATH_COMPONENTS:
+                value = components.get(key, "Unknown")
+                self.folder_dimensions[key].append(self.dimensions[key].code(value))
+        return code
+
+    def _add_row(self, folder_code, record):
+        row = len(self.folder_codes)
+        extras = {}
+        self.folder_codes.append(folder_code)
+        for metric in METRICS:
+            value = record.get(metric)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                self.metrics[metric].append(value)
+            else:
+                self.metrics[metric].append(math.nan)
+                if metric in record:
+                    extras[metric] = value
+        region = record.get("region")
+        self.region_codes.append(
+            self.regions.code(region if isinstance(region, str) else "")
+        )
+        if "region" in record and not isinstance(region, str):
+            extras["region"] = region
+        for key, column in (
+            ("filename", self.filenames),
+            ("timestamp", self.timestamps),
+        ):
+            value = record.get(key)
+            column.append(value if isinstance(value, str) else "")
+            if key in record and not isinstance(value, str):
+                extras[key] = value
+        known = (*METRICS, "region", *_TEXT_KEYS)
+        extras.update((k, v) for k, v in record.items() if k not in known)
+        # 레코드에 없던 키는 딕셔너리로 되돌릴 때도 넣지 않음
+        missing = [k for k in ("region", *_TEXT_KEYS) if k not in record]
+        if missing:
+            extras["_missing"] = missing
+        if extras:
+            self.extras[row] = extras
+        return row
+
+    def append(self, folder, record):
+        """Add one parsed record to folder; return its row number."""
+        code = self._folder_code(folder)
+        row = self._add_row(code, record)
+        self.folder_rows[code].append(row)
+        self.revision += 1
+        return row
+
+    def rows(self, folder):
+        """Return the active row numbers of folder (array, record order)."""
+        code = self.folders.get(folder)
+        return self.folder_rows[code] if code is not None else array("I")
+
+    def replace(self, folder, position, record):
+        """Replace the position-th record of folder, keeping its position."""
+        code = self._folder_code(folder)
+        self.extras.pop(self.folder_rows[code][position], None)
+        self.folder_rows[code][position] = self._add_row(code, record)
+        self.revision += 1
+        self._maybe_compact()
+
+    def remove(self, folder, position):
+        """Remove the position-th record of folder."""
+        code = self._folder_code(folder)
+        self.extras.pop(self.folder_rows[code][position], None)
+        del self.folder_rows[code][position]
+        self.revision += 1
+        self._maybe_compact()
+
+    def _maybe_compact(self):
+        live = len(self)
+        dead = len(self.folder_codes) - live
+        if dead >= _COMPACT_MIN_DEAD_ROWS and dead > live:
+            self.compact()
+
+    def compact(self):
+        """Drop replaced/removed rows from the column arrays and renumber active rows.
+
+        폴더별 레코드 순서와 내용은 그대로이며 행 번호만 바뀝니다.
+        """
+        live = [row for rows in self.folder_rows for row in rows]
+        if len(live) == len(self.folder_codes):
+            return
+        renumber = {row: index for index, row in enumerate(live)}
+        self.metrics = {
+            metric: array("d", (values[row] for row in live))
+            for metric, values in self.metrics.items()
+        }
+        self.folder_codes = array("I", (self.folder_codes[row] for row in live))
+        self.region_codes = array("I", (self.region_codes[row] for row in live))
+        for name in ("filenames", "timestamps"):
+            old, new = getattr(self, name), TextColumn()
+            for row in live:
+                new.append(old[row])
+            setattr(self, name, new)
+        self.folder_rows = [
+            array("I", (renumber[row] for row in rows)) for rows in self.folder_rows
+        ]
+        self.extras = {
+            renumber[row]: extras
+            for row, extras in self.extras.items()
+            if row in renumber
+        }
+
+    def record(self, row):
+        """Rebuild the record dict of one row (same keys/values as the parser output)."""
+        extras = self.extras.get(row, {})
+        missing = extras.get("_missing", ())
+        record = {}
+        for key, column in (
+            ("filename", self.filenames),
+            ("timestamp", self.timestamps),
+        ):
+            if key not in missing:
+                record[key] = column[row]
+        if "region" not in missing:
+            record["region"] = self.regions[self.region_codes[row]]
+        for metric in METRICS:
+            value = self.metrics[metric][row]
+            if value == ERROR_VALUE:
+                record[metric] = ERROR_VALUE
+            elif not math.isnan(value):
+                record[metric] = value
+        record.update((k, v) for k, v in extras.items() if k != "_missing")
+        return record
+
+    def components(self, folder):
+        """Return the parse_folder_path components of folder from the category codes."""
+        code = self._folder_code(folder)
+        return {
+            key: self.dimensions[key][self.folder_dimensions[key][code]]
+            for key in PATH_COMPONENTS
+        }
+
+    def columns(self, folders):
+        """Return (folder position, filename, {metric: raw}, {metric: float}) arrays.
+
+        폴더 순서대로 각 폴더의 활성 레코드를 이어 붙인 NumPy 배열을 반환하며,
+        폴더는 folders 안의 위치(정수)로 나타냅니다.
+        원래 값 배열은 상세 표용 object 배열(-1 포함, 값이 없으면 -1)이고,
+        float 배열은 숫자가 아니거나 없는 값이 NaN인 집계용 배열입니다.
+        """
+        import numpy as np
+
+        row_lists = [self.rows(folder) for folder in folders]
+        counts = [len(rows) for rows in row_lists]
+        rows = np.fromiter(
+            (row for rows in row_lists for row in rows),
+            dtype=np.int64,
+            count=sum(counts),
+        )
+        positions = np.repeat(np.arange(len(folders)), counts)
+        filename_col = np.array([self.filenames[row] for row in rows], dtype=object)
+        values = {
+            metric: np.array(self.metrics[metric], dtype=float)[rows]
+            for metric in METRICS
+        }
+        raw = {}
+        for metric, column in values.items():
+            raw[metric] = column.astype(object)
+            raw[metric][np.isnan(column) | (column == ERROR_VALUE)] = ERROR_VALUE
+
+        if self.extras:
+            row_positions = {row: i for i, row in enumerate(rows.tolist())}
+            for row, extras in self.extras.items():
+                position = row_positions.get(row)
+                if position is None:
+                    continue
+                for key, value in extras.items():
+                    if key == "filename":
+                        filename_col[position] = value
+                    elif key in raw:
+                        raw[key][position] = value
+                if "filename" in extras.get("_missing", ()):
+                    filename_col[position] = "Unknown"
+        return positions, filename_col, raw, values
+
+    def view(self, folder):
+        """Return a list-like FolderRecords view of folder (folder_data[...]["files"])."""
+        return FolderRecords(self, folder)
+
+    def nbytes(self):
+        """Approximate memory of the array columns in bytes (pools excluded)."""
+        columns = [
+            *self.metrics.values(),
+            self.folder_codes,
+            self.region_codes,
+            self.filenames.offsets,
+            self.timestamps.offsets,
+            *self.folder_rows,
+        ]
+        return (
+            sum(column.itemsize * len(column) for column in columns)
+            + len(self.filenames.buffer)
+            + len(self.timestamps.buffer)
+        )
+
+
+class FolderRecords:
+    """RecordStore의 한 폴더를 레코드 딕셔너리 목록처럼 다루는 뷰.
+
+    folder_data[folder]["files"]로 사용되며, 요소를 읽을 때마다 딕셔너리를 새로 만듭니다.
+    """
+
+    def __init__(self, store, folder):
+        self.store = store
+        self.folder = folder
+
+    def __len__(self):
+        return len(self.store.rows(self.folder))
+
+    def __iter__(self):
+        for row in self.store.rows(self.folder):
+            yield self.store.record(row)
+
+    def __getitem__(self, position):
+        rows = self.store.rows(self.folder)
+        if isinstance(position, slice):
+            return [self.store.record(row) for row in rows[position]]
+        return self.store.record(rows[position])
+
+    def __setitem__(self, position, record):
+        self.store.replace(self.folder, position, record)
+
+    def __delitem__(self, position):
+        self.store.remove(self.folder, position)
+
+    def append(self, record):
+        self.store.append(self.folder, record)
+
+    def filenames(self):
+        """Return the filenames of the folder's records without building dicts."""
+        return [self.store.filenames[row] for row in self.store.rows(self.folder)]
+
+    def __repr__(self):
+        return f"FolderRecords({self.folder!r}, {len(self)} records)"
+
+
+def snapshot_path(reports_dir):
+    """Return the path of the record snapshot kept next to the extraction cache."""
+    return os.path.join(get_cache_dir(reports_dir), SNAPSHOT_FILE_NAME)
+
+
+def save_snapshot(folder_data, path, parser_version=None, extra=None):
+    """Write the RecordStore of folder_data to a NumPy .npz snapshot and return path.
+
+    열 배열은 그대로 저장하고 문자열 풀과 폴더 목록 등은 JSON 인덱스("index" 항목)로
+    함께 저장합니다(extra 딕셔너리도 인덱스에 추가). 임시 파일에 쓴 뒤 교체하므로 중간에 실패해도 기존 스냅샷은 유지됩니다.
+    """
+    import numpy as np
+
+    config = folder_data["_config"]
+    store = config["records"]
+    # 교체/삭제된 행은 저장하지 않음
+    store.compact()
+    folders = [folder for folder in folder_data if folder != "_config"]
+    index = {
+        "version": SNAPSHOT_VERSION,
+        "parser_version": parser_version,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "root_abs": config.get("root_abs"),
+        "reports_dir": config.get("reports_dir"),
+        "folders": folders,
+        "folder_pool": store.folders.values,
+        "regions": store.regions.values,
+        "dimensions": {key: pool.values for key, pool in store.dimensions.items()},
+        "extras": {str(row): extras for row, extras in store.extras.items()},
+        **(extra or {}),
+    }
+    rows = [store.rows(folder) for folder in folders]
+    arrays = {
+        "index": np.frombuffer(
+            json.dumps(index, ensure_ascii=False, default=str).encode("utf-8"),
+            dtype=np.uint8,
+        ),
+        "folder_codes": np.array(store.folder_codes, dtype=np.uint32),
+        "region_codes": np.array(store.region_codes, dtype=np.uint32),
+        "folder_rows": np.array(
+            [row for folder_rows in rows for row in folder_rows], dtype=np.uint32
+        ),
+        "folder_row_counts": np.array([len(r) for r in rows], dtype=np.int64),
+    }
+    for metric in METRICS:
+        arrays[f"metric_{metric}"] = np.array(store.metrics[metric], dtype=np.float64)
+    for key in PATH_COMPONENTS:
+        arrays[f"dim_{key}"] = np.array(store.folder_dimensions[key], dtype=np.uint32)
+    for name, column in (
+        ("filenames", store.filenames),
+        ("timestamps", store.timestamps),
+    ):
+        arrays[f"{name}_buffer"] = np.frombuffer(bytes(column.buffer), dtype=np.uint8)
+        arrays[f"{name}_offsets"] = np.array(column.offsets, dtype=np.uint64)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_snapshot(path):
+    """Load an .npz snapshot; return (folder_data, index) backed by a RecordStore.
+
+    folder_data는 process_pdf_files 결과와 같은 구조(_config의 reports_dir/root_abs/
+    records)이므로 리포트 함수에 그대로 전달할 수 있습니다. 형식이 맞지 않으면
+    ValueError가 발생합니다.
+    """
+    import numpy as np
+
+    with np.load(path) as data:
+        index = json.loads(data["index"].tobytes().decode("utf-8"))
+        if index.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"지원하지 않는 스냅샷 버전입니다: {index.get('version')}")
+
+        def load_array(typecode, name):
+            values = array(typecode)
+            values.frombytes(data[name].astype(_ARRAY_DTYPES[typecode]).tobytes())
+            return values
+
+        store = RecordStore()
+        store.folders = StringPool(index["folder_pool"])
+        store.regions = StringPool(index["regions"])
+        store.dimensions = {
+            key: StringPool(index["dimensions"][key]) for key in PATH_COMPONENTS
+        }
+        store.folder_dimensions = {
+            key: load_array("I", f"dim_{key}") for key in PATH_COMPONENTS
+        }
+        store.metrics = {
+            metric: load_array("d", f"metric_{metric}") for metric in METRICS
+        }
+        store.folder_codes = load_array("I", "folder_codes")
+        store.region_codes = load_array("I", "region_codes")
+        for name, column in (
+            ("filenames", store.filenames),
+            ("timestamps", store.timestamps),
+        ):
+            column.buffer = bytearray(data[f"{name}_buffer"].tobytes())
+            column.offsets = load_array("Q", f"{name}_offsets")
+        store.extras = {int(row): extras for row, extras in index["extras"].items()}
+
+        # 스냅샷에 있는 폴더만 행 목록을 채우고 나머지 폴더는 빈 목록으로 둠
+        store.folder_rows = [array("I") for _ in store.folders.values]
+        all_rows = data["folder_rows"]
+        start = 0
+        for folder, count in zip(index["folders"], data["folder_row_counts"].tolist()):
+            rows = array("I")
+            rows.frombytes(all_rows[start : start + count].astype(np.uint32).tobytes())
+            store.folder_rows[store.folders.code(folder)] = rows
+            start += count
+
+    folder_data = {
+        "_config": {
+            "reports_dir": index.get("reports_dir"),
+            "root_abs": index.get("root_abs"),
+            "records": store,
+        }
+    }
+    for folder in index["folders"]:
+        folder_data[folder] = {"files": store.view(folder)}
+    return folder_data, index
@@ -0,0 +1,156 @@
+import os
+import glob
+
+from aggregation import FolderAggregates
+from record_store import RecordStore, load_snapshot, save_snapshot
+
+SHARD_DIR_NAME = "shards"
+
+
+def parse_shard(value):
+    """Parse an "i/N" shard spec into (i, N) with 1 <= i <= N; raise ValueError."""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"샤드는 i/N 형식이어야 합니다: {value}")
+    if not 1 <= index <= count:
+        raise ValueError(f"샤드 번호는 1부터 {count}까지입니다: {value}")
+    return index, count
+
+
+def shard_dir(reports_dir):
+    """Return the folder in reports_dir where shard result files are written."""
+    return os.path.join(reports_dir, SHARD_DIR_NAME)
+
+
+def shard_file_path(reports_dir, shard):
+    """Return the result file path of shard (i, N)."""
+    index, count = shard
+    return os.path.join(shard_dir(reports_dir), f"records_shard_{index}_of_{count}.npz")
+
+
+def find_shard_files(reports_dir):
+    """Return the shard result files in reports_dir (sorted)."""
+    return sorted(glob.glob(os.path.join(shard_dir(reports_dir), "*.npz")))
+
+
+def save_shard(folder_data, path, shard, parser_version=None):
+    """Write one shard's partial results and return path.
+
+    레코드 스냅샷 형식에 샤드 번호와 병합 가능한 폴더별 누적 집계(FolderAggregates),
+    처리 제한으로 건너뛴 파일 목록과 중복 PDF 목록을 함께 저장합니다.
+    """
+    config = folder_data["_config"]
+    aggregates = config.get("aggregates")
+    return save_snapshot(
+        folder_data,
+        path,
+        parser_version,
+        extra={
+            "shard": list(shard),
+            "aggregates": aggregates.folders if aggregates is not None else {},
+            "watchdog": config.get("watchdog", {}),
+            "duplicates": config.get("duplicates"),
+        },
+    )
+
+
+def merge_shards(
+    paths, root_abs=None, reports_dir=None, path_parser=None, log_callback=None
+):
+    """Combine shard result files into one folder_data like process_pdf_files returns.
+
+    모든 샤드(1..N)가 한 번씩 있어야 하며 샤드 수나 파서 버전이 다르면 ValueError가
+    발생합니다. 폴더 경로는 각 샤드의 루트 기준 상대 경로로 root_abs(기본값: 첫 샤드의
+    루트) 아래에 다시 붙이므로 머신마다 공유 폴더 마운트 위치가 달라도 됩니다.
+    폴더 안의 레코드 순서는 샤드에서 처리한 순서를 그대로 유지합니다.
+    """
+    shards = []
+    for path in paths:
+        shard_data, index = load_snapshot(path)
+        if "shard" not in index:
+            raise ValueError(f"샤드 결과 파일이 아닙니다: {path}")
+        shards.append((path, shard_data, index))
+    if not shards:
+        raise ValueError("병합할 샤드 결과 파일이 없습니다.")
+
+    counts = sorted({index["shard"][1] for _, _, index in shards})
+    if len(counts) != 1:
+        raise ValueError(f"샤드 수가 서로 다릅니다: {counts}")
+    count = counts[0]
+    seen = {}
+    for path, _, index in shards:
+        number = index["shard"][0]
+        if number in seen:
+            raise ValueError(
+                f"샤드 {number}/{count}가 중복됩니다: {seen[number]}, {path}"
+            )
+        seen[number] = path
+    missing = [f"{i}/{count}" for i in range(1, count + 1) if i not in seen]
+    if missing:
+        raise ValueError(f"누락된 샤드가 있습니다: {', '.join(missing)}")
+    versions = {str(index.get("parser_version")) for _, _, index in shards}
+    if len(versions) > 1:
+        raise ValueError(
+            f"파서 버전이 다른 샤드는 병합할 수 없습니다: {sorted(versions)}"
+        )
+
+    shards.sort(key=lambda shard: shard[2]["shard"][0])
+    first = shards[0][2]
+    if root_abs:
+        root_abs = os.path.abspath(root_abs)
+    else:
+        root_abs = first["root_abs"]
+        reports_dir = reports_dir or first.get("reports_dir")
+    if not reports_dir:
+        reports_dir = os.path.join(os.path.dirname(root_abs), "reports")
+
+    store = RecordStore(path_parser)
+    aggregates = FolderAggregates()
+    watchdog = {"timed_out": [], "memory_exceeded": []}
+    folder_data = {
+        "_config": {
+            "reports_dir": reports_dir,
+            "root_abs": root_abs,
+            "records": store,
+            "aggregates": aggregates,
+            "watchdog": watchdog,
+        }
+    }
+    for path, shard_data, index in shards:
+        shard_root = index["root_abs"]
+
+        def rebase(shard_path):
+            rel_path = os.path.relpath(shard_path, shard_root)
+            if rel_path == ".":
+                return root_abs
+            return os.path.normpath(os.path.join(root_abs, rel_path))
+
+        shard_store = shard_data["_config"]["records"]
+        records = 0
+        for folder in index["folders"]:
+            target = rebase(folder)
+            if target not in folder_data:
+                folder_data[target] = {"files": store.view(target)}
+            for row in shard_store.rows(folder):
+                store.append(target, shard_store.record(row))
+                records += 1
+        aggregates.merge(
+            {rebase(folder): stats for folder, stats in index["aggregates"].items()}
+        )
+        for key, files in index.get("watchdog", {}).items():
+            watchdog.setdefault(key, []).extend(rebase(f) for f in files)
+        shard_duplicates = index.get("duplicates")
+        if shard_duplicates and shard_duplicates.get("groups"):
+            # 중복 검사는 샤드마다 따로 하므로 다른 샤드의 복사본은 각각 추출됨
+            duplicates = folder_data["_config"].setdefault(
+                "duplicates", {"mode": shard_duplicates.get("mode"), "groups": {}}
+            )
+            for original, copies in shard_duplicates["groups"].items():
+                duplicates["groups"][rebase(original)] = [rebase(c) for c in copies]
+        if log_callback:
+            log_callback(
+                f"샤드 {index['shard'][0]}/{count} 병합: {path} "
+                f"({len(index['folders'])}개 폴더, {records}개 레코드)\n"
+            )
+    return folder_data
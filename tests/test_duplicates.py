@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmark import generate_corpus
+from main import iter_pdf_records
+
+
+class StreamingDuplicatesTest(unittest.TestCase):
+    """중복 검사를 켜도 레코드가 탐색과 함께 스트리밍되는지 확인."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data_dir = generate_corpus(self.tmp_dir, 16, pages=1)
+        pdf_files = sorted(
+            os.path.join(dir_path, name)
+            for dir_path, _, names in os.walk(self.data_dir)
+            for name in names
+        )
+        # 같은 PDF를 다른 두 폴더에 복사 (파일 이름도 다르게)
+        self.source = pdf_files[0]
+        self.copies = []
+        for target in (pdf_files[5], pdf_files[10]):
+            copy = os.path.join(os.path.dirname(target), "copy_" + target[-12:])
+            shutil.copy(self.source, copy)
+            self.copies.append(copy)
+        self.folders = {os.path.dirname(path) for path in pdf_files}
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def records(self, duplicate_mode, logs):
+        return iter_pdf_records(
+            self.data_dir,
+            logs.append,
+            use_cache=False,
+            duplicate_mode=duplicate_mode,
+            duplicates=self.duplicates,
+        )
+
+    def test_first_record_before_walk_finishes(self):
+        logs = []
+        self.duplicates = {}
+        records = self.records("count", logs)
+        try:
+            next(records)
+            scanned = sum(message.startswith("PDF 파일 발견") for message in logs)
+            self.assertGreater(scanned, 0)
+            self.assertLess(scanned, len(self.folders))
+        finally:
+            records.close()
+
+    def test_copies_extracted_once(self):
+        for mode in ("count", "ignore"):
+            logs = []
+            self.duplicates = {}
+            results = {pdf_file: data for pdf_file, _, data in self.records(mode, logs)}
+            self.assertEqual(len(results), 18)
+            processed = [m for m in logs if m.startswith("\n처리 중:")]
+            self.assertEqual(len(processed), 16, mode)
+            group = {self.source, *self.copies}
+            ((original, copies),) = self.duplicates.items()
+            self.assertEqual({original, *copies}, group)
+            for copy in copies:
+                if mode == "count":
+                    self.assertEqual(results[copy]["fps"], results[original]["fps"])
+                    self.assertEqual(results[copy]["filename"], os.path.basename(copy))
+                else:
+                    self.assertIsNone(results[copy])
+
+
+if __name__ == "__main__":
+    unittest.main()
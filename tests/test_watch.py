@@ -0,0 +1,58 @@
+import io
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from benchmark import generate_corpus
+from main import process_pdf_files, query_main, update_pdf_files
+from watch import PdfTreeWatcher
+
+
+class WatchWarehouseTest(unittest.TestCase):
+    """감시 모드 갱신 후 메트릭 저장소 조회(main.py query)가 리포트 레코드와 일치하는지 확인."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data_dir = generate_corpus(self.tmp_dir, 12, pages=1)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def query_files(self):
+        """Return {rel_folder: files} from `main.py query --group-by folder`."""
+        output = io.StringIO()
+        argv = ["--folder", self.data_dir, "--group-by", "folder", "--format", "json"]
+        with redirect_stdout(output), redirect_stderr(io.StringIO()):
+            self.assertEqual(query_main(argv), 0)
+        return {row["folder"]: row["files"] for row in json.loads(output.getvalue())}
+
+    def report_files(self, folder_data):
+        return {
+            os.path.relpath(folder, self.data_dir): len(info["files"])
+            for folder, info in folder_data.items()
+            if folder != "_config"
+        }
+
+    def test_unparseable_edit_removes_warehouse_row(self):
+        folder_data = process_pdf_files(self.data_dir, use_cache=False)
+        self.assertEqual(self.query_files(), self.report_files(folder_data))
+
+        watcher = PdfTreeWatcher(self.data_dir, known=folder_data["_config"]["sources"])
+        broken = sorted(folder_data["_config"]["sources"])[0]
+        with open(broken, "wb") as f:
+            f.write(b"this is not a PDF file")
+        changed, removed = watcher.poll()
+        self.assertEqual([str(path) for path in changed], [broken])
+
+        affected = update_pdf_files(folder_data, changed, removed, use_cache=False)
+        self.assertEqual(affected, {os.path.dirname(broken)})
+        expected = self.report_files(folder_data)
+        self.assertEqual(sum(expected.values()), 11)
+        self.assertEqual(self.query_files(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,397 @@
+import os
+import json
+import math
+import sqlite3
+
+from aggregation import METRICS, PATH_COMPONENTS, TRIM_MODES
+from discovery import UNDECIDED, file_stat
+
+WAREHOUSE_FILE_NAME = "metrics_warehouse.sqlite"
+
+# 스키마가 바뀌면 올립니다 (PRAGMA user_version에 기록).
+SCHEMA_VERSION = 1
+
+# 한 트랜잭션으로 저장하는 레코드 수
+DEFAULT_BATCH_SIZE = 5000
+
+# parse_pdf_content 레코드의 region(파일명에서 추출)은 폴더 구성요소 region과
+# 구분하기 위해 file_region 열에 저장합니다.
+_RECORD_TEXT_COLUMNS = {
+    "filename": "filename",
+    "timestamp": "timestamp",
+    "file_region": "region",
+}
+
+_COLUMNS = (
+    "path",
+    "folder",
+    *_RECORD_TEXT_COLUMNS,
+    "file_hash",
+    "size",
+    "mtime",
+    *PATH_COMPONENTS,
+    *METRICS,
+    "parser_version",
+)
+
+
+# group_stats에서 그룹 기준으로 쓸 수 있는 열
+GROUP_KEYS = ("folder", *PATH_COMPONENTS)
+
+
+def warehouse_path(reports_dir):
+    """Return the path of the metrics warehouse database in reports_dir."""
+    return os.path.join(reports_dir, WAREHOUSE_FILE_NAME)
+
+
+def _schema_sql():
+    # 구성요소 값은 FolderFilter와 같이 대소문자를 구분하지 않고 비교
+    dimensions = ",\n".join(
+        f"    {key} TEXT NOT NULL COLLATE NOCASE" for key in PATH_COMPONENTS
+    )
+    metrics = ",\n".join(f"    {metric} REAL" for metric in METRICS)
+    indexes = "\n".join(
+        f"CREATE INDEX IF NOT EXISTS idx_records_{column} ON records({column});"
+        for column in ("folder", "file_hash", *PATH_COMPONENTS)
+    )
+    return f"""
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    folder TEXT NOT NULL,
+    filename TEXT,
+    timestamp TEXT,
+    file_region TEXT,
+    file_hash TEXT,
+    size INTEGER,
+    mtime REAL,
+{dimensions},
+{metrics},
+    parser_version TEXT,
+    updated_at TEXT NOT NULL
+);
+{indexes}
+"""
+
+
+class _TrimmedSums:
+    """SQLite 집계 함수: 값들의 math.fsum 합계를 제외 방식별로 JSON 배열로 반환합니다.
+
+    [전체, 최솟값 제외, 최댓값 제외, 최솟값/최댓값 제외] 순서이며(TRIM_MODES),
+    build_metrics_table과 같은 규칙으로 계산하므로 두 경로의 평균이 일치합니다.
+    """
+
+    def __init__(self):
+        self.values = []
+        # 행마다 호출되므로 Python 메서드 대신 list.append를 그대로 사용 (NULL 포함)
+        self.step = self.values.append
+
+    def finalize(self):
+        values = sorted(value for value in self.values if value is not None)
+        if not values:
+            return None
+        return json.dumps(
+            [
+                math.fsum(values),
+                math.fsum(values[1:]),
+                math.fsum(values[:-1]),
+                math.fsum(values[1:-1]),
+            ]
+        )
+
+
+class MetricsWarehouse:
+    """파싱된 레코드를 실행 간에 누적하는 SQLite 저장소.
+
+    PDF 경로를 키로 upsert하며 parse_folder_path 구성요소(date, carrier, network,
+    region, game, device 등)와 파일 내용 해시에 인덱스가 있습니다. add()로 들어온
+    레코드는 batch_size개씩 한 트랜잭션으로 저장되므로 마지막에 flush()를 호출해야
+    합니다. 누적 저장소이므로 PDF가 삭제되어도 기존 레코드는 유지되지만, 다시 처리해
+    레코드가 없어진 파일(파싱 실패, 평균에서 제외한 중복 복사본)은 remove()로 지웁니다.
+    """
+
+    def __init__(
+        self,
+        path,
+        path_parser=None,
+        parser_version=None,
+        log_callback=None,
+        batch_size=DEFAULT_BATCH_SIZE,
+    ):
+        self.path = path
+        self.path_parser = path_parser
+        self.parser_version = parser_version
+        self.log_callback = log_callback
+        self.batch_size = batch_size
+        self.saved = 0
+        self.removed = 0
+        self._pending = []
+        self._removals = set()
+        self._components = {}
+        self._ready = False
+
+    def _log(self, message):
+        if self.log_callback:
+            self.log_callback(message)
+
+    def connect(self):
+        """Open the database (creating the schema on first use) and return the connection."""
+        if not self._ready:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        # 배치마다 커밋하므로 fsync 횟수를 줄임 (WAL은 네트워크 공유 폴더에서 쓸 수 없음)
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.create_aggregate("trimmed_sums", 1, _TrimmedSums)
+        if not self._ready:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, SCHEMA_VERSION):
+                conn.close()
+                raise ValueError(f"지원하지 않는 메트릭 저장소 버전입니다: {version}")
+            with conn:
+                conn.executescript(_schema_sql())
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._ready = True
+        return conn
+
+    def _folder_components(self, folder):
+        components = self._components.get(folder)
+        if components is None:
+            parsed = self.path_parser(folder) if self.path_parser else {}
+            components = self._components[folder] = [
+                parsed.get(key, UNDECIDED) for key in PATH_COMPONENTS
+            ]
+        return components
+
+    def add(self, pdf_file, folder, record, file_hash=None):
+        """Queue one parsed record for upsert; saves a batch when batch_size is reached."""
+        try:
+            size, mtime = file_stat(pdf_file)
+        except OSError:
+            size = mtime = None
+        text = [record.get(key) for key in _RECORD_TEXT_COLUMNS.values()]
+        metrics = [
+            (
+                value
+                if isinstance(value, (int, float)) and not isinstance(value, bool)
+                else None
+            )
+            for value in (record.get(metric) for metric in METRICS)
+        ]
+        self._pending.append(
+            (
+                os.path.abspath(pdf_file),
+                folder,
+                *[value if isinstance(value, str) else None for value in text],
+                file_hash,
+                size,
+                mtime,
+                *self._folder_components(folder),
+                *metrics,
+                None if self.parser_version is None else str(self.parser_version),
+            )
+        )
+        self._removals.discard(self._pending[-1][0])
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def remove(self, pdf_file):
+        """Queue the deletion of a file's record (applied by flush())."""
+        key = os.path.abspath(pdf_file)
+        self._pending = [row for row in self._pending if row[0] != key]
+        self._removals.add(key)
+
+    def flush(self):
+        """Upsert the queued records in one transaction; return the number saved."""
+        rows, self._pending = self._pending, []
+        removals, self._removals = self._removals, set()
+        if not rows and not removals:
+            return 0
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        updates = ", ".join(
+            f"{c} = excluded.{c}" for c in (*_COLUMNS[1:], "updated_at")
+        )
+        try:
+            conn = self.connect()
+            try:
+                with conn:
+                    conn.executemany(
+                        "DELETE FROM records WHERE path = ?",
+                        [(path,) for path in sorted(removals)],
+                    )
+                    conn.executemany(
+                        f"INSERT INTO records ({', '.join(_COLUMNS)}, updated_at) "
+                        f"VALUES ({placeholders}, datetime('now', 'localtime')) "
+                        f"ON CONFLICT(path) DO UPDATE SET {updates}",
+                        rows,
+                    )
+            finally:
+                conn.close()
+        except (sqlite3.Error, ValueError, OSError) as e:
+            self._log(f"메트릭 저장소 저장 중 오류 발생: {e}\n")
+            return 0
+        self.removed += len(removals)
+        self.saved += len(rows)
+        return len(rows)
+
+    def select(self, root_abs=None, folder_filter=None):
+        """Return a WarehouseSelection of the records below root_abs matching folder_filter."""
+        return WarehouseSelection(self, root_abs, folder_filter)
+
+
+class WarehouseSelection:
+    """저장소에서 루트 폴더/폴더 필터 조건에 맞는 레코드 집합.
+
+    folder_data["_config"]["table_source"]로 지정하면 get_metrics_table이 PDF 레코드
+    대신 SQL 집계 쿼리로 리포트용 MetricsTable을 만듭니다.
+    """
+
+    def __init__(self, warehouse, root_abs=None, folder_filter=None):
+        self.warehouse = warehouse
+        self.root_abs = os.path.abspath(root_abs) if root_abs else None
+        self.folder_filter = folder_filter
+
+    def where(self):
+        """Return (SQL condition, parameters) for the selection."""
+        clauses, params = [], []
+        if self.root_abs:
+            # LIKE는 경로의 '_'/'%'를 와일드카드로 해석하므로 문자열 범위로 비교
+            prefix = os.path.join(self.root_abs, "")
+            clauses.append("(folder = ? OR (folder >= ? AND folder < ?))")
+            params += [self.root_abs, prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)]
+        folder_filter = self.folder_filter
+        if folder_filter is not None and folder_filter.active:
+            if folder_filter.since or folder_filter.until:
+                clauses.append("date != ?")
+                params.append(UNDECIDED)
+            if folder_filter.since:
+                clauses.append("date >= ?")
+                params.append(folder_filter.since)
+            if folder_filter.until:
+                clauses.append("date <= ?")
+                params.append(folder_filter.until)
+            for key, values in folder_filter.components.items():
+                clauses.append(f"{key} IN ({', '.join('?' for _ in values)})")
+                params += sorted(values)
+        return " AND ".join(clauses) or "1", params
+
+    def count(self):
+        """Return the number of selected records."""
+        where, params = self.where()
+        conn = self.warehouse.connect()
+        try:
+            return conn.execute(
+                f"SELECT COUNT(*) FROM records WHERE {where}", params
+            ).fetchone()[0]
+        finally:
+            conn.close()
+
+    def group_stats(self, group_by=(), metrics=METRICS):
+        """Return one dict per group with the file count and per-metric value stats.
+
+        키는 그룹 열, "files"와 메트릭별 유효값(0보다 큰 값)의 count/min/max 및 제외
+        방식별 합계 {metric}_sum_{none,min,max,minmax}(MetricsTable.folders와 같은 이름)
+        이며 모두 한 번의 GROUP BY 쿼리로 계산합니다. group_by가 비어 있으면 선택 전체를
+        한 행으로 반환합니다. group_by는 GROUP_KEYS 중에서 고릅니다.
+        """
+        unknown = [key for key in group_by if key not in GROUP_KEYS]
+        if unknown:
+            raise ValueError(f"지원하지 않는 그룹 기준입니다: {', '.join(unknown)}")
+        where, params = self.where()
+        group_sql = ", ".join(group_by)
+        valid_sql = ", ".join(
+            f"CASE WHEN {m} > 0 THEN {m} END AS v_{m}" for m in metrics
+        )
+        stats_sql = ", ".join(
+            f"COUNT(v_{m}), MIN(v_{m}), MAX(v_{m}), trimmed_sums(v_{m})"
+            for m in metrics
+        )
+        sql = (
+            f"SELECT {group_sql + ', ' if group_by else ''}COUNT(*), {stats_sql} "
+            f"FROM (SELECT {group_sql + ', ' if group_by else ''}{valid_sql} "
+            f"FROM records WHERE {where})"
+        )
+        if group_by:
+            sql += f" GROUP BY {group_sql} ORDER BY {group_sql}"
+        conn = self.warehouse.connect()
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+        result = []
+        for row in rows:
+            entry = dict(zip(group_by, row))
+            entry["files"] = row[len(group_by)]
+            offset = len(group_by) + 1
+            for metric in metrics:
+                count, low, high, sums = row[offset : offset + 4]
+                offset += 4
+                sums = json.loads(sums) if sums else [math.nan] * len(TRIM_MODES)
+                entry[f"{metric}_count"] = count
+                entry[f"{metric}_min"] = math.nan if low is None else float(low)
+                entry[f"{metric}_max"] = math.nan if high is None else float(high)
+                for trim, total in zip(TRIM_MODES, sums):
+                    entry[f"{metric}_sum_{trim}"] = float(total)
+            result.append(entry)
+        return result
+
+    def metrics_table(self):
+        """Build the report MetricsTable with SQL aggregate queries.
+
+        폴더별 통계는 group_stats(폴더 기준)로, 상세 표의 레코드는 폴더/저장 순서로
+        읽으며 결과는 build_metrics_table과 같은 구조입니다.
+        """
+        import pandas as pd
+
+        from aggregation import MetricsTable
+
+        where, params = self.where()
+        folder_rows = self.group_stats(("folder", *PATH_COMPONENTS))
+        conn = self.warehouse.connect()
+        try:
+            record_rows = conn.execute(
+                f"SELECT folder, COALESCE(filename, 'Unknown'), {', '.join(METRICS)} "
+                f"FROM records WHERE {where} ORDER BY folder, id",
+                params,
+            ).fetchall()
+        finally:
+            conn.close()
+
+        root_abs = self.root_abs or os.path.commonpath(
+            [row["folder"] for row in folder_rows] or ["."]
+        )
+        for row in folder_rows:
+            rel_folder = os.path.relpath(row["folder"], root_abs)
+            row["rel_folder"] = "(root)" if rel_folder == "." else rel_folder
+            for metric in METRICS:
+                count = row[f"{metric}_count"]
+                row[f"{metric}_mean"] = (
+                    row[f"{metric}_sum_none"] / count if count else math.nan
+                )
+
+        columns = ["folder", "rel_folder", "files", *PATH_COMPONENTS]
+        for metric in METRICS:
+            columns += [
+                f"{metric}_{name}"
+                for name in (
+                    "count",
+                    "min",
+                    "max",
+                    *(f"sum_{trim}" for trim in TRIM_MODES),
+                    "mean",
+                )
+            ]
+        folders = pd.DataFrame(folder_rows, columns=columns).set_index(
+            "folder", drop=False
+        )
+        folders = folders.astype({f"{metric}_count": int for metric in METRICS})
+
+        # 상세 표에는 원본 값을 쓰며, 값이 없거나 숫자가 아니었던 레코드는 -1로 표시
+        records = pd.DataFrame(
+            record_rows, columns=["folder", "filename", *METRICS]
+        ).astype({metric: object for metric in METRICS})
+        for metric in METRICS:
+            column = records[metric]
+            records[metric] = column.where(column.notna() & (column != -1), -1)
+        records["rel_folder"] = records["folder"].map(folders["rel_folder"])
+        return MetricsTable(records, folders)
@@ -0,0 +1,107 @@
+import os
+import time
+
+from discovery import iter_pdf_entries
+
+DEFAULT_POLL_INTERVAL = 2.0
+
+# 마지막 변경 후 이 시간(초) 동안 추가 변경이 없으면 리포트를 갱신합니다.
+DEFAULT_DEBOUNCE = 10.0
+
+# 중지 요청을 확인하는 간격 (초)
+_STOP_CHECK_INTERVAL = 0.2
+
+
+def scan_pdf_tree(root_dir, folder_filter=None, walk_jobs=1):
+    """Return {path: PdfEntry} of every PDF below root_dir (same rules as discovery)."""
+    return {
+        str(entry): entry
+        for entry in iter_pdf_entries(
+            root_dir, walk_jobs=walk_jobs, folder_filter=folder_filter
+        )
+    }
+
+
+class PdfTreeWatcher:
+    """루트 폴더를 주기적으로 탐색해 추가/수정/삭제된 PDF를 찾는 폴링 감시기.
+
+    known은 {경로: (크기, 수정시간)}이며 감시 중 제자리에서 갱신되고, 변경이 있으면 현재
+    탐색 순서로 다시 정렬됩니다(중복 PDF의 원본은 탐색 순서로 정함). 변경이 감지되면
+    debounce초 동안 추가 변경이 없을 때까지 모았다가 한 번에 반환하므로, 복사 중인
+    파일이나 연속으로 들어오는 파일들은 한 번의 갱신으로 처리됩니다.
+    """
+
+    def __init__(
+        self,
+        root_dir,
+        known=None,
+        interval=DEFAULT_POLL_INTERVAL,
+        debounce=DEFAULT_DEBOUNCE,
+        folder_filter=None,
+        walk_jobs=1,
+    ):
+        self.root_abs = os.path.abspath(root_dir)
+        self.known = known if known is not None else {}
+        self.interval = interval
+        self.debounce = debounce
+        self.folder_filter = folder_filter
+        self.walk_jobs = walk_jobs
+
+    def poll(self):
+        """Scan once and return (changed PdfEntry list, removed path list)."""
+        if not os.path.isdir(self.root_abs):
+            # 네트워크 공유 폴더가 잠시 끊긴 경우 모든 파일을 삭제로 처리하지 않음
+            return [], []
+        entries = scan_pdf_tree(self.root_abs, self.folder_filter, self.walk_jobs)
+        changed = []
+        for path, entry in entries.items():
+            signature = (entry.size, entry.mtime)
+            if self.known.get(path) != signature:
+                self.known[path] = signature
+                changed.append(entry)
+        removed = [path for path in self.known if path not in entries]
+        if changed or removed:
+            self.known.clear()
+            self.known.update(
+                (path, (entry.size, entry.mtime)) for path, entry in entries.items()
+            )
+        return changed, removed
+
+    def wait_for_changes(self, should_stop=None):
+        """Block until changes have been quiet for debounce seconds.
+
+        (changed, removed)를 반환하며, should_stop()이 True가 되면 None을 반환합니다.
+        """
+        changed, removed = {}, set()
+        last_change = None
+        while True:
+            if not _sleep(self.interval, should_stop):
+                return None
+            new_changed, new_removed = self.poll()
+            for entry in new_changed:
+                changed[str(entry)] = entry
+                removed.discard(str(entry))
+            for path in new_removed:
+                changed.pop(path, None)
+                removed.add(path)
+            if new_changed or new_removed:
+                last_change = time.monotonic()
+            elif last_change is not None and (
+                time.monotonic() - last_change >= self.debounce
+            ):
+                if changed or removed:
+                    return list(changed.values()), sorted(removed)
+                # 추가 후 바로 삭제되는 등 변경이 상쇄된 경우
+                last_change = None
+
+
+def _sleep(seconds, should_stop=None):
+    """Sleep for seconds; return False early if should_stop() becomes True."""
+    deadline = time.monotonic() + seconds
+    while True:
+        if should_stop is not None and should_stop():
+            return False
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return True
+        time.sleep(min(remaining, _STOP_CHECK_INTERVAL))